@@ -4,6 +4,7 @@ from pybuilder.core import use_plugin, init
 use_plugin("python.core")
 use_plugin("python.unittest")
 use_plugin("python.coverage")
+use_plugin("python.distutils")
 
 
 name = "G8X.2025.TYY.GE2"
@@ -12,4 +13,7 @@ default_task = "publish"
 
 @init
 def set_properties(project):
-    pass
+    project.set_property("distutils_console_scripts", [
+        "uc3m-transfers = uc3m_money.transfer_batch:main",
+        "uc3m-reshard = uc3m_money.store_resharder:main",
+        "uc3m-service = uc3m_money.account_service:main"])
@@ -0,0 +1,143 @@
+"""Throughput benchmark of transfer_request, deposit_into_account and calculate_balance.
+
+Every operation and store size runs in its own process over synthetic
+stores created in a temporary directory (the files of JSON_FILES_PATH
+are never used). The results are printed and saved as json so the runs
+of different versions can be compared. With --metrics the phases of
+every operation are timed and saved with the results.
+
+Usage: python src/benchmark/python/account_manager_benchmark.py
+           [--sizes 1000 100000 1000000] [--ops 200] [--output results.json] [--metrics]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../main/python"))
+
+# pylint: disable=wrong-import-position
+from uc3m_money import AccountManager, SyntheticDataGenerator, METRICS
+
+OPERATIONS = ("transfer_request", "deposit_into_account", "calculate_balance")
+
+
+def create_stores(json_files_path, size, generator, ibans):
+    """writes stores with size records in the directory"""
+    generator.write_transfers_store(os.path.join(json_files_path, "transfers_store.json"),
+                                    size, ibans)
+    generator.write_deposits_store(os.path.join(json_files_path, "deposits_store.json"),
+                                   size, ibans)
+    generator.write_transactions_file(os.path.join(json_files_path, "transactions.json"),
+                                      size, ibans)
+
+
+def prepare_calls(json_files_path, operation, ops, generator, ibans):
+    """returns the calls to measure (one more for warming up)"""
+    mngr = AccountManager(json_files_path)
+    if operation == "transfer_request":
+        return [(mngr.transfer_request, transfer)
+                for transfer in generator.transfers(ops + 1, ibans)]
+    if operation == "deposit_into_account":
+        directory = os.path.join(json_files_path, "deposits")
+        return [(mngr.deposit_into_account, {"input_file": os.path.join(directory, name)})
+                for name in generator.write_deposit_files(directory, ops + 1, ibans)]
+    return [(mngr.calculate_balance, {"iban": generator.transaction(ibans)["IBAN"]})
+            for _ in range(ops + 1)]
+
+
+def time_calls(calls):
+    """latencies of the calls, sorted"""
+    latencies = []
+    for function, kwargs in calls:
+        start = time.perf_counter()
+        function(**kwargs)
+        latencies.append(time.perf_counter() - start)
+    return sorted(latencies)
+
+
+#pylint: disable=too-many-arguments
+def run_case(operation, size, ops, seed, metrics, queue):
+    """measures one operation over stores of size records (child process)"""
+    generator = SyntheticDataGenerator(seed)
+    ibans = generator.ibans(max(10, size // 100))
+    with tempfile.TemporaryDirectory() as json_files_path:
+        create_stores(json_files_path, size, generator, ibans)
+        calls = prepare_calls(json_files_path, operation, ops, generator, ibans)
+        # the first call loads the indexes of the stores
+        first_call = time_calls(calls[:1])[0]
+        METRICS.enable(metrics)
+        latencies = time_calls(calls[1:])
+    result = {"operation": operation,
+              "size": size,
+              "ops": ops,
+              "first_call_s": first_call,
+              "ops_per_s": len(latencies) / sum(latencies),
+              "p50_ms": percentile(latencies, 50) * 1000,
+              "p99_ms": percentile(latencies, 99) * 1000,
+              "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}
+    if metrics:
+        result["metrics"] = METRICS.snapshot()
+    queue.put(result)
+
+
+def percentile(sorted_values, percent):
+    """nearest rank percentile of a sorted list"""
+    rank = max(0, -(-percent * len(sorted_values) // 100) - 1)
+    return sorted_values[rank]
+
+
+def git_revision():
+    """commit of the working tree, None outside a git repository"""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, check=True,
+                              text=True, cwd=os.path.dirname(__file__)).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    """runs every case and saves the results"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--operations", nargs="+", choices=OPERATIONS, default=OPERATIONS)
+    parser.add_argument("--ops", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--output", default="account_manager_benchmark.json")
+    parser.add_argument("--metrics", action="store_true")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'operation':<22}{'size':>10}{'ops/s':>12}{'p50 ms':>10}{'p99 ms':>10}"
+          f"{'first s':>10}{'rss MB':>10}")
+    for size in args.sizes:
+        for operation in args.operations:
+            queue = multiprocessing.Queue()
+            process = multiprocessing.Process(target=run_case,
+                                              args=(operation, size, args.ops,
+                                                    args.seed, args.metrics, queue))
+            process.start()
+            result = queue.get()
+            process.join()
+            results.append(result)
+            print(f"{operation:<22}{size:>10}{result['ops_per_s']:>12.1f}"
+                  f"{result['p50_ms']:>10.3f}{result['p99_ms']:>10.3f}"
+                  f"{result['first_call_s']:>10.3f}{result['peak_rss_mb']:>10.1f}")
+
+    with open(args.output, "w", encoding="utf-8", newline="") as file:
+        json.dump({"revision": git_revision(),
+                   "python": platform.python_version(),
+                   "platform": platform.platform(),
+                   "time": time.time(),
+                   "results": results}, file, indent=2)
+    print(f"results saved in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark: one calculate_balance per IBAN against the single pass aggregation.
+
+Usage: python src/benchmark/python/all_balances_benchmark.py [--transactions N] [--ibans M]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../main/python"))
+
+# pylint: disable=wrong-import-position
+from uc3m_money import TransactionsFile
+from uc3m_money import balance_aggregator
+
+
+def write_transactions(file_path, transactions, ibans, seed=2025):
+    """writes a transactions file with random amounts"""
+    rnd = random.Random(seed)
+    iban_list = [f"ES{rnd.randrange(10 ** 22):022d}" for _ in range(ibans)]
+    with open(file_path, "w", encoding="utf-8", newline="") as file:
+        json.dump([{"IBAN": rnd.choice(iban_list),
+                    "amount": f"{rnd.randrange(-500000, 500000) / 100:+.2f}"}
+                   for _ in range(transactions)], file, indent=4)
+    return iban_list
+
+
+def per_iban_loop(file_path, iban_list):
+    """previous calculate_balance algorithm, called once per iban"""
+    balances = {}
+    for iban in iban_list:
+        with open(file_path, "r", encoding="utf-8", newline="") as file:
+            t_l = json.load(file)
+        bal_s = 0
+        for transaction in t_l:
+            if transaction["IBAN"] == iban:
+                bal_s += float(transaction["amount"])
+        balances[iban] = bal_s
+    return balances
+
+
+def timed(function, *args):
+    """returns the result of the call and the seconds it took"""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    """runs the benchmark and prints the results"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transactions", type=int, default=50000)
+    parser.add_argument("--ibans", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "transactions.json")
+        iban_list = write_transactions(file_path, args.transactions, args.ibans)
+        transactions = TransactionsFile(file_path)
+
+        expected, loop_time = timed(per_iban_loop, file_path, iban_list)
+        # untimed call: the first one imports the lazy modules it uses
+        balance_aggregator.aggregate_balances(transactions)
+        balances, single_time = timed(balance_aggregator.aggregate_balances, transactions)
+        assert balances == expected
+        results = [("per iban loop", loop_time), ("single pass", single_time)]
+
+    print(f"{args.transactions} transactions, {args.ibans} ibans")
+    for name, seconds in results:
+        print(f"{name:<22} {seconds:10.3f} s {loop_time / seconds:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
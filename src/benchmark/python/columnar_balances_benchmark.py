@@ -0,0 +1,70 @@
+"""Benchmark: balances over the json transactions file against the columnar copy.
+
+Usage: python src/benchmark/python/columnar_balances_benchmark.py
+           [--transactions N] [--ibans M] [--queries Q]
+"""
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../main/python"))
+
+# pylint: disable=wrong-import-position
+from uc3m_money import ColumnarTransactions, SyntheticDataGenerator, TransactionsFile
+from uc3m_money.balance_aggregator import aggregate_balances
+
+
+def timed(function, *args):
+    """returns the result of the call and the seconds it took"""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def measure(transactions, columnar, ibans):
+    """returns the seconds of each operation and the peak rss growth"""
+    _, convert_time = timed(columnar.convert, transactions)
+    expected, json_time = timed(aggregate_balances, transactions)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    balances, columnar_time = timed(columnar.balances)
+    assert all(round(expected[k], 2) == balances[k] for k in expected)
+    _, query_time = timed(lambda: [columnar.balance(k) for k in ibans])
+    return {"conversion": convert_time,
+            "json": json_time,
+            "columnar": columnar_time,
+            "query": query_time / len(ibans),
+            "rss_growth": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before}
+
+
+def main():
+    """runs the benchmark and prints the results"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transactions", type=int, default=1000000)
+    parser.add_argument("--ibans", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+
+    generator = SyntheticDataGenerator(2025)
+    ibans = generator.ibans(args.ibans)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        transactions = TransactionsFile(os.path.join(temp_dir, "transactions.json"))
+        generator.write_transactions_file(transactions.file_path, args.transactions, ibans)
+        columnar = ColumnarTransactions(os.path.join(temp_dir, "transactions.bin"))
+        results = measure(transactions, columnar, ibans[:args.queries])
+        sizes = (os.path.getsize(transactions.file_path), os.path.getsize(columnar.file_path))
+
+    print(f"{args.transactions} transactions, {args.ibans} ibans, "
+          f"{sizes[0] / 2 ** 20:.1f} MB json, {sizes[1] / 2 ** 20:.1f} MB columnar")
+    print(f"{'conversion':<28} {results['conversion']:10.3f} s")
+    print(f"{'all balances (json)':<28} {results['json']:10.3f} s")
+    print(f"{'all balances (columnar)':<28} {results['columnar']:10.3f} s "
+          f"{results['json'] / results['columnar']:8.1f}x")
+    print(f"{'one balance (columnar)':<28} {results['query']:10.3f} s")
+    print(f"{'peak rss growth':<28} {results['rss_growth'] / 1024:10.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
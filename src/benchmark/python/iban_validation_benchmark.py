@@ -0,0 +1,87 @@
+"""Benchmark: previous valivan against the IbanValidator.
+
+Usage: python src/benchmark/python/iban_validation_benchmark.py [--ibans N] [--repeat R]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../main/python"))
+
+# pylint: disable=wrong-import-position
+from uc3m_money import IbanValidator
+from uc3m_money import iban_validator
+
+
+def legacy_valivan(ic):
+    """previous AccountManager.valivan (letter replacement and big int)"""
+    mr = re.compile(r"^ES[0-9]{22}")
+    if not mr.fullmatch(ic):
+        raise ValueError("Invalid IBAN format")
+    iban = ic[:2] + "00" + ic[4:]
+    iban = iban[4:] + iban[:4]
+    for letter in "ABCDEFGHIJKLMNOPQRSTUVWXYZ":
+        iban = iban.replace(letter, str(ord(letter) - ord("A") + 10))
+    if int(ic[2:4]) != 98 - int(iban) % 97:
+        raise ValueError("Invalid IBAN control digit")
+    return ic
+
+
+def random_ibans(count, seed=2025):
+    """valid spanish ibans"""
+    rnd = random.Random(seed)
+    ibans = []
+    for _ in range(count):
+        bban = f"{rnd.randrange(10 ** 20):020d}"
+        ibans.append(f"ES{IbanValidator.control_digits('ES00' + bban):02d}{bban}")
+    return ibans
+
+
+def timed(function, ibans, repeat):
+    """ibans validated per second"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function(ibans)
+    return len(ibans) * repeat / (time.perf_counter() - start)
+
+
+def main():
+    """runs the benchmark and prints the results"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ibans", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    ibans = random_ibans(args.ibans)
+
+    def uncached(ibans):
+        for iban in ibans:
+            IbanValidator.iban_error(iban)
+
+    def cached(ibans):
+        for iban in ibans:
+            validator.validate(iban)
+
+    validator = IbanValidator(cache_size=args.ibans)
+    cached(ibans)
+    results = [("legacy valivan", timed(lambda ibans: [legacy_valivan(k) for k in ibans],
+                                        ibans, args.repeat)),
+               ("chunked mod 97", timed(uncached, ibans, args.repeat)),
+               ("lru cache hits", timed(cached, ibans, args.repeat))]
+    with patch.object(iban_validator, "numpy", None):
+        results.append(("validate_ibans (python)",
+                        timed(IbanValidator().validate_ibans, ibans, args.repeat)))
+    if iban_validator.numpy is not None:
+        results.append(("validate_ibans (numpy)",
+                        timed(IbanValidator().validate_ibans, ibans, args.repeat)))
+
+    print(f"{args.ibans} ibans x {args.repeat}")
+    for name, rate in results:
+        print(f"{name:<25} {rate:14,.0f} ibans/s {rate / results[0][1]:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark: dump and parse times and sizes of a store with every json codec.
+
+The baseline is the json array indented by 2 of the standard json module;
+the codecs write the store as JsonLinesStore does (one record per line)
+in pretty mode and in compact mode, with the standard json module and
+with orjson (when it is installed).
+
+Usage: python src/benchmark/python/json_codec_benchmark.py [--records N] [--repeat R]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../main/python"))
+
+# pylint: disable=wrong-import-position
+from uc3m_money import JsonLinesStore, SyntheticDataGenerator
+from uc3m_money.json_codec import JsonCodec
+
+
+def store_records(records, seed=2025):
+    """records of a synthetic transfers store"""
+    generator = SyntheticDataGenerator(seed)
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "transfers_store.json")
+        generator.write_transfers_store(file_path, records, generator.ibans(1000))
+        return list(JsonLinesStore(file_path).read())
+
+
+def best_time(function, repeat):
+    """shortest time of repeat calls and the result of the last one"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def measure_array(records, repeat):
+    """json array indented by 2, standard json module"""
+    dump_s, data = best_time(lambda: json.dumps(records, indent=2).encode(), repeat)
+    parse_s, _ = best_time(lambda: json.loads(data), repeat)
+    return dump_s, parse_s, len(data)
+
+
+def measure_lines(records, codec, repeat):
+    """one record per line with the codec"""
+    dump_s, data = best_time(lambda: b"".join(codec.dumps(record) + b"\n"
+                                              for record in records), repeat)
+    lines = data.splitlines()
+    parse_s, _ = best_time(lambda: [codec.loads(line) for line in lines], repeat)
+    return dump_s, parse_s, len(data)
+
+
+def main():
+    """measures every codec and prints the speedups over the baseline"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    records = store_records(args.records)
+    cases = [("json array indent=2", measure_array(records, args.repeat))]
+    codecs = [("json pretty lines", JsonCodec(pretty=True, fast=False)),
+              ("json compact lines", JsonCodec(fast=False))]
+    if JsonCodec().name == "orjson":
+        codecs.append(("orjson compact lines", JsonCodec()))
+    for name, codec in codecs:
+        cases.append((name, measure_lines(records, codec, args.repeat)))
+
+    base_dump, base_parse, base_size = cases[0][1]
+    print(f"{args.records} records")
+    print(f"{'codec':<24}{'dump s':>10}{'x':>7}{'parse s':>10}{'x':>7}{'MB':>9}{'size':>7}")
+    for name, (dump_s, parse_s, size) in cases:
+        print(f"{name:<24}{dump_s:>10.3f}{base_dump / dump_s:>7.1f}"
+              f"{parse_s:>10.3f}{base_parse / parse_s:>7.1f}"
+              f"{size / 1e6:>9.1f}{size / base_size:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,115 @@
-"""UC3M LOGISTICS MODULE WITH ALL THE FEATURES REQUIRED FOR ACCESS CONTROL"""
+"""UC3M LOGISTICS MODULE WITH ALL THE FEATURES REQUIRED FOR ACCESS CONTROL
+
+The classes are imported the first time they are used (PEP 562), so
+importing the package, or a command that only needs some of them,
+does not load the rest"""
+import importlib
+from typing import TYPE_CHECKING
 
-from uc3m_money.transfer_request import TransferRequest
-from uc3m_money.account_manager import AccountManager
-from uc3m_money.account_management_exception import AccountManagementException
-from uc3m_money.account_deposit import AccountDeposit
 from uc3m_money.account_management_config import (JSON_FILES_PATH,
                                         JSON_FILES_DEPOSITS,
                                         TRANSFERS_STORE_FILE,
+                                        TRANSFERS_INDEX_FILE,
                                         DEPOSITS_STORE_FILE,
+                                        DEPOSITS_INDEX_FILE,
+                                        DEPOSIT_KEYS_STORE_FILE,
                                         TRANSACTIONS_STORE_FILE,
-                                        BALANCES_STORE_FILE)
+                                        BALANCES_STORE_FILE,
+                                        BALANCE_INDEX_FILE,
+                                        TRANSACTIONS_COLUMNAR_FILE,
+                                        WRITE_AHEAD_LOG_FILE,
+                                        SHARDS_LAYOUT_FILE,
+                                        STORE_SHARDS,
+                                        STORE_CACHE_BYTES,
+                                        JSON_PRETTY)
+
+_EXPORTS = {"TransferRequest": "transfer_request",
+            "AccountManager": "account_manager",
+            "AsyncAccountManager": "async_account_manager",
+            "AccountManagementException": "account_management_exception",
+            "AccountDeposit": "account_deposit",
+            "JsonLinesStore": "json_lines_store",
+            "TransferIndex": "transfer_index",
+            "TransactionsFile": "transactions_file",
+            "BalanceIndex": "balance_index",
+            "BalanceHistory": "balance_history",
+            "BloomFilter": "bloom_filter",
+            "DepositIndex": "deposit_index",
+            "deposit_key": "deposit_index",
+            "ColumnarTransactions": "columnar_transactions",
+            "WriteAheadLog": "write_ahead_log",
+            "CommitQueue": "commit_queue",
+            "IbanValidator": "iban_validator",
+            "IBAN_VALIDATOR": "iban_validator",
+            "Metrics": "metrics",
+            "METRICS": "metrics",
+            "SyntheticDataGenerator": "synthetic_data_generator",
+            "StorageBackend": "storage_backend",
+            "JsonStorageBackend": "json_storage_backend",
+            "SqliteStorageBackend": "sqlite_storage_backend",
+            "SegmentedStore": "segmented_store",
+            "MultiProcessStorageBackend": "multi_process_storage_backend",
+            "ShardedStorageBackend": "sharded_storage_backend",
+            "StoreResharder": "store_resharder",
+            "TransferBatch": "transfer_batch",
+            "AccountService": "account_service",
+            "AccountServiceClient": "account_service_client",
+            "StoreCache": "store_cache",
+            "STORE_CACHE": "store_cache",
+            "JsonCodec": "json_codec",
+            "JSON_CODEC": "json_codec"}
+
+__all__ = list(_EXPORTS) + ["JSON_FILES_PATH", "JSON_FILES_DEPOSITS", "TRANSFERS_STORE_FILE",
+                            "TRANSFERS_INDEX_FILE", "DEPOSITS_STORE_FILE",
+                            "DEPOSITS_INDEX_FILE", "DEPOSIT_KEYS_STORE_FILE",
+                            "TRANSACTIONS_STORE_FILE",
+                            "BALANCES_STORE_FILE", "BALANCE_INDEX_FILE",
+                            "TRANSACTIONS_COLUMNAR_FILE", "WRITE_AHEAD_LOG_FILE",
+                            "SHARDS_LAYOUT_FILE", "STORE_SHARDS", "STORE_CACHE_BYTES",
+                            "JSON_PRETTY"]
+
+if TYPE_CHECKING:
+    # the names seen by the type checkers and linters
+    from uc3m_money.transfer_request import TransferRequest
+    from uc3m_money.account_manager import AccountManager
+    from uc3m_money.async_account_manager import AsyncAccountManager
+    from uc3m_money.account_management_exception import AccountManagementException
+    from uc3m_money.account_deposit import AccountDeposit
+    from uc3m_money.json_lines_store import JsonLinesStore
+    from uc3m_money.transfer_index import TransferIndex
+    from uc3m_money.transactions_file import TransactionsFile
+    from uc3m_money.balance_index import BalanceIndex
+    from uc3m_money.balance_history import BalanceHistory
+    from uc3m_money.bloom_filter import BloomFilter
+    from uc3m_money.deposit_index import DepositIndex, deposit_key
+    from uc3m_money.columnar_transactions import ColumnarTransactions
+    from uc3m_money.write_ahead_log import WriteAheadLog
+    from uc3m_money.commit_queue import CommitQueue
+    from uc3m_money.iban_validator import IbanValidator, IBAN_VALIDATOR
+    from uc3m_money.metrics import Metrics, METRICS
+    from uc3m_money.synthetic_data_generator import SyntheticDataGenerator
+    from uc3m_money.storage_backend import StorageBackend
+    from uc3m_money.json_storage_backend import JsonStorageBackend
+    from uc3m_money.sqlite_storage_backend import SqliteStorageBackend
+    from uc3m_money.segmented_store import SegmentedStore
+    from uc3m_money.multi_process_storage_backend import MultiProcessStorageBackend
+    from uc3m_money.sharded_storage_backend import ShardedStorageBackend
+    from uc3m_money.store_resharder import StoreResharder
+    from uc3m_money.transfer_batch import TransferBatch
+    from uc3m_money.account_service import AccountService
+    from uc3m_money.account_service_client import AccountServiceClient
+    from uc3m_money.store_cache import StoreCache, STORE_CACHE
+    from uc3m_money.json_codec import JsonCodec, JSON_CODEC
+
+
+def __getattr__(name):
+    """imports the module of an exported name the first time it is used"""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{_EXPORTS[name]}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
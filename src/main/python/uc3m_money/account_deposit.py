@@ -3,7 +3,10 @@ from datetime import datetime, timezone
 import hashlib
 
 class AccountDeposit():
-    """Class representing the information required for shipping of an order"""
+    """Class representing the information required for shipping of an order.
+    The signature is calculated once and again only if a field is changed"""
+    __slots__ = ("__alg", "__type", "__to_iban", "__deposit_amount",
+                 "__deposit_date", "__signature")
 
     def __init__(self,
                  to_iban: str,
@@ -14,6 +17,7 @@ class AccountDeposit():
         self.__deposit_amount = deposit_amount
         justnow = datetime.now(timezone.utc)
         self.__deposit_date = datetime.timestamp(justnow)
+        self.__signature = None
 
     def to_json(self):
         """returns the object data in json format"""
@@ -38,6 +42,7 @@ class AccountDeposit():
     @to_iban.setter
     def to_iban(self, value):
         self.__to_iban = value
+        self.__signature = None
 
     @property
     def deposit_amount(self):
@@ -46,6 +51,7 @@ class AccountDeposit():
     @deposit_amount.setter
     def deposit_amount(self, value):
         self.__deposit_amount = value
+        self.__signature = None
 
     @property
     def deposit_date(self):
@@ -54,9 +60,12 @@ class AccountDeposit():
     @deposit_date.setter
     def deposit_date( self, value ):
         self.__deposit_date = value
+        self.__signature = None
 
 
     @property
     def deposit_signature( self ):
         """Returns the sha256 signature of the date"""
-        return hashlib.sha256(self.__signature_string().encode()).hexdigest()
+        if self.__signature is None:
+            self.__signature = hashlib.sha256(self.__signature_string().encode()).hexdigest()
+        return self.__signature
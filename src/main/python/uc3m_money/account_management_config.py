@@ -3,6 +3,18 @@ import os.path
 JSON_FILES_PATH = os.path.join(os.path.dirname(__file__),"../../../unittest/JSONFiles/")
 JSON_FILES_DEPOSITS = JSON_FILES_PATH + ("/deposits/")
 TRANSFERS_STORE_FILE = JSON_FILES_PATH + "transfers_store.json"
+TRANSFERS_INDEX_FILE = JSON_FILES_PATH + "transfers_index.json"
 DEPOSITS_STORE_FILE = JSON_FILES_PATH + "deposits_store.json"
+DEPOSITS_INDEX_FILE = JSON_FILES_PATH + "deposits_index.json"
+DEPOSIT_KEYS_STORE_FILE = JSON_FILES_PATH + "deposit_keys_store.json"
 TRANSACTIONS_STORE_FILE = JSON_FILES_PATH + "transactions.json"
 BALANCES_STORE_FILE = JSON_FILES_PATH + "balances.json"
+BALANCE_INDEX_FILE = JSON_FILES_PATH + "balance_index.json"
+TRANSACTIONS_COLUMNAR_FILE = JSON_FILES_PATH + "transactions.bin"
+WRITE_AHEAD_LOG_FILE = JSON_FILES_PATH + "stores.wal"
+SHARDS_LAYOUT_FILE = JSON_FILES_PATH + "shards.json"
+STORE_SHARDS = 8
+# memory (estimated) of the parsed records of the stores kept in cache
+STORE_CACHE_BYTES = 64 * 1024 * 1024
+# json files are written without blanks (True indents them, for debugging)
+JSON_PRETTY = False
@@ -1,21 +1,76 @@
 """Account manager module """
+import os
 import re
 import json
+import threading
+from concurrent.futures import Future
 from datetime import datetime, timezone
 from uc3m_money.account_management_exception import AccountManagementException
-from uc3m_money.account_management_config import (TRANSFERS_STORE_FILE,
-                                        DEPOSITS_STORE_FILE,
-                                        TRANSACTIONS_STORE_FILE,
-                                        BALANCES_STORE_FILE)
+from uc3m_money.account_management_config import JSON_FILES_DEPOSITS
 
 from uc3m_money.transfer_request import TransferRequest
 from uc3m_money.account_deposit import AccountDeposit
+from uc3m_money.transfer_index import transfer_key
+from uc3m_money.deposit_index import deposit_key
+from uc3m_money.storage_backend import StorageBackend
+from uc3m_money.json_storage_backend import JsonStorageBackend
+from uc3m_money.commit_queue import CommitQueue
+from uc3m_money.iban_validator import IBAN_VALIDATOR
+from uc3m_money.metrics import METRICS
+from uc3m_money.json_codec import JSON_CODEC
 
 
+#pylint: disable=too-many-public-methods
 class AccountManager:
-    """Class for providing the methods for managing the orders"""
-    def __init__(self):
-        pass
+    """Class for providing the methods for managing the orders.
+    json_files_path moves all the stores to another directory
+    (by default they are the ones of account_management_config).
+    backend replaces the json files by another StorageBackend.
+    The manager can be shared by several threads: the writes to the
+    backend are serialized with a lock, the concurrent transfer_request
+    and deposit_into_account calls are committed together by the first
+    thread that gets it, and the submit methods validate in the caller
+    thread and commit on a single writer thread.
+    Deposits are idempotent: a deposit file with the same content is
+    stored only once and its replays return the original signature (the
+    backends keep the idempotency keys, the multi-process one locking
+    them among the processes).
+    The phases of the operations are timed in METRICS when it is enabled.
+    The records parsed from the json stores are kept in STORE_CACHE and
+    reused while their files do not change"""
+    def __init__(self, json_files_path: str = None, backend: StorageBackend = None):
+        self.__json_files_path = json_files_path
+        if backend is None:
+            backend = JsonStorageBackend(json_files_path)
+        self.__backend = backend
+        self.__lock = threading.RLock()
+        self.__commit_queue = CommitQueue(self.__commit, self.__lock)
+
+    @property
+    def backend(self) -> StorageBackend:
+        """storage backend of the manager"""
+        return self.__backend
+
+    def __path(self, store_file):
+        """path of a store file in the json files directory of the manager"""
+        if self.__json_files_path is None:
+            return store_file
+        return os.path.join(self.__json_files_path, os.path.basename(store_file))
+
+    def migrate_stores(self):
+        """converts the stores saved as json arrays into one record per line"""
+        with self.__lock:
+            self.__backend.migrate()
+
+    def load_stores(self):
+        """loads the indexes of the stores in memory, so the first
+        operations do not wait for it (long running processes)"""
+        with self.__lock:
+            self.__backend.load()
+
+    def close(self):
+        """commits the submitted operations and stops the writer thread"""
+        self.__commit_queue.close()
 
     @staticmethod
     def valivan(ic: str):
@@ -28,47 +83,7 @@ class AccountManager:
     Returns:
         str: El dígito de control calculado.
         """
-        mr = re.compile(r"^ES[0-9]{22}")
-        res = mr.fullmatch(ic)
-        if not res:
-            raise AccountManagementException("Invalid IBAN format")
-        iban = ic
-        original_code = iban[2:4]
-        #replacing the control
-        iban = iban[:2] + "00" + iban[4:]
-        iban = iban[4:] + iban[:4]
-
-
-        # Convertir el IBAN en una cadena numérica, reemplazando letras por números
-        iban = (iban.replace('A', '10').replace('B', '11').
-                replace('C', '12').replace('D', '13').replace('E', '14').
-                replace('F', '15'))
-        iban = (iban.replace('G', '16').replace('H', '17').
-                replace('I', '18').replace('J', '19').replace('K', '20').
-                replace('L', '21'))
-        iban = (iban.replace('M', '22').replace('N', '23').
-                replace('O', '24').replace('P', '25').replace('Q', '26').
-                replace('R', '27'))
-        iban = (iban.replace('S', '28').replace('T', '29').replace('U', '30').
-                replace('V', '31').replace('W', '32').replace('X', '33'))
-        iban = iban.replace('Y', '34').replace('Z', '35')
-
-        # Mover los cuatro primeros caracteres al final
-
-        # Convertir la cadena en un número entero
-        int_i = int(iban)
-
-        # Calcular el módulo 97
-        mod = int_i % 97
-
-        # Calcular el dígito de control (97 menos el módulo)
-        dc = 98 - mod
-
-        if int(original_code) != dc:
-            #print(dc)
-            raise AccountManagementException("Invalid IBAN control digit")
-
-        return ic
+        return IBAN_VALIDATOR.validate(ic)
 
     def validate_concept(self, concept: str):
         """regular expression for checking the minimum and maximum length as well as
@@ -107,6 +122,127 @@ class AccountManager:
                          amount: float)->str:
         """first method: receives transfer info and
         stores it into a file"""
+        with METRICS.phase("transfer_request"):
+            with METRICS.phase("transfer.validation"):
+                my_request = self.create_transfer_request(from_iban=from_iban,
+                                                          to_iban=to_iban,
+                                                          concept=concept,
+                                                          transfer_type=transfer_type,
+                                                          date=date,
+                                                          amount=amount)
+
+            return self.__commit_queue.commit(my_request)
+
+    #pylint: disable=too-many-arguments
+    def submit_transfer_request(self, from_iban: str,
+                                to_iban: str,
+                                concept: str,
+                                transfer_type: str,
+                                date: str,
+                                amount: float)->Future:
+        """validates the transfer in the caller thread and queues it for the
+        writer thread. Returns a Future of the transfer code (or of the
+        AccountManagementException)"""
+        try:
+            my_request = self.create_transfer_request(from_iban=from_iban,
+                                                      to_iban=to_iban,
+                                                      concept=concept,
+                                                      transfer_type=transfer_type,
+                                                      date=date,
+                                                      amount=amount)
+        except AccountManagementException as ex:
+            future = Future()
+            future.set_exception(ex)
+            return future
+        return self.__commit_queue.submit(my_request)
+
+    def transfer_requests_bulk(self, transfers)->list:
+        """receives an iterable of transfers (dicts with the arguments of
+        transfer_request) and stores all the valid ones with a single write.
+        Returns, in the same order, the transfer code of each stored transfer
+        or the AccountManagementException raised for the rejected ones"""
+        results = []
+        for transfer in transfers:
+            try:
+                try:
+                    results.append(self.create_transfer_request(**transfer))
+                except TypeError as ex:
+                    raise AccountManagementException("Invalid transfer data") from ex
+            except AccountManagementException as ex:
+                results.append(ex)
+        with self.__lock:
+            codes = iter(self.__commit_transfers([k for k in results
+                                                  if isinstance(k, TransferRequest)]))
+        return [next(codes) if isinstance(k, TransferRequest) else k for k in results]
+
+    def __commit_transfers(self, requests)->list:
+        """stores the transfer requests that are not duplicated with a
+        single write (the lock must be held). Returns the transfer code
+        or the AccountManagementException of each request"""
+        results = []
+        accepted = []
+        batch_keys = set()
+        with self.__backend.transfer_locks(requests):
+            for my_request in requests:
+                with METRICS.phase("transfer.duplicate_check"):
+                    key = transfer_key(my_request)
+                    duplicated = key in batch_keys or \
+                        self.__backend.transfer_exists(my_request)
+                if duplicated:
+                    results.append(
+                        AccountManagementException("Duplicated transfer in transfer list"))
+                    continue
+                batch_keys.add(key)
+                with METRICS.phase("transfer.signature"):
+                    accepted.append(my_request.to_json())
+                results.append(accepted[-1]["transfer_code"])
+            if accepted:
+                with METRICS.phase("transfer.write"):
+                    self.__backend.add_transfers(accepted)
+        return results
+
+    def __commit(self, items)->list:
+        """commits the transfers and the (key, deposit) pairs taken by the
+        writer thread"""
+        transfers = iter(self.__commit_transfers([k for k in items
+                                                  if isinstance(k, TransferRequest)]))
+        deposits = iter(self.__commit_deposits([k for k in items
+                                                if not isinstance(k, TransferRequest)]))
+        return [next(transfers) if isinstance(k, TransferRequest) else next(deposits)
+                for k in items]
+
+    def __commit_deposits(self, keyed_deposits)->list:
+        """stores the (key, deposit) pairs whose key is not stored yet with
+        a single write (the lock must be held). Returns the signature of
+        each deposit, the original one for the replays"""
+        results = []
+        accepted = []
+        batch_keys = {}
+        with self.__backend.deposit_locks([k for k, _ in keyed_deposits]):
+            for key, deposit_obj in keyed_deposits:
+                with METRICS.phase("deposit.duplicate_check"):
+                    signature = batch_keys.get(key) or \
+                        self.__backend.find_deposit(key, deposit_obj.to_iban)
+                if signature is None:
+                    with METRICS.phase("deposit.signature"):
+                        signature = deposit_obj.deposit_signature
+                    batch_keys[key] = signature
+                    accepted.append(deposit_obj.to_json())
+                results.append(signature)
+            if accepted:
+                with METRICS.phase("deposit.write"):
+                    self.__backend.add_deposits(accepted, list(batch_keys))
+        return results
+
+    #pylint: disable=too-many-arguments
+    def create_transfer_request(self, from_iban: str,
+                                to_iban: str,
+                                concept: str,
+                                transfer_type: str,
+                                date: str,
+                                amount: float)->TransferRequest:
+        """validates the transfer info and returns the transfer request
+        (it is not stored)"""
         self.valivan(from_iban)
         self.valivan(to_iban)
         self.validate_concept(concept)
@@ -132,50 +268,110 @@ class AccountManager:
         if f_amount < 10 or f_amount > 10000:
             raise AccountManagementException("Invalid transfer amount")
 
-        my_request = TransferRequest(from_iban=from_iban,
-                                     to_iban=to_iban,
-                                     transfer_concept=concept,
-                                     transfer_type=transfer_type,
-                                     transfer_date=date,
-                                     transfer_amount=amount)
-
-        try:
-            with open(TRANSFERS_STORE_FILE, "r", encoding="utf-8", newline="") as file:
-                t_l = json.load(file)
-        except FileNotFoundError:
-            t_l = []
-        except json.JSONDecodeError as ex:
-            raise AccountManagementException("JSON Decode Error - Wrong JSON Format") from ex
-
-        for t_i in t_l:
-            if (t_i["from_iban"] == my_request.from_iban and
-                    t_i["to_iban"] == my_request.to_iban and
-                    t_i["transfer_date"] == my_request.transfer_date and
-                    t_i["transfer_amount"] == my_request.transfer_amount and
-                    t_i["transfer_concept"] == my_request.transfer_concept and
-                    t_i["transfer_type"] == my_request.transfer_type):
-                raise AccountManagementException("Duplicated transfer in transfer list")
-
-        t_l.append(my_request.to_json())
-
-        try:
-            with open(TRANSFERS_STORE_FILE, "w", encoding="utf-8", newline="") as file:
-                json.dump(t_l, file, indent=2)
-        except FileNotFoundError as ex:
-            raise AccountManagementException("Wrong file  or file path") from ex
-        except json.JSONDecodeError as ex:
-            raise AccountManagementException("JSON Decode Error - Wrong JSON Format") from ex
-
-        return my_request.transfer_code
+        return TransferRequest(from_iban=from_iban,
+                               to_iban=to_iban,
+                               transfer_concept=concept,
+                               transfer_type=transfer_type,
+                               transfer_date=date,
+                               transfer_amount=amount)
 
     def deposit_into_account(self, input_file:str)->str:
         """manages the deposits received for accounts"""
+        with METRICS.phase("deposit_into_account"):
+            with METRICS.phase("deposit.validation"):
+                keyed_deposit = self.read_deposit_file(input_file)
+
+            return self.__commit_queue.commit(keyed_deposit)
+
+    def submit_deposit(self, input_file:str)->Future:
+        """validates the deposit file in the caller thread and queues it for
+        the writer thread. Returns a Future of the deposit signature (or of
+        the AccountManagementException)"""
+        outcome = self.try_create_deposit(input_file)
+        if isinstance(outcome, AccountManagementException):
+            future = Future()
+            future.set_exception(outcome)
+            return future
+        return self.__commit_queue.submit(outcome)
+
+    def deposit_directory(self, path:str = None, workers:int = None)->dict:
+        """manages all the deposit files (*.json) of a directory (by default
+        the deposits directory in the json files path). The files are
+        validated on a pool of workers processes and the valid deposits are
+        stored with a single write. Returns a dict with the deposit signature
+        or the AccountManagementException of every file"""
+        # pylint: disable=import-outside-toplevel
+        if path is None:
+            path = self.__path(os.path.normpath(JSON_FILES_DEPOSITS))
         try:
-            with open(input_file, "r", encoding="utf-8", newline="") as file:
-                i_d = json.load(file)
+            file_names = sorted(name for name in os.listdir(path) if name.endswith(".json"))
+        except FileNotFoundError as ex:
+            raise AccountManagementException("Error: deposits directory not found") from ex
+        input_files = [os.path.join(path, name) for name in file_names]
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 1 or len(input_files) <= 1:
+            outcomes = map(self.try_create_deposit, input_files)
+            results = self.__store_deposits(file_names, outcomes)
+        else:
+            # the process pool is imported here, where it is used
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            chunk_size = max(1, len(input_files) // (workers * 4))
+            # a forked worker could inherit a lock held by another thread
+            # (the commit queue writer, the metrics), so it is not forked
+            start_method = "forkserver" \
+                if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            with ProcessPoolExecutor(max_workers=workers,
+                                     mp_context=multiprocessing.get_context(start_method)) \
+                    as executor:
+                outcomes = executor.map(self.try_create_deposit, input_files,
+                                        chunksize=chunk_size)
+                results = self.__store_deposits(file_names, outcomes)
+        return results
+
+    def __store_deposits(self, file_names, outcomes):
+        """appends the valid deposits to the store and returns the results"""
+        results = {}
+        accepted = []
+        for file_name, outcome in zip(file_names, outcomes):
+            if isinstance(outcome, AccountManagementException):
+                results[file_name] = outcome
+            else:
+                accepted.append((file_name, outcome))
+        with self.__lock:
+            signatures = self.__commit_deposits([k for _, k in accepted])
+        results.update(zip((k for k, _ in accepted), signatures))
+        return results
+
+    @classmethod
+    def try_create_deposit(cls, input_file:str):
+        """returns the (key, deposit) pair of the input file or the exception
+        found validating it (used by the deposit_directory workers)"""
+        try:
+            return cls.read_deposit_file(input_file)
+        except AccountManagementException as ex:
+            return ex
+
+    @classmethod
+    def create_deposit(cls, input_file:str)->AccountDeposit:
+        """validates the deposit input file and returns the deposit
+        (it is not stored)"""
+        return cls.read_deposit_file(input_file)[1]
+
+    @classmethod
+    def read_deposit_file(cls, input_file:str)->tuple:
+        """validates the deposit input file and returns its idempotency key
+        and the deposit (it is not stored)"""
+        try:
+            with open(input_file, "rb") as file:
+                content = file.read()
+            METRICS.count("bytes_read", len(content))
+            i_d = JSON_CODEC.loads(content)
         except FileNotFoundError as ex:
             raise AccountManagementException("Error: file input not found") from ex
-        except json.JSONDecodeError as ex:
+        except (json.JSONDecodeError, UnicodeDecodeError) as ex:
             raise AccountManagementException("JSON Decode Error - Wrong JSON Format") from ex
 
         # comprobar valores del fichero
@@ -186,7 +382,7 @@ class AccountManager:
             raise AccountManagementException("Error - Invalid Key in JSON") from e
 
 
-        deposit_iban = self.valivan(deposit_iban)
+        deposit_iban = cls.valivan(deposit_iban)
         myregex = re.compile(r"^EUR [0-9]{4}\.[0-9]{2}")
         res = myregex.fullmatch(deposit_amount)
         if not res:
@@ -196,74 +392,111 @@ class AccountManager:
         if d_a_f == 0:
             raise AccountManagementException("Error - Deposit must be greater than 0")
 
-        deposit_obj = AccountDeposit(to_iban=deposit_iban,
-                                     deposit_amount=d_a_f)
-
-        try:
-            with open(DEPOSITS_STORE_FILE, "r", encoding="utf-8", newline="") as file:
-                d_l = json.load(file)
-        except FileNotFoundError as ex:
-            d_l = []
-        except json.JSONDecodeError as ex:
-            raise AccountManagementException("JSON Decode Error - Wrong JSON Format") from ex
-
-        d_l.append(deposit_obj.to_json())
-
-        try:
-            with open(DEPOSITS_STORE_FILE, "w", encoding="utf-8", newline="") as file:
-                json.dump(d_l, file, indent=2)
-        except FileNotFoundError as ex:
-            raise AccountManagementException("Wrong file  or file path") from ex
-        except json.JSONDecodeError as ex:
-            raise AccountManagementException("JSON Decode Error - Wrong JSON Format") from ex
-
-        return deposit_obj.deposit_signature
+        return (deposit_key(content, deposit_iban, deposit_amount),
+                AccountDeposit(to_iban=deposit_iban,
+                               deposit_amount=d_a_f))
 
 
     def read_transactions_file(self):
         """loads the content of the transactions file
-        and returns a list"""
-        try:
-            with open(TRANSACTIONS_STORE_FILE, "r", encoding="utf-8", newline="") as file:
-                input_list = json.load(file)
-        except FileNotFoundError as ex:
-            raise AccountManagementException("Wrong file  or file path") from ex
-        except json.JSONDecodeError as ex:
-            raise AccountManagementException("JSON Decode Error - Wrong JSON Format") from ex
-        return input_list
+        and returns a list (read_transactions streams it instead)"""
+        return list(self.read_transactions())
+
+    def read_transactions(self):
+        """generator that yields the transactions one by one without
+        loading the whole transactions file in memory (copies, the records
+        read by the backend may be shared with other managers)"""
+        return (dict(record) for record in self.__backend.read_transactions())
 
 
     def calculate_balance(self, iban:str)->bool:
         """calculate the balance for a given iban"""
+        with METRICS.phase("calculate_balance"):
+            with METRICS.phase("balance.validation"):
+                iban = self.valivan(iban)
+            with self.__lock:
+                with METRICS.phase("balance.calculation"):
+                    bal_s = self.__backend.balance(iban)
+                if bal_s is None:
+                    raise AccountManagementException("IBAN not found")
+
+                last_balance = {"IBAN": iban,
+                                "time": datetime.timestamp(datetime.now(timezone.utc)),
+                                "BALANCE": bal_s}
+
+                with METRICS.phase("balance.write"):
+                    self.__backend.add_balances([last_balance])
+        return True
+
+    def calculate_all_balances(self)->dict:
+        """calculates the balance of every iban in the transactions file
+        reading it only once, stores all of them with a single write
+        and returns them"""
+        with self.__lock:
+            balances = self.__backend.all_balances()
+            self.__store_balances(balances)
+        return balances
+
+    def calculate_balances(self, ibans)->dict:
+        """calculates the balances of the ibans reading the transactions file
+        only once and stores them with a single write. Returns the balance
+        of each iban or the AccountManagementException found for it;
+        raises it if an iban is not a string"""
+        ibans = list(ibans)
+        if not all(isinstance(iban, str) for iban in ibans):
+            raise AccountManagementException("Wrong IBAN")
+        results = {}
+        valid_ibans = []
+        for iban, result in zip(ibans, IBAN_VALIDATOR.validate_ibans(ibans)):
+            if isinstance(result, AccountManagementException):
+                results[iban] = result
+            else:
+                valid_ibans.append(iban)
+        with self.__lock:
+            all_balances = self.__backend.all_balances() if valid_ibans else {}
+            balances = {}
+            for iban in valid_ibans:
+                if iban in all_balances:
+                    balances[iban] = all_balances[iban]
+                else:
+                    results[iban] = AccountManagementException("IBAN not found")
+            results.update(balances)
+            self.__store_balances(balances)
+        return results
+
+    def latest_balance(self, iban:str)->dict:
+        """returns the last balance record stored for the iban"""
+        return self.balance_as_of(iban, None)
+
+    def balance_as_of(self, iban:str, time:float)->dict:
+        """returns the last balance record stored for the iban at or
+        before the timestamp"""
         iban = self.valivan(iban)
-        t_l = self.read_transactions_file()
-        iban_found = False
-        bal_s = 0
-        for transaction in t_l:
-            #print(transaction["IBAN"] + " - " + iban)
-            if transaction["IBAN"] == iban:
-                bal_s += float(transaction["amount"])
-                iban_found = True
-        if not iban_found:
+        with self.__lock:
+            snapshot = self.__backend.balance_snapshot(iban, time)
+        if snapshot is None:
             raise AccountManagementException("IBAN not found")
+        return snapshot
 
-        last_balance = {"IBAN": iban,
-                        "time": datetime.timestamp(datetime.now(timezone.utc)),
-                        "BALANCE": bal_s}
-
-        try:
-            with open(BALANCES_STORE_FILE, "r", encoding="utf-8", newline="") as file:
-                balance_list = json.load(file)
-        except FileNotFoundError:
-            balance_list = []
-        except json.JSONDecodeError as ex:
-            raise AccountManagementException("JSON Decode Error - Wrong JSON Format") from ex
-
-        balance_list.append(last_balance)
-
-        try:
-            with open(BALANCES_STORE_FILE, "w", encoding="utf-8", newline="") as file:
-                json.dump(balance_list, file, indent=2)
-        except FileNotFoundError as ex:
-            raise AccountManagementException("Wrong file  or file path") from ex
-        return True
+    def balance_history(self, iban:str, start:float, end:float)->list:
+        """returns the balance records stored for the iban
+        between the timestamps start and end"""
+        iban = self.valivan(iban)
+        with self.__lock:
+            return self.__backend.balance_snapshots(iban, start, end)
+
+    def thin_balance_history(self, keep_seconds:float, interval_seconds:float)->int:
+        """retention of the balance records: keeps all the ones of the last
+        keep_seconds and one per iban and interval_seconds for the older
+        ones. Returns how many records were removed"""
+        if interval_seconds <= 0:
+            raise AccountManagementException("Invalid thinning interval")
+        now = datetime.timestamp(datetime.now(timezone.utc))
+        with self.__lock:
+            return self.__backend.thin_balances(keep_seconds, interval_seconds, now)
+
+    def __store_balances(self, balances):
+        """appends a balance record for every iban with a single write"""
+        now = datetime.timestamp(datetime.now(timezone.utc))
+        self.__backend.add_balances([{"IBAN": iban, "time": now, "BALANCE": balance}
+                                     for iban, balance in balances.items()])
@@ -0,0 +1,276 @@
+"""MODULE: account_service. Contains the account manager service class
+
+Usage: uc3m-service [--socket PATH | --host HOST --port N]
+           [--json-files-path PATH] [--backend json|sharded|sqlite]
+           [--shards N] [--database FILE] [--metrics]
+"""
+import argparse
+import json
+import os
+import signal
+import stat
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingUnixStreamServer
+from uc3m_money.account_management_exception import AccountManagementException
+from uc3m_money.metrics import METRICS
+
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8765
+# pending connections of the listening socket (socketserver uses 5, a burst
+# of clients connecting at once got their connections reset)
+LISTEN_BACKLOG = 128
+
+
+def _check_strings(arguments, *names):
+    """raises TypeError if an argument of the names is not a str (an int
+    input_file would be opened as a file descriptor)"""
+    if not isinstance(arguments, dict) or \
+            not all(isinstance(arguments.get(k), str) for k in names):
+        raise TypeError("the arguments must be strings")
+
+
+def _transfer_request(manager, arguments):
+    """transfer code of a transfer, committed by the writer thread"""
+    _check_strings(arguments, "from_iban", "to_iban", "concept", "transfer_type", "date")
+    return manager.submit_transfer_request(**arguments).result()
+
+
+def _deposit_into_account(manager, arguments):
+    """signature of a deposit file, committed by the writer thread"""
+    _check_strings(arguments, "input_file")
+    try:
+        future = manager.submit_deposit(**arguments)
+    except OSError as ex:
+        # a directory or a file that cannot be opened
+        raise AccountManagementException("Error: file input cannot be read") from ex
+    return future.result()
+
+
+def _calculate_balance(manager, arguments):
+    """calculates and stores the balance of an iban"""
+    _check_strings(arguments, "iban")
+    return manager.calculate_balance(**arguments)
+
+
+# path of the request: operation of the manager
+OPERATIONS = {"/transfer_request": _transfer_request,
+              "/deposit_into_account": _deposit_into_account,
+              "/calculate_balance": _calculate_balance}
+
+
+class AccountService:
+    """Long running account manager served over localhost HTTP (address
+    is a (host, port) tuple, port 0 picks a free one) or over a Unix
+    domain socket (address is the path of the socket). The stores and
+    their indexes are loaded once when it starts and stay in memory, so
+    a request does not parse any file. The operations are POST requests
+    with the arguments of the manager method as a json object, answered
+    with {"result": ...} or {"error": message}; GET /metrics returns
+    METRICS in the Prometheus text format. The writes of the concurrent
+    requests are committed together by the writer thread of the manager"""
+    def __init__(self, manager=None, address=(SERVICE_HOST, SERVICE_PORT)):
+        if manager is None:
+            # pylint: disable=import-outside-toplevel
+            from uc3m_money.account_manager import AccountManager
+            manager = AccountManager()
+        self.__manager = manager
+        if isinstance(address, str):
+            _remove_socket(address)
+            self.__server = _UnixServer(address, _RequestHandler)
+        else:
+            self.__server = _TcpServer(address, _TcpRequestHandler)
+        self.__server.manager = manager
+        self.__serving = threading.Event()
+        self.__thread = None
+
+    @property
+    def address(self):
+        """(host, port) or path of the socket the service listens on"""
+        return self.__server.server_address
+
+    @property
+    def manager(self):
+        """account manager of the service"""
+        return self.__manager
+
+    def start(self):
+        """serves the requests on a background thread"""
+        self.__manager.load_stores()
+        self.__thread = threading.Thread(target=self.__serve, name="account-service",
+                                         daemon=True)
+        self.__thread.start()
+
+    def serve_forever(self):
+        """serves the requests until the service is closed"""
+        self.__manager.load_stores()
+        self.__serve()
+
+    def __serve(self):
+        """request loop of the server"""
+        self.__serving.set()
+        try:
+            self.__server.serve_forever()
+        finally:
+            self.__serving.clear()
+
+    def close(self):
+        """stops serving, commits the submitted writes and closes the
+        backend"""
+        if self.__serving.is_set():
+            self.__server.shutdown()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+        self.__server.server_close()
+        if isinstance(self.address, str):
+            _remove_socket(self.address)
+        self.__manager.close()
+        self.__manager.backend.close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """HTTP/1.1 handler of the operations (the connections are kept open)"""
+    protocol_version = "HTTP/1.1"
+
+    # pylint: disable=invalid-name
+    def do_POST(self):
+        """runs an operation of the manager, any unexpected error is
+        answered with a 500 so the client is never left waiting"""
+        try:
+            self.__post()
+        except Exception:  # pylint: disable=broad-exception-caught
+            self.__reply(500, {"error": "Internal service error"})
+
+    def __post(self):
+        """runs an operation of the manager and answers it"""
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        operation = OPERATIONS.get(self.path)
+        if operation is None:
+            self.__reply(404, {"error": "Unknown operation"})
+            return
+        try:
+            result = operation(self.server.manager, json.loads(body))
+        except json.JSONDecodeError:
+            self.__reply(400, {"error": "JSON Decode Error - Wrong JSON Format"})
+        except TypeError:
+            self.__reply(400, {"error": "Invalid request data"})
+        except AccountManagementException as ex:
+            self.__reply(400, {"error": ex.message})
+        except OSError as ex:
+            self.__reply(500, {"error": f"Storage error: {ex.strerror}"})
+        else:
+            self.__reply(200, {"result": result})
+
+    def do_GET(self):
+        """returns the metrics"""
+        if self.path != "/metrics":
+            self.__reply(404, {"error": "Unknown operation"})
+            return
+        self.__send(200, "text/plain; version=0.0.4",
+                    METRICS.prometheus_text().encode("utf-8"))
+
+    def __reply(self, status, content):
+        """sends a json response"""
+        self.__send(status, "application/json", json.dumps(content).encode("utf-8"))
+
+    def __send(self, status, content_type, body):
+        """sends the response, the headers and the body in a single write"""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """the requests are not logged (METRICS times them)"""
+
+
+class _TcpRequestHandler(_RequestHandler):
+    """Handler of the localhost connections"""
+    disable_nagle_algorithm = True
+
+
+class _TcpServer(ThreadingHTTPServer):
+    """Localhost HTTP server"""
+    daemon_threads = True
+    request_queue_size = LISTEN_BACKLOG
+
+
+class _UnixServer(ThreadingUnixStreamServer):
+    """HTTP server on a Unix domain socket"""
+    daemon_threads = True
+    request_queue_size = LISTEN_BACKLOG
+
+    def get_request(self):
+        """the handler expects a (host, port) client address"""
+        request, _ = super().get_request()
+        return request, ("localhost", 0)
+
+
+def _remove_socket(path):
+    """removes the socket file left by a previous service (any other
+    file is left, and binding fails)"""
+    try:
+        if stat.S_ISSOCK(os.stat(path).st_mode):
+            os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def main(argv=None):
+    """command line entry of the service"""
+    parser = argparse.ArgumentParser(description="Serves the account manager")
+    parser.add_argument("--socket", default=None, help="Unix domain socket (instead of "
+                                                       "localhost HTTP)")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--json-files-path", default=None)
+    parser.add_argument("--backend", choices=("json", "sharded", "sqlite"), default="json")
+    parser.add_argument("--shards", type=int, default=None)
+    parser.add_argument("--database", default=":memory:")
+    parser.add_argument("--metrics", action="store_true", help="record the metrics")
+    args = parser.parse_args(argv)
+
+    # pylint: disable=import-outside-toplevel
+    from uc3m_money.account_manager import AccountManager
+    from uc3m_money.transfer_batch import create_backend
+    METRICS.enable(args.metrics)
+    address = args.socket if args.socket is not None else (args.host, args.port)
+    try:
+        backend = create_backend(args)
+    except (AccountManagementException, OSError) as ex:
+        print(getattr(ex, "message", ex), file=sys.stderr)
+        return 1
+    manager = AccountManager(args.json_files_path, backend)
+    try:
+        service = AccountService(manager, address)
+    except OSError as ex:
+        # the address is in use or cannot be bound
+        print(ex, file=sys.stderr)
+        manager.close()
+        manager.backend.close()
+        return 1
+    # SIGTERM stops the service like Ctrl+C
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    print(f"serving on {service.address}", file=sys.stderr)
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
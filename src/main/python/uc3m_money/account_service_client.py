@@ -0,0 +1,100 @@
+"""MODULE: account_service_client. Contains the account service client class"""
+import http.client
+import json
+import socket
+import threading
+from uc3m_money.account_management_exception import AccountManagementException
+from uc3m_money.account_service import SERVICE_HOST, SERVICE_PORT
+
+
+class AccountServiceClient:
+    """Client of an AccountService, with the methods of the manager it
+    serves. The connection is kept open between requests (and reopened
+    after an error); the client can be shared by several threads, which
+    send their requests one at a time"""
+    def __init__(self, address=(SERVICE_HOST, SERVICE_PORT), timeout: float = 30.0):
+        if isinstance(address, str):
+            self.__connection = _UnixConnection(address, timeout)
+        else:
+            self.__connection = http.client.HTTPConnection(address[0], address[1],
+                                                           timeout=timeout)
+        self.__lock = threading.Lock()
+
+    #pylint: disable=too-many-arguments
+    def transfer_request(self, from_iban: str,
+                         to_iban: str,
+                         concept: str,
+                         transfer_type: str,
+                         date: str,
+                         amount: float)->str:
+        """stores a transfer and returns its transfer code"""
+        return self.__call("transfer_request", {"from_iban": from_iban,
+                                                "to_iban": to_iban,
+                                                "concept": concept,
+                                                "transfer_type": transfer_type,
+                                                "date": date,
+                                                "amount": amount})
+
+    def deposit_into_account(self, input_file: str)->str:
+        """stores the deposit of a file (read by the service) and returns
+        its signature"""
+        return self.__call("deposit_into_account", {"input_file": input_file})
+
+    def calculate_balance(self, iban: str)->bool:
+        """calculates and stores the balance of an iban"""
+        return self.__call("calculate_balance", {"iban": iban})
+
+    def metrics(self) -> str:
+        """metrics of the service in the Prometheus text format"""
+        with self.__lock:
+            status, body = self.__request("GET", "/metrics", None)
+        if status != 200:
+            raise AccountManagementException(json.loads(body)["error"])
+        return body.decode("utf-8")
+
+    def __call(self, operation, arguments):
+        """sends an operation and returns its result (or raises its error)"""
+        body = json.dumps(arguments).encode("utf-8")
+        with self.__lock:
+            _, body = self.__request("POST", "/" + operation, body)
+        try:
+            response = json.loads(body)
+        except json.JSONDecodeError as ex:
+            raise AccountManagementException("JSON Decode Error - Wrong JSON Format") from ex
+        if "error" in response:
+            raise AccountManagementException(response["error"])
+        return response["result"]
+
+    def __request(self, method, path, body):
+        """status and body of a response"""
+        try:
+            self.__connection.request(method, path, body,
+                                      {"Content-Type": "application/json"})
+            response = self.__connection.getresponse()
+            return response.status, response.read()
+        except (http.client.HTTPException, OSError):
+            self.__connection.close()
+            raise
+
+    def close(self):
+        """closes the connection"""
+        with self.__lock:
+            self.__connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class _UnixConnection(http.client.HTTPConnection):
+    """HTTP connection over a Unix domain socket"""
+    def __init__(self, path, timeout):
+        super().__init__("localhost", timeout=timeout)
+        self.__path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.__path)
@@ -0,0 +1,67 @@
+"""MODULE: async_account_manager. Contains the asyncio account manager class"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from uc3m_money.account_manager import AccountManager
+from uc3m_money.storage_backend import StorageBackend
+
+MAX_WORKERS = 4
+
+
+class AsyncAccountManager:
+    """asyncio front end of an AccountManager. The blocking file I/O runs
+    on a bounded pool of threads and the transfers and deposits are
+    committed by the single writer of the manager, which writes all the
+    ones submitted at the same time with a single write to each store.
+    Every call accepts a timeout in seconds and can be cancelled: a
+    transfer or deposit cancelled before the writer takes it is not
+    stored (once taken it is stored anyway)"""
+    def __init__(self, json_files_path: str = None, backend: StorageBackend = None,
+                 max_workers: int = MAX_WORKERS):
+        self.__manager = AccountManager(json_files_path, backend)
+        self.__executor = ThreadPoolExecutor(max_workers=max_workers,
+                                             thread_name_prefix="account-manager")
+
+    @property
+    def manager(self) -> AccountManager:
+        """synchronous manager used by the async one"""
+        return self.__manager
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    #pylint: disable=too-many-arguments
+    async def transfer_request(self, from_iban: str,
+                               to_iban: str,
+                               concept: str,
+                               transfer_type: str,
+                               date: str,
+                               amount: float,
+                               timeout: float = None)->str:
+        """async transfer_request"""
+        future = self.__manager.submit_transfer_request(from_iban, to_iban, concept,
+                                                        transfer_type, date, amount)
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+
+    async def deposit_into_account(self, input_file: str, timeout: float = None)->str:
+        """async deposit_into_account (the input file is read on the pool)"""
+        async def deposit():
+            future = await self.__run(self.__manager.submit_deposit, input_file)
+            return await asyncio.wrap_future(future)
+        return await asyncio.wait_for(deposit(), timeout)
+
+    async def calculate_balance(self, iban: str, timeout: float = None)->bool:
+        """async calculate_balance"""
+        return await asyncio.wait_for(self.__run(self.__manager.calculate_balance, iban),
+                                      timeout)
+
+    async def close(self):
+        """commits the pending operations and stops the threads"""
+        await self.__run(self.__manager.close)
+        self.__executor.shutdown(wait=True)
+
+    def __run(self, function, *args):
+        """runs the blocking function on the pool"""
+        return asyncio.get_running_loop().run_in_executor(self.__executor, function, *args)
@@ -0,0 +1,14 @@
+"""MODULE: balance_aggregator. Single pass calculation of all the balances"""
+from uc3m_money.transactions_file import TransactionsFile
+
+
+def aggregate_balances(transactions: TransactionsFile) -> dict:
+    """reads the transactions file once and returns the balance of every iban.
+    Each amount is added to the total of its iban as it is read, so the
+    memory only depends on the number of ibans and the results are the
+    same as adding the amounts of each iban one by one in file order"""
+    totals = {}
+    for transaction, _ in transactions.read_from(0):
+        iban = transaction["IBAN"]
+        totals[iban] = totals.get(iban, 0) + float(transaction["amount"])
+    return totals
@@ -0,0 +1,105 @@
+"""MODULE: balance_history. Contains the per IBAN balance history class"""
+import os
+from bisect import bisect_left, bisect_right
+from uc3m_money.json_lines_store import JsonLinesStore
+from uc3m_money.json_codec import JSON_CODEC
+from uc3m_money.account_management_exception import AccountManagementException
+
+
+class BalanceHistory:
+    """Balance snapshots of the balances store partitioned by IBAN and
+    sorted by time, so the queries are binary searches. The history folds
+    in the snapshots appended after its checkpoint (the offset where the
+    last one read ends) and is read again if the store was replaced.
+    thin applies the retention policy rewriting the store"""
+    def __init__(self, store: JsonLinesStore):
+        self.__store = store
+        self.__partitions = {}
+        self.__count = 0
+        self.__checkpoint = 0
+        self.__last_record = None
+
+    def sync(self):
+        """adds the snapshots appended to the store since the checkpoint"""
+        if self.__store.size() < self.__checkpoint or not self.__covers_store():
+            self.__reset()
+        for record, offset in self.__store.read_from(self.__checkpoint):
+            self.__add(record)
+            self.__checkpoint = offset
+            self.__last_record = record
+
+    def latest(self, iban: str):
+        """returns the last snapshot of the iban, None if there is none"""
+        return self.as_of(iban, float("inf"))
+
+    def as_of(self, iban: str, time: float):
+        """returns the last snapshot of the iban taken at or before time,
+        None if there is none"""
+        self.sync()
+        times, records, _ = self.__partitions.get(iban, ((), (), ()))
+        position = bisect_right(times, time)
+        return dict(records[position - 1]) if position else None
+
+    def between(self, iban: str, start: float, end: float) -> list:
+        """returns the snapshots of the iban taken from start to end"""
+        self.sync()
+        times, records, _ = self.__partitions.get(iban, ((), (), ()))
+        return [dict(k) for k in records[bisect_left(times, start):bisect_right(times, end)]]
+
+    def thin(self, keep_seconds: float, interval_seconds: float, now: float) -> int:
+        """retention policy: keeps every snapshot of the last keep_seconds
+        before now and, for the older ones, only the last snapshot of each
+        iban in every interval_seconds period. Returns how many snapshots
+        were removed"""
+        if interval_seconds <= 0:
+            raise AccountManagementException("Invalid thinning interval")
+        self.sync()
+        kept = self.__kept_positions(now - keep_seconds, interval_seconds)
+        removed = 0
+        temp_path = self.__store.file_path + ".thinning"
+        with open(temp_path, "wb") as file:
+            for position, (record, _) in enumerate(self.__store.read_from(0)):
+                if position in kept:
+                    file.write(JSON_CODEC.dumps(record) + b"\n")
+                else:
+                    removed += 1
+        os.replace(temp_path, self.__store.file_path)
+        self.__reset()
+        return removed
+
+    def __kept_positions(self, cutoff, interval_seconds):
+        """positions in the store of the snapshots kept by thin"""
+        kept = set()
+        for times, _, positions in self.__partitions.values():
+            old = bisect_left(times, cutoff)
+            periods = {}
+            for time, position in zip(times[:old], positions[:old]):
+                periods[time // interval_seconds] = position
+            kept.update(periods.values())
+            kept.update(positions[old:])
+        return kept
+
+    def __reset(self):
+        """forgets the snapshots read"""
+        self.__partitions = {}
+        self.__count = 0
+        self.__checkpoint = 0
+        self.__last_record = None
+
+    def __add(self, record):
+        """inserts a snapshot in the partition of its iban"""
+        times, records, positions = self.__partitions.setdefault(record["IBAN"], ([], [], []))
+        position = len(times)
+        if times and record["time"] < times[-1]:
+            position = bisect_right(times, record["time"])
+        times.insert(position, record["time"])
+        records.insert(position, record)
+        positions.insert(position, self.__count)
+        self.__count += 1
+
+    def __covers_store(self):
+        """checks that the last snapshot read is still in the store at the
+        checkpoint, so a store replaced by another file is detected"""
+        if self.__checkpoint == 0:
+            return True
+        return self.__store.record_ending_at(self.__checkpoint) == self.__last_record
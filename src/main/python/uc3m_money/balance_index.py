@@ -0,0 +1,132 @@
+"""MODULE: balance_index. Contains the per IBAN balance index class"""
+import json
+import os
+import time
+import zlib
+from itertools import chain
+from uc3m_money.transactions_file import TransactionsFile
+from uc3m_money.json_codec import JSON_CODEC
+from uc3m_money.store_cache import RACY_NANOSECONDS, CHECKSUM_BLOCK_SIZE
+
+
+class BalanceIndex:
+    """Persistent running total of the amounts of every IBAN in the
+    transactions file. The index keeps a checkpoint (the offset where the
+    last applied transaction ends) and only folds in the transactions
+    added after it. The bytes before the checkpoint are checked to be the
+    ones folded in: the file still has the (inode, mtime, size) saved with
+    the index or, when it does not, the same crc32 of those bytes; if the
+    file was replaced or changed, the index is rebuilt from scratch"""
+    def __init__(self, transactions: TransactionsFile, index_file: str):
+        self.__transactions = transactions
+        self.__index_file = index_file
+        self.__state = None
+
+    def balance(self, iban: str):
+        """returns the balance of the iban, None if it has no transactions"""
+        self.sync()
+        return self.__state["balances"].get(iban)
+
+    def balances(self) -> dict:
+        """returns the balances of all the ibans"""
+        self.sync()
+        return dict(self.__state["balances"])
+
+    def sync(self):
+        """folds into the index the transactions added since the checkpoint"""
+        if self.__state is None:
+            self.__state = self.__load()
+        stat = self.__transactions.stat()
+        state = self.__state
+        if not self.__is_valid(state, stat):
+            state = self.__empty_state()
+        elif stat.st_size == state["checkpoint"]:
+            # nothing was added since the checkpoint
+            return
+        records = self.__transactions.read_from(state["checkpoint"])
+        first = next(records, None)
+        if first is None and state is self.__state:
+            records.close()
+            return
+
+        # the delta is applied to a copy, if the file is wrong the index
+        # is forgotten and loaded again on the next call
+        self.__state = None
+        balances = dict(state["balances"])
+        checkpoint = state["checkpoint"]
+        for transaction, checkpoint in chain([first] if first else [], records):
+            iban = transaction["IBAN"]
+            balances[iban] = balances.get(iban, 0) + float(transaction["amount"])
+
+        new_state = {"stat": _file_stat(stat),
+                     "checkpoint": checkpoint,
+                     "checksum": self.__checksum(state["checkpoint"], checkpoint,
+                                                 state["checksum"]),
+                     "balances": balances}
+        self.__state = new_state
+        self.__save()
+
+    def rebuild(self):
+        """recalculates the index from the whole transactions file"""
+        self.__state = self.__empty_state()
+        self.sync()
+
+    def __is_valid(self, state, stat):
+        """checks that the bytes before the checkpoint are the ones folded
+        into the index"""
+        checkpoint = state["checkpoint"]
+        if checkpoint == 0:
+            return True
+        if checkpoint > stat.st_size:
+            return False
+        if state["stat"] is not None and state["stat"] == _file_stat(stat):
+            return True
+        if self.__checksum(0, checkpoint) != state["checksum"]:
+            return False
+        # the file is only read again if it changes (not saved, the index
+        # file is written when there are new transactions)
+        state["stat"] = _file_stat(stat)
+        return True
+
+    def __checksum(self, start, end, checksum=0):
+        """crc32 of the bytes of the transactions file from start to end,
+        continuing the checksum of the bytes before start"""
+        while start < end:
+            block = self.__transactions.read_bytes(start, min(end - start,
+                                                              CHECKSUM_BLOCK_SIZE))
+            if not block:
+                break
+            checksum = zlib.crc32(block, checksum)
+            start += len(block)
+        return checksum
+
+    @staticmethod
+    def __empty_state():
+        """state of an index that has not read any transaction"""
+        return {"stat": None, "checkpoint": 0, "checksum": 0, "balances": {}}
+
+    def __load(self):
+        """reads the index file, an empty index if it is missing or damaged"""
+        try:
+            with open(self.__index_file, "rb") as file:
+                state = JSON_CODEC.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return self.__empty_state()
+        if not isinstance(state, dict) or set(state) != set(self.__empty_state()):
+            return self.__empty_state()
+        return state
+
+    def __save(self):
+        """writes the index file replacing the previous one"""
+        temp_path = f"{self.__index_file}.{os.getpid()}.saving"
+        with open(temp_path, "wb") as file:
+            JSON_CODEC.dump(self.__state, file)
+        os.replace(temp_path, self.__index_file)
+
+
+def _file_stat(stat):
+    """(inode, mtime, size) of the transactions file, None while its mtime
+    is too recent to tell apart two versions of the file"""
+    if time.time_ns() < stat.st_mtime_ns + RACY_NANOSECONDS:
+        return None
+    return [stat.st_ino, stat.st_mtime_ns, stat.st_size]
@@ -0,0 +1,43 @@
+"""MODULE: bloom_filter. Contains the bloom filter class"""
+import math
+
+ERROR_RATE = 0.01
+
+
+class BloomFilter:
+    """Bloom filter of hexadecimal digests (sha256, md5...). The positions
+    of a key are derived from two 64 bit halves of its digest, so no other
+    hash is calculated. A key that was added is always found; a key that
+    was not is found with probability error_rate while the filter holds
+    less than capacity keys"""
+    def __init__(self, capacity: int, error_rate: float = ERROR_RATE):
+        capacity = max(1, capacity)
+        self.__capacity = capacity
+        self.__size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.__hashes = max(1, round(self.__size / capacity * math.log(2)))
+        self.__bits = bytearray((self.__size + 7) // 8)
+        self.__count = 0
+
+    @property
+    def capacity(self):
+        """number of keys the filter was sized for"""
+        return self.__capacity
+
+    def __len__(self):
+        return self.__count
+
+    def add(self, key: str):
+        """adds the key to the filter"""
+        for position in self.__positions(key):
+            self.__bits[position >> 3] |= 1 << (position & 7)
+        self.__count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.__bits[position >> 3] & (1 << (position & 7))
+                   for position in self.__positions(key))
+
+    def __positions(self, key):
+        """bit positions of the key (double hashing)"""
+        digest = int(key[:32], 16)
+        first, second = digest >> 64, (digest & 0xFFFFFFFFFFFFFFFF) | 1
+        return [(first + number * second) % self.__size for number in range(self.__hashes)]
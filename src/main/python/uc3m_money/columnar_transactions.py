@@ -0,0 +1,203 @@
+"""MODULE: columnar_transactions. Contains the binary columnar transactions file class"""
+import json
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from uc3m_money.account_management_exception import AccountManagementException
+from uc3m_money.transactions_file import TransactionsFile
+from uc3m_money.lazy_import import lazy_import
+
+numpy = lazy_import("numpy")
+
+MAGIC = b"UC3MTX01"
+# magic, transactions, ibans, dictionary offset, dictionary size,
+# size and modification time of the converted transactions file
+HEADER = struct.Struct("<8sQQQQQQ")
+CHUNK_ROWS = 1 << 22
+
+
+def amount_cents(amount) -> int:
+    """returns the amount of a transaction ("+1234.56", "-0.50" or a number)
+    as integer cents"""
+    try:
+        return round(float(amount) * 100)
+    except (TypeError, ValueError, OverflowError) as ex:
+        raise AccountManagementException("JSON Decode Error - Wrong JSON Format") from ex
+
+
+class ColumnarTransactions:
+    """Binary copy of the transactions file with one column per field: the
+    amounts as int64 cents and the ibans as uint32 ids of a dictionary
+    stored after the columns. The columns are memory mapped and reduced
+    with numpy by chunks, so no python object is created per transaction.
+    The header keeps the size and modification time of the converted
+    file, so a copy that is not current can be detected and converted
+    again"""
+    def __init__(self, file_path: str):
+        self.__file_path = file_path
+        self.__dictionary = None
+
+    @property
+    def file_path(self):
+        """Path of the columnar file"""
+        return self.__file_path
+
+    def convert(self, transactions: TransactionsFile):
+        """writes the columnar copy of the transactions file. The columns
+        are written by chunks (the ids through a temporary file), so the
+        memory used does not depend on the size of the file"""
+        source = transactions.stat()
+        directory = os.path.dirname(os.path.abspath(self.__file_path))
+        with tempfile.TemporaryFile(dir=directory) as ids_file, \
+                tempfile.NamedTemporaryFile("wb", dir=directory, delete=False) as file:
+            try:
+                file.write(b"\0" * HEADER.size)
+                count, iban_ids = self.__write_columns(transactions, file, ids_file)
+                ids_file.seek(0)
+                while True:
+                    chunk = ids_file.read(1 << 20)
+                    if not chunk:
+                        break
+                    file.write(chunk)
+                dictionary = json.dumps(list(iban_ids)).encode()
+                dictionary_offset = file.tell()
+                file.write(dictionary)
+                file.seek(0)
+                file.write(HEADER.pack(MAGIC, count, len(iban_ids), dictionary_offset,
+                                       len(dictionary), source.st_size, source.st_mtime_ns))
+                file.close()
+                os.replace(file.name, self.__file_path)
+            except BaseException:
+                file.close()
+                os.remove(file.name)
+                raise
+        self.__dictionary = None
+
+    def __write_columns(self, transactions, file, ids_file):
+        """writes the amounts to the file and the ids to ids_file,
+        returns the number of transactions and the ids of the ibans"""
+        iban_ids = {}
+        count = 0
+        cents, ids = array("q"), array("I")
+        for transaction in transactions.read():
+            try:
+                iban = transaction["IBAN"]
+                amount = transaction["amount"]
+            except (KeyError, TypeError) as ex:
+                raise AccountManagementException("JSON Decode Error - Wrong JSON Format") from ex
+            cents.append(amount_cents(amount))
+            ids.append(iban_ids.setdefault(iban, len(iban_ids)))
+            if len(cents) == CHUNK_ROWS:
+                count += self.__flush(cents, ids, file, ids_file)
+                cents, ids = array("q"), array("I")
+        count += self.__flush(cents, ids, file, ids_file)
+        return count, iban_ids
+
+    @staticmethod
+    def __flush(cents, ids, file, ids_file):
+        """writes a chunk of both columns (little endian)"""
+        if sys.byteorder == "big":
+            cents.byteswap()
+            ids.byteswap()
+        cents.tofile(file)
+        ids.tofile(ids_file)
+        return len(cents)
+
+    def is_current(self, transactions: TransactionsFile) -> bool:
+        """returns True if the columnar file is a copy of the
+        current content of the transactions file"""
+        source = transactions.stat()
+        try:
+            header = self.__header()
+        except AccountManagementException:
+            return False
+        return header[5:] == (source.st_size, source.st_mtime_ns)
+
+    def count(self) -> int:
+        """number of transactions"""
+        return self.__header()[1]
+
+    def ibans(self) -> list:
+        """ibans of the transactions in order of first appearance"""
+        return list(self.__load_dictionary()[1])
+
+    def balance(self, iban: str):
+        """returns the balance of the iban, None if it has no transactions"""
+        iban_id = self.__load_dictionary()[1].get(iban)
+        if iban_id is None:
+            return None
+        total = 0
+        for cents, ids in self.__chunks():
+            if numpy is not None:
+                total += int(cents[ids == iban_id].sum())
+            else:
+                total += sum(amount for amount, k in zip(cents, ids) if k == iban_id)
+        return total / 100
+
+    def balances(self) -> dict:
+        """returns the balances of all the ibans"""
+        ibans = self.__load_dictionary()[1]
+        if numpy is not None:
+            totals = numpy.zeros(len(ibans), dtype=numpy.int64)
+            for cents, ids in self.__chunks():
+                # the float sums of a chunk are exact integers (below 2**53)
+                totals += numpy.rint(numpy.bincount(ids, weights=cents,
+                                                    minlength=len(ibans))).astype(numpy.int64)
+            totals = totals.tolist()
+        else:
+            totals = [0] * len(ibans)
+            for cents, ids in self.__chunks():
+                for amount, iban_id in zip(cents, ids):
+                    totals[iban_id] += amount
+        return {iban: total / 100 for iban, total in zip(ibans, totals)}
+
+    def __chunks(self):
+        """generator of chunks of both columns: slices of the columns mapped
+        in memory with numpy, arrays read from the file without it"""
+        count = self.__header()[1]
+        if count == 0:
+            return
+        if numpy is not None:
+            cents = numpy.memmap(self.__file_path, dtype="<i8", mode="r",
+                                 offset=HEADER.size, shape=(count,))
+            ids = numpy.memmap(self.__file_path, dtype="<u4", mode="r",
+                               offset=HEADER.size + 8 * count, shape=(count,))
+            for start in range(0, count, CHUNK_ROWS):
+                yield cents[start:start + CHUNK_ROWS], ids[start:start + CHUNK_ROWS]
+            return
+        with open(self.__file_path, "rb") as cents_file, open(self.__file_path, "rb") as ids_file:
+            cents_file.seek(HEADER.size)
+            ids_file.seek(HEADER.size + 8 * count)
+            for start in range(0, count, CHUNK_ROWS):
+                rows = min(CHUNK_ROWS, count - start)
+                cents, ids = array("q"), array("I")
+                cents.frombytes(cents_file.read(8 * rows))
+                ids.frombytes(ids_file.read(4 * rows))
+                if sys.byteorder == "big":
+                    cents.byteswap()
+                    ids.byteswap()
+                yield cents, ids
+
+    def __header(self):
+        """returns the fields of the header"""
+        try:
+            with open(self.__file_path, "rb") as file:
+                data = file.read(HEADER.size)
+        except FileNotFoundError as ex:
+            raise AccountManagementException("Wrong file  or file path") from ex
+        if len(data) < HEADER.size or data[:8] != MAGIC:
+            raise AccountManagementException("JSON Decode Error - Wrong JSON Format")
+        return HEADER.unpack(data)
+
+    def __load_dictionary(self):
+        """returns the list and the ids of the ibans, cached while the file
+        does not change"""
+        header = self.__header()
+        if self.__dictionary is None or self.__dictionary[0] != header:
+            with open(self.__file_path, "rb") as file:
+                file.seek(header[3])
+                ibans = json.loads(file.read(header[4]))
+            self.__dictionary = (header, {iban: k for k, iban in enumerate(ibans)})
+        return self.__dictionary
@@ -0,0 +1,99 @@
+"""MODULE: commit_queue. Contains the single writer commit queue class"""
+import queue
+import threading
+from concurrent.futures import Future
+
+MAX_BATCH = 1024
+_STOP = object()
+
+
+#pylint: disable=too-many-instance-attributes
+class CommitQueue:
+    """Queue of items committed by a single background writer thread.
+    submit returns a Future at once; the writer takes all the queued items
+    (up to max_batch), calls commit_function with them while holding lock
+    and resolves every future with the value or the exception returned for
+    its item. The thread is started with the first item. commit does the
+    same in the caller thread: the thread that gets the lock commits its
+    item with the ones of the threads waiting for it, so concurrent
+    synchronous calls share a single write (and fsync)"""
+    def __init__(self, commit_function, lock=None, max_batch: int = MAX_BATCH):
+        self.__commit_function = commit_function
+        self.__lock = lock if lock is not None else threading.RLock()
+        self.__max_batch = max_batch
+        self.__queue = queue.SimpleQueue()
+        self.__thread = None
+        self.__state_lock = threading.Lock()
+        self.__closed = False
+        self.__waiting = []
+
+    def submit(self, item) -> Future:
+        """queues the item and returns the future of its result"""
+        future = Future()
+        with self.__state_lock:
+            if self.__closed:
+                raise RuntimeError("commit queue closed")
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self.__run, daemon=True,
+                                                 name="commit-queue-writer")
+                self.__thread.start()
+            self.__queue.put((item, future))
+        return future
+
+    def commit(self, item):
+        """commits the item in the caller thread (with the items of the
+        other threads calling commit meanwhile) and returns its result or
+        raises its exception; it works after close"""
+        future = Future()
+        with self.__state_lock:
+            self.__waiting.append((item, future))
+        with self.__lock:
+            if not future.done():
+                with self.__state_lock:
+                    batch, self.__waiting = self.__waiting, []
+                self.__commit(batch)
+        return future.result()
+
+    def close(self):
+        """commits the queued items and stops the writer thread"""
+        with self.__state_lock:
+            if self.__closed:
+                return
+            self.__closed = True
+            thread = self.__thread
+            if thread is not None:
+                self.__queue.put(_STOP)
+        if thread is not None:
+            thread.join()
+
+    def __run(self):
+        """writer thread"""
+        stop = False
+        while not stop:
+            batch = [self.__queue.get()]
+            while len(batch) < self.__max_batch:
+                try:
+                    batch.append(self.__queue.get_nowait())
+                except queue.Empty:
+                    break
+            if _STOP in batch:
+                batch.remove(_STOP)
+                stop = True
+            if batch:
+                self.__commit(batch)
+
+    def __commit(self, batch):
+        """commits a batch and resolves its futures"""
+        batch = [(item, future) for item, future in batch
+                 if future.set_running_or_notify_cancel()]
+        try:
+            with self.__lock:
+                results = self.__commit_function([item for item, _ in batch])
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            # the writer must resolve all the futures whatever happens
+            results = [ex] * len(batch)
+        for (_, future), result in zip(batch, results):
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
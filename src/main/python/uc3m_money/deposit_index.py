@@ -0,0 +1,145 @@
+"""MODULE: deposit_index. Contains the idempotent deposits index class"""
+import hashlib
+import json
+import os
+from uc3m_money.json_lines_store import JsonLinesStore
+from uc3m_money.json_codec import JSON_CODEC
+from uc3m_money.bloom_filter import BloomFilter
+
+INITIAL_CAPACITY = 1024
+
+
+def deposit_key(content: bytes, iban: str, amount: str) -> str:
+    """returns the idempotency key of a deposit: a hash of the content of
+    its input file and of the iban and amount read from it"""
+    payload = json.dumps([iban, amount]).encode()
+    return hashlib.sha256(hashlib.sha256(content).digest() + payload).hexdigest()
+
+
+#pylint: disable=too-many-instance-attributes
+class DepositIndex:
+    """Persistent index of the keys of the deposits already stored and their
+    signatures, with a bloom filter in front of it so the keys of new
+    deposits are usually discarded without a lookup. Every line of the index
+    file has a key, a signature and the size of the store after the deposit
+    was appended. The entries appended to the index file by other
+    managers (or processes) are read on every sync, from the offset of
+    the index file already read. The index is checked against the store
+    only when the store changes (its stat is different from the one of
+    the last check): if the last deposit indexed is no longer in the
+    store, the store was replaced and the index is emptied"""
+    def __init__(self, store: JsonLinesStore, index_file: str):
+        self.__store = store
+        self.__index_file = index_file
+        self.__signatures = {}
+        self.__bloom = BloomFilter(INITIAL_CAPACITY)
+        self.__checkpoint = 0
+        self.__last_signature = None
+        # part of the index file already read
+        self.__index_offset = 0
+        self.__index_inode = None
+        # stat of the store at the last check (none done yet)
+        self.__store_stat = (-1, -1)
+
+    def find(self, key: str):
+        """returns the signature of the deposit stored with the key,
+        None if there is none"""
+        self.sync()
+        if key not in self.__bloom:
+            return None
+        return self.__signatures.get(key)
+
+    def add(self, keys: list, signatures: list):
+        """indexes the deposits just appended to the store (the entries
+        written are read back by the next sync, like the ones of other
+        managers, so the offset of the index file stays consistent)"""
+        self.__catch_up()
+        self.__checkpoint = self.__store.size()
+        entries = []
+        for key, signature in zip(keys, signatures):
+            self.__add_key(key, signature)
+            entries.append({"key": key, "signature": signature, "offset": self.__checkpoint})
+            self.__last_signature = signature
+        with open(self.__index_file, "ab") as file:
+            file.write(b"".join(JSON_CODEC.dumps(entry) + b"\n" for entry in entries))
+        self.__store_stat = self.__stat()
+
+    def sync(self):
+        """reads the new entries of the index file and empties the index if
+        the store was replaced"""
+        self.__catch_up()
+        stat = self.__stat()
+        if stat == self.__store_stat:
+            return
+        if self.__checkpoint and not self.__covers_store():
+            self.__reset()
+            if os.path.exists(self.__index_file):
+                os.remove(self.__index_file)
+        self.__store_stat = stat
+
+    def __covers_store(self):
+        """checks that the last deposit indexed is in the store at the checkpoint"""
+        record = self.__store.record_ending_at(self.__checkpoint)
+        return isinstance(record, dict) and \
+            record.get("deposit_signature") == self.__last_signature
+
+    def __stat(self):
+        """size and modification time of the store, None if it does not exist"""
+        try:
+            stat = os.stat(self.__store.file_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def __reset(self):
+        """empties the index"""
+        self.__signatures = {}
+        self.__bloom = BloomFilter(INITIAL_CAPACITY)
+        self.__checkpoint = 0
+        self.__last_signature = None
+        self.__index_offset = 0
+        self.__index_inode = None
+
+    def __add_key(self, key, signature):
+        """adds a key to the dict and to the bloom filter (a larger filter
+        is built when it is full)"""
+        self.__signatures[key] = signature
+        if len(self.__bloom) >= self.__bloom.capacity:
+            self.__bloom = BloomFilter(self.__bloom.capacity * 2)
+            for old_key in self.__signatures:
+                self.__bloom.add(old_key)
+        else:
+            self.__bloom.add(key)
+
+    def __catch_up(self):
+        """reads the entries appended to the index file since the last
+        read (all of them if the file was replaced or truncated)"""
+        try:
+            stat = os.stat(self.__index_file)
+        except FileNotFoundError:
+            if self.__index_inode is not None:
+                # another manager emptied the index
+                self.__reset()
+            return
+        if stat.st_ino != self.__index_inode or stat.st_size < self.__index_offset:
+            self.__reset()
+            self.__index_inode = stat.st_ino
+        if stat.st_size == self.__index_offset:
+            return
+        with open(self.__index_file, "rb") as file:
+            file.seek(self.__index_offset)
+            data = file.read(stat.st_size - self.__index_offset)
+        # a line still being written by another manager is read later
+        end = data.rfind(b"\n") + 1
+        try:
+            for line in data[:end].splitlines():
+                entry = JSON_CODEC.loads(line)
+                self.__add_key(entry["key"], entry["signature"])
+                self.__checkpoint = entry["offset"]
+                self.__last_signature = entry["signature"]
+        except (json.JSONDecodeError, KeyError):
+            # a damaged index is discarded, the deposits are stored anyway
+            self.__reset()
+            os.remove(self.__index_file)
+            return
+        self.__index_offset += end
@@ -0,0 +1,85 @@
+"""MODULE: iban_validator. Contains the spanish IBAN validation class"""
+import functools
+import re
+from uc3m_money.account_management_exception import AccountManagementException
+from uc3m_money.lazy_import import lazy_import
+
+numpy = lazy_import("numpy")
+
+IBAN_PATTERN = re.compile(r"^ES[0-9]{22}")
+# "ES00" moved to the end of the IBAN is "142800" once the letters are
+# replaced by numbers (E=14, S=28)
+ES_SUFFIX = 142800
+# weight of every digit of the bban in the mod 97 of bban + "142800"
+BBAN_WEIGHTS = [pow(10, 25 - position, 97) for position in range(20)]
+
+
+class IbanValidator:
+    """Validation of the control digits of spanish IBANs. The mod 97 is
+    calculated in chunks that fit in a machine word, the results of the
+    last ibans validated are cached and lists of ibans can be validated
+    at once using numpy"""
+    def __init__(self, cache_size: int = 4096):
+        self.__cached_error = functools.lru_cache(maxsize=cache_size)(self.iban_error)
+
+    def validate(self, iban: str) -> str:
+        """returns the iban if it is valid, raises an exception if not"""
+        error = self.__cached_error(iban)
+        if error:
+            raise AccountManagementException(error)
+        return iban
+
+    def validate_ibans(self, ibans) -> list:
+        """validates a list of ibans and returns, in the same order, the iban
+        or the AccountManagementException found for each one"""
+        ibans = list(ibans)
+        if numpy is None:
+            errors = [self.__cached_error(iban) for iban in ibans]
+        else:
+            errors = self.__batch_errors(ibans)
+        return [AccountManagementException(error) if error else iban
+                for iban, error in zip(ibans, errors)]
+
+    def clear_cache(self):
+        """forgets the ibans already validated"""
+        self.__cached_error.cache_clear()
+
+    @staticmethod
+    def control_digits(iban: str) -> int:
+        """calculates the control digits of a well formed spanish iban"""
+        remainder = int(iban[4:13]) % 97
+        remainder = (remainder * 1000000000 + int(iban[13:22])) % 97
+        remainder = (remainder * 100 + int(iban[22:24])) % 97
+        remainder = (remainder * 1000000 + ES_SUFFIX) % 97
+        return 98 - remainder
+
+    @classmethod
+    def iban_error(cls, iban: str):
+        """returns the error message of the iban, None if it is valid"""
+        if not IBAN_PATTERN.fullmatch(iban):
+            return "Invalid IBAN format"
+        if int(iban[2:4]) != cls.control_digits(iban):
+            return "Invalid IBAN control digit"
+        return None
+
+    @staticmethod
+    def __batch_errors(ibans):
+        """error messages of a list of ibans with the checksums
+        calculated as a single numpy operation"""
+        errors = ["Invalid IBAN format"] * len(ibans)
+        well_formed = [position for position, iban in enumerate(ibans)
+                       if IBAN_PATTERN.fullmatch(iban)]
+        if not well_formed:
+            return errors
+        digits = numpy.frombuffer("".join(ibans[position] for position in well_formed)
+                                  .encode("ascii"), dtype=numpy.uint8)
+        digits = digits.reshape(len(well_formed), 24).astype(numpy.int64) - ord("0")
+        remainders = (digits[:, 4:] @ numpy.array(BBAN_WEIGHTS, dtype=numpy.int64)
+                      + ES_SUFFIX) % 97
+        valid = digits[:, 2] * 10 + digits[:, 3] == 98 - remainders
+        for position, is_valid in zip(well_formed, valid.tolist()):
+            errors[position] = None if is_valid else "Invalid IBAN control digit"
+        return errors
+
+
+IBAN_VALIDATOR = IbanValidator()
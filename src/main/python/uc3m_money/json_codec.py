@@ -0,0 +1,58 @@
+"""MODULE: json_codec. Contains the json codec of the stores class"""
+import json
+from uc3m_money.account_management_config import JSON_PRETTY
+from uc3m_money.lazy_import import lazy_import
+
+orjson = lazy_import("orjson")
+# json.dumps creates an encoder per call when it is given any option
+_COMPACT_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+
+class JsonCodec:
+    """Encoding and decoding of the records and files of the stores.
+    It uses orjson when it is installed and the standard json module
+    otherwise; both write the same values and raise json.JSONDecodeError
+    (orjson.JSONDecodeError is a subclass of it). Compact mode (for
+    production) writes without blanks; pretty mode (for debugging)
+    writes with the standard json module, the records as it does by
+    default and the json files indented by 2. A record is always
+    written in a single line"""
+    def __init__(self, pretty: bool = JSON_PRETTY, fast: bool = True):
+        self.pretty = pretty
+        self.__orjson = orjson if fast else None
+
+    @property
+    def name(self) -> str:
+        """json library used"""
+        return "json" if self.__orjson is None else "orjson"
+
+    def loads(self, data):
+        """value of the json bytes or str"""
+        if self.__orjson is not None:
+            return self.__orjson.loads(data)
+        return json.loads(data)
+
+    def dumps(self, value) -> bytes:
+        """a record (or any value) in a single line of utf-8 json"""
+        if self.pretty:
+            return json.dumps(value).encode()
+        if self.__orjson is not None:
+            return self.__orjson.dumps(value, option=self.__orjson.OPT_NON_STR_KEYS)
+        return _COMPACT_ENCODER.encode(value).encode()
+
+    def dumps_document(self, value) -> bytes:
+        """a whole json file (indented in pretty mode)"""
+        if self.pretty:
+            return json.dumps(value, indent=2).encode()
+        return self.dumps(value)
+
+    def load(self, file):
+        """value of a json file opened in binary mode"""
+        return self.loads(file.read())
+
+    def dump(self, value, file):
+        """writes a json file opened in binary mode"""
+        file.write(self.dumps_document(value))
+
+
+JSON_CODEC = JsonCodec()
@@ -0,0 +1,187 @@
+"""MODULE: json_lines_store. Contains the append-only JSON Lines store class"""
+import json
+import os
+from itertools import accumulate
+from uc3m_money.account_management_exception import AccountManagementException
+from uc3m_money.json_codec import JSON_CODEC
+from uc3m_money.metrics import METRICS
+
+TAIL_BLOCK_SIZE = 4096
+
+
+class JsonLinesStore:
+    """Append-only store that keeps one json record per line.
+    Stores written by previous versions as a single json array are
+    migrated to this format the first time they are touched. With a
+    cache (a StoreCache) the records read are kept in it while the file
+    does not change"""
+    def __init__(self, file_path: str, cache=None):
+        self.__file_path = file_path
+        self.__cache = cache
+
+    @property
+    def file_path(self):
+        """Path of the file that holds the store"""
+        return self.__file_path
+
+    def read(self):
+        """generator that yields the stored records one by one
+        without loading the whole file"""
+        for record, _ in self.read_from(0):
+            yield record
+
+    def read_from(self, offset: int):
+        """generator that yields the records stored after the byte offset
+        together with the offset where each record ends"""
+        self.migrate()
+        try:
+            file = open(self.__file_path, "rb")  # pylint: disable=consider-using-with
+        except FileNotFoundError:
+            return
+        with file:
+            records = self.__parse(file, offset) if self.__cache is None \
+                else self.__cache.read(self.__file_path, file, offset, self.__parse)
+            yield from records
+
+    @staticmethod
+    def __parse(file, offset):
+        """records of the file after the byte offset"""
+        start = offset
+        records = 0
+        try:
+            file.seek(offset)
+            for line in file:
+                offset += len(line)
+                if line.strip():
+                    records += 1
+                    yield JSON_CODEC.loads(line), offset
+        except json.JSONDecodeError as ex:
+            raise AccountManagementException("JSON Decode Error - Wrong JSON Format") from ex
+        finally:
+            METRICS.count("records_scanned", records)
+            METRICS.count("bytes_read", offset - start)
+
+    def size(self):
+        """returns the size in bytes of the store (0 if it does not exist)"""
+        try:
+            return os.stat(self.__file_path).st_size
+        except FileNotFoundError:
+            return 0
+
+    def record_ending_at(self, offset: int):
+        """returns the record whose line finishes at the byte offset,
+        None if there is no such record"""
+        try:
+            with open(self.__file_path, "rb") as file:
+                if offset <= 0 or file.seek(0, os.SEEK_END) < offset:
+                    return None
+                line = self.__last_line(file, offset)
+        except FileNotFoundError:
+            return None
+        if not line.endswith(b"\n"):
+            return None
+        try:
+            return JSON_CODEC.loads(line)
+        except json.JSONDecodeError:
+            return None
+
+    def append(self, record: dict):
+        """appends a single record at the end of the store"""
+        return self.append_all([record])
+
+    def append_all(self, records):
+        """appends all the records with a single write and
+        returns the size of the store after writing them"""
+        records = list(records)
+        lines = [JSON_CODEC.dumps(record) + b"\n" for record in records]
+        if not lines:
+            return self.size()
+        if self.__check_tail():
+            lines.insert(0, b"\n")
+            records.insert(0, None)
+        data = b"".join(lines)
+        try:
+            with open(self.__file_path, "ab") as file:
+                before = os.fstat(file.fileno())
+                file.write(data)
+                file.flush()
+                METRICS.count("bytes_written", len(data))
+                after = os.fstat(file.fileno())
+                end = file.tell()
+        except FileNotFoundError as ex:
+            raise AccountManagementException("Wrong file  or file path") from ex
+        if self.__cache is None:
+            return end
+        self.__cache.extend(self.__file_path, before, after, data,
+                           [(record, line_end) for record, line_end
+                            in zip(records, accumulate(map(len, lines)))
+                            if record is not None])
+        return end
+
+    def migrate(self):
+        """one-time migration of a json array file into one record per line.
+        Returns True if the file has been rewritten"""
+        try:
+            with open(self.__file_path, "rb") as file:
+                if self.__first_char(file) != b"[":
+                    return False
+                file.seek(0)
+                old_records = JSON_CODEC.load(file)
+        except FileNotFoundError:
+            return False
+        except json.JSONDecodeError as ex:
+            raise AccountManagementException("JSON Decode Error - Wrong JSON Format") from ex
+        if not isinstance(old_records, list):
+            raise AccountManagementException("JSON Decode Error - Wrong JSON Format")
+
+        temp_path = self.__file_path + ".migrating"
+        with open(temp_path, "wb") as file:
+            for record in old_records:
+                file.write(JSON_CODEC.dumps(record) + b"\n")
+        os.replace(temp_path, self.__file_path)
+        return True
+
+    def __check_tail(self):
+        """checks the format of the store before appending to it: legacy
+        array files are migrated and the last line must be a valid record.
+        Returns True if the last line is not terminated by a newline"""
+        self.migrate()
+        try:
+            with open(self.__file_path, "rb") as file:
+                last_line = self.__last_line(file)
+        except FileNotFoundError:
+            return False
+        if not last_line.strip():
+            return False
+        try:
+            JSON_CODEC.loads(last_line)
+        except json.JSONDecodeError as ex:
+            raise AccountManagementException("JSON Decode Error - Wrong JSON Format") from ex
+        return not last_line.endswith(b"\n")
+
+    @staticmethod
+    def __first_char(file):
+        """returns the first non blank byte of the file"""
+        while True:
+            block = file.read(TAIL_BLOCK_SIZE)
+            if not block:
+                return b""
+            block = block.lstrip()
+            if block:
+                return block[:1]
+
+    @staticmethod
+    def __last_line(file, end=None):
+        """returns the last line of the file (or the line that finishes
+        at the byte offset end) reading it backwards"""
+        if end is None:
+            end = file.seek(0, os.SEEK_END)
+        position = end
+        tail = b""
+        while position > 0:
+            position = max(0, position - TAIL_BLOCK_SIZE)
+            file.seek(position)
+            tail = file.read(end - position)
+            if tail.rfind(b"\n", 0, len(tail) - 1) >= 0:
+                break
+        return tail[tail.rfind(b"\n", 0, len(tail) - 1) + 1:]
@@ -0,0 +1,149 @@
+"""MODULE: json_storage_backend. Contains the json files storage backend"""
+import os
+from uc3m_money.account_management_config import (TRANSFERS_STORE_FILE,
+                                        TRANSFERS_INDEX_FILE,
+                                        DEPOSITS_STORE_FILE,
+                                        DEPOSITS_INDEX_FILE,
+                                        TRANSACTIONS_STORE_FILE,
+                                        BALANCES_STORE_FILE,
+                                        BALANCE_INDEX_FILE,
+                                        TRANSACTIONS_COLUMNAR_FILE,
+                                        WRITE_AHEAD_LOG_FILE)
+from uc3m_money.storage_backend import StorageBackend
+from uc3m_money.json_lines_store import JsonLinesStore
+from uc3m_money.transfer_index import TransferIndex
+from uc3m_money.deposit_index import DepositIndex
+from uc3m_money.transactions_file import TransactionsFile
+from uc3m_money.balance_index import BalanceIndex
+from uc3m_money.balance_history import BalanceHistory
+from uc3m_money.balance_aggregator import aggregate_balances
+from uc3m_money.columnar_transactions import ColumnarTransactions
+from uc3m_money.write_ahead_log import WriteAheadLog, MAX_BATCH
+from uc3m_money.store_cache import STORE_CACHE
+
+
+#pylint: disable=too-many-instance-attributes
+class JsonStorageBackend(StorageBackend):
+    """Storage in the json files of account_management_config, or in the
+    files with the same names of another directory (json_files_path).
+    With columnar the balances are calculated over a binary columnar copy
+    of the transactions file, converted again whenever the file changes.
+    With durable the stores are written through a WriteAheadLog (all the
+    writes to them must go through this backend while it is open), which
+    writes each commit of up to wal_max_batch records with a single fsync
+    at once: the commits of a manager are called with its lock held, so
+    no other commit could join a delayed group (the commit queue of the
+    manager groups the concurrent ones before they get here).
+    The idempotency keys of the deposits are kept in a DepositIndex.
+    The records read from the stores and the transactions file are kept
+    in cache (the process wide STORE_CACHE by default, None disables it)"""
+    #pylint: disable=too-many-arguments
+    def __init__(self, json_files_path: str = None, columnar: bool = False,
+                 durable: bool = False, cache=STORE_CACHE, wal_max_batch: int = MAX_BATCH):
+        self.__json_files_path = json_files_path
+        self.__columnar = None
+        if columnar:
+            self.__columnar = ColumnarTransactions(self.__path(TRANSACTIONS_COLUMNAR_FILE))
+        self.__transfers_store = JsonLinesStore(self.__path(TRANSFERS_STORE_FILE), cache)
+        self.__deposits_store = JsonLinesStore(self.__path(DEPOSITS_STORE_FILE), cache)
+        self.__balances_store = JsonLinesStore(self.__path(BALANCES_STORE_FILE), cache)
+        self.__transfer_index = TransferIndex(self.__transfers_store,
+                                              self.__path(TRANSFERS_INDEX_FILE))
+        self.__deposit_index = DepositIndex(self.__deposits_store,
+                                            self.__path(DEPOSITS_INDEX_FILE))
+        self.__transactions = TransactionsFile(self.__path(TRANSACTIONS_STORE_FILE), cache=cache)
+        self.__balance_index = BalanceIndex(self.__transactions,
+                                            self.__path(BALANCE_INDEX_FILE))
+        self.__balance_history = BalanceHistory(self.__balances_store)
+        self.__wal = None
+        if durable:
+            self.__wal = WriteAheadLog(self.__path(WRITE_AHEAD_LOG_FILE),
+                                       [self.__transfers_store, self.__deposits_store,
+                                        self.__balances_store],
+                                       max_batch=wal_max_batch)
+
+    def __path(self, store_file: str) -> str:
+        """path of a store file in the json files directory of the backend"""
+        if self.__json_files_path is None:
+            return store_file
+        return os.path.join(self.__json_files_path, os.path.basename(store_file))
+
+    def transfer_exists(self, transfer) -> bool:
+        return self.__transfer_index.contains(transfer)
+
+    def add_transfers(self, records: list):
+        if records:
+            self.__append(self.__transfers_store, records)
+            self.__transfer_index.sync()
+
+    def add_deposits(self, records: list, keys: list = None):
+        if records:
+            self.__append(self.__deposits_store, records)
+            if keys:
+                self.__deposit_index.add(keys, [k["deposit_signature"] for k in records])
+
+    def find_deposit(self, key: str, iban: str):  # pylint: disable=unused-argument
+        return self.__deposit_index.find(key)
+
+    def read_transactions(self):
+        return self.__transactions.read()
+
+    def balance(self, iban: str):
+        if self.__columnar is not None:
+            return self.__current_columnar().balance(iban)
+        return self.__balance_index.balance(iban)
+
+    def all_balances(self) -> dict:
+        if self.__columnar is not None:
+            return self.__current_columnar().balances()
+        return aggregate_balances(self.__transactions)
+
+    def __current_columnar(self):
+        """columnar copy of the transactions file, converted if needed"""
+        if not self.__columnar.is_current(self.__transactions):
+            self.__columnar.convert(self.__transactions)
+        return self.__columnar
+
+    def add_balances(self, records: list):
+        self.__append(self.__balances_store, records)
+
+    def balance_snapshot(self, iban: str, time: float = None):
+        if time is None:
+            return self.__balance_history.latest(iban)
+        return self.__balance_history.as_of(iban, time)
+
+    def balance_snapshots(self, iban: str, start: float, end: float) -> list:
+        return self.__balance_history.between(iban, start, end)
+
+    def thin_balances(self, keep_seconds: float, interval_seconds: float, now: float) -> int:
+        if self.__wal is None:
+            return self.__balance_history.thin(keep_seconds, interval_seconds, now)
+        with self.__wal.rewriting():
+            return self.__balance_history.thin(keep_seconds, interval_seconds, now)
+
+    def __append(self, store, records):
+        """appends the records to the store (through the log if durable)"""
+        if self.__wal is None:
+            store.append_all(records)
+        else:
+            self.__wal.commit(store, records)
+
+    def load(self):
+        self.__transfer_index.sync()
+        self.__deposit_index.sync()
+        self.__balance_history.sync()
+        if os.path.exists(self.__transactions.file_path):
+            if self.__columnar is not None:
+                self.__current_columnar()
+            else:
+                self.__balance_index.sync()
+
+    def migrate(self):
+        for store in (self.__transfers_store, self.__deposits_store, self.__balances_store):
+            store.migrate()
+        if self.__wal is not None:
+            self.__wal.checkpoint()
+
+    def close(self):
+        if self.__wal is not None:
+            self.__wal.close()
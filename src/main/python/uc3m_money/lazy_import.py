@@ -0,0 +1,20 @@
+"""MODULE: lazy_import. Contains the lazy import of the optional dependencies"""
+import importlib.util
+import sys
+
+
+def lazy_import(name: str):
+    """returns the module, which is executed the first time one of its
+    attributes is used, or None if it is not installed. The package
+    imports its optional dependencies this way so the commands that do
+    not use them start fast"""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        return None
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,138 @@
+"""MODULE: metrics. Contains the latency and I/O metrics registry class"""
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+
+BUCKETS = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 5e-2, 0.1, 0.5, 1.0, 5.0)
+COUNTERS_HELP = {"records_scanned": "Records read from the stores and the transactions file",
+                 "bytes_read": "Bytes read from the stores, the transactions and the inputs",
+                 "bytes_written": "Bytes appended to the stores",
+                 "store_cache_hits": "Reads of the stores served from the cache",
+                 "store_cache_misses": "Reads of the stores that parsed the file"}
+PREFIX = "uc3m_money_"
+_DISABLED_PHASE = nullcontext()
+
+
+class Metrics:
+    """In-process histograms of the duration of the phases of the
+    operations (in seconds) and counters of the records scanned and the
+    bytes read and written. Disabled, phase returns a shared empty
+    context and count returns at once, so the instrumented code does not
+    pay for it. The snapshot can be written as a json file or as a
+    Prometheus text format file"""
+    def __init__(self, enabled: bool = False):
+        self.__enabled = enabled
+        self.__lock = threading.Lock()
+        self.__histograms = {}
+        self.__counters = {}
+
+    @property
+    def enabled(self) -> bool:
+        """True if the metrics are being recorded"""
+        return self.__enabled
+
+    def enable(self, enabled: bool = True):
+        """starts (or stops) recording the metrics"""
+        self.__enabled = enabled
+
+    def reset(self):
+        """forgets the metrics recorded"""
+        with self.__lock:
+            self.__histograms = {}
+            self.__counters = {}
+
+    def phase(self, name: str):
+        """context that adds its duration to the histogram of the phase"""
+        if not self.__enabled:
+            return _DISABLED_PHASE
+        return _Phase(self, name)
+
+    def observe(self, name: str, seconds: float):
+        """adds a duration to the histogram of the phase"""
+        with self.__lock:
+            histogram = self.__histograms.get(name)
+            if histogram is None:
+                histogram = self.__histograms[name] = [[0] * (len(BUCKETS) + 1), 0.0]
+            histogram[0][bisect_left(BUCKETS, seconds)] += 1
+            histogram[1] += seconds
+
+    def count(self, name: str, value: int = 1):
+        """adds value to the counter"""
+        if self.__enabled:
+            with self.__lock:
+                self.__counters[name] = self.__counters.get(name, 0) + value
+
+    def snapshot(self) -> dict:
+        """returns the histograms (cumulative buckets as in Prometheus)
+        and the counters"""
+        with self.__lock:
+            histograms = {name: (list(buckets), total)
+                          for name, (buckets, total) in self.__histograms.items()}
+            counters = dict(self.__counters)
+        result = {"phases": {}, "counters": counters}
+        for name, (buckets, total) in sorted(histograms.items()):
+            cumulative = []
+            observations = 0
+            for bound, count in zip(BUCKETS + ("+Inf",), buckets):
+                observations += count
+                cumulative.append([bound, observations])
+            result["phases"][name] = {"count": observations, "sum": total,
+                                      "buckets": cumulative}
+        return result
+
+    def prometheus_text(self) -> str:
+        """returns the snapshot in the Prometheus text format"""
+        snapshot = self.snapshot()
+        lines = [f"# HELP {PREFIX}phase_seconds Duration of the phases of the operations",
+                 f"# TYPE {PREFIX}phase_seconds histogram"]
+        for name, histogram in snapshot["phases"].items():
+            for bound, count in histogram["buckets"]:
+                lines.append(f'{PREFIX}phase_seconds_bucket{{phase="{name}",le="{bound}"}} '
+                             f"{count}")
+            lines.append(f'{PREFIX}phase_seconds_sum{{phase="{name}"}} {histogram["sum"]!r}')
+            lines.append(f'{PREFIX}phase_seconds_count{{phase="{name}"}} {histogram["count"]}')
+        for name, value in sorted(snapshot["counters"].items()):
+            lines.append(f"# HELP {PREFIX}{name}_total {COUNTERS_HELP.get(name, name)}")
+            lines.append(f"# TYPE {PREFIX}{name}_total counter")
+            lines.append(f"{PREFIX}{name}_total {value}")
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, file_path: str):
+        """writes the snapshot as a json file"""
+        self.__write(file_path, json.dumps(self.snapshot(), indent=2))
+
+    def write_prometheus(self, file_path: str):
+        """writes the snapshot as a Prometheus text format file (for the
+        textfile collector of the node exporter)"""
+        self.__write(file_path, self.prometheus_text())
+
+    @staticmethod
+    def __write(file_path, text):
+        """replaces the file atomically, so a collector never reads half of it"""
+        temp_path = f"{file_path}.{os.getpid()}.writing"
+        with open(temp_path, "w", encoding="utf-8", newline="") as file:
+            file.write(text)
+        os.replace(temp_path, file_path)
+
+
+class _Phase:
+    """Timer of a phase"""
+    __slots__ = ("__metrics", "__name", "__start")
+
+    def __init__(self, metrics, name):
+        self.__metrics = metrics
+        self.__name = name
+        self.__start = 0.0
+
+    def __enter__(self):
+        self.__start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.__metrics.observe(self.__name, time.perf_counter() - self.__start)
+
+
+METRICS = Metrics()
@@ -0,0 +1,184 @@
+"""MODULE: multi_process_storage_backend. Contains the storage backend shared by processes"""
+import os
+import threading
+from contextlib import contextmanager
+from uc3m_money.account_management_config import (TRANSFERS_STORE_FILE,
+                                        DEPOSITS_STORE_FILE,
+                                        DEPOSIT_KEYS_STORE_FILE,
+                                        TRANSACTIONS_STORE_FILE,
+                                        BALANCES_STORE_FILE,
+                                        BALANCE_INDEX_FILE)
+from uc3m_money.storage_backend import StorageBackend
+from uc3m_money.segmented_store import SegmentedStore
+from uc3m_money.transfer_index import transfer_key
+from uc3m_money.transactions_file import TransactionsFile
+from uc3m_money.balance_index import BalanceIndex
+from uc3m_money.balance_history import BalanceHistory
+from uc3m_money.json_lines_store import JsonLinesStore
+from uc3m_money.balance_aggregator import aggregate_balances
+
+MERGE_INTERVAL = 10.0
+
+
+#pylint: disable=too-many-instance-attributes
+class MultiProcessStorageBackend(StorageBackend):
+    """Storage in the json files shared by several processes. The stores
+    are SegmentedStores: each process appends to its own segments and a
+    background thread merges them into the main stores every
+    merge_interval seconds (None for merging only with merge and close).
+    The duplicate check reads the main store and the segments of every
+    process (only the records added since the previous check) and runs
+    holding the locks of the slots of the keys of the transfers, so two
+    processes cannot store the same transfer. The idempotency keys of the
+    deposits (and their signatures) are kept the same way in another
+    SegmentedStore, checked holding the locks of the slots of the keys.
+    An error of the background merge does not stop it; the last one is
+    raised by the next merge or close"""
+    def __init__(self, json_files_path: str = None, merge_interval: float = MERGE_INTERVAL):
+        self.__json_files_path = json_files_path
+        self.__transfers_store = SegmentedStore(self.__path(TRANSFERS_STORE_FILE))
+        self.__deposits_store = SegmentedStore(self.__path(DEPOSITS_STORE_FILE))
+        self.__balances_store = SegmentedStore(self.__path(BALANCES_STORE_FILE))
+        self.__transactions = TransactionsFile(self.__path(TRANSACTIONS_STORE_FILE))
+        self.__balance_index = BalanceIndex(self.__transactions,
+                                            self.__path(BALANCE_INDEX_FILE))
+        self.__balance_history = BalanceHistory(JsonLinesStore(self.__path(BALANCES_STORE_FILE)))
+        self.__deposit_keys_store = SegmentedStore(self.__path(DEPOSIT_KEYS_STORE_FILE))
+        self.__keys = set()
+        self.__offsets = {}
+        self.__deposit_signatures = {}
+        self.__deposit_offsets = {}
+        self.__stop = threading.Event()
+        self.__merge_error = None
+        self.__merger = None
+        if merge_interval is not None:
+            self.__merger = threading.Thread(target=self.__merge_periodically,
+                                             args=(merge_interval,), daemon=True,
+                                             name="segment-merger")
+            self.__merger.start()
+
+    def __path(self, store_file: str) -> str:
+        """path of a store file in the json files directory of the backend"""
+        if self.__json_files_path is None:
+            return store_file
+        return os.path.join(self.__json_files_path, os.path.basename(store_file))
+
+    @contextmanager
+    def transfer_locks(self, transfers):
+        with self.__transfers_store.key_locks(transfer_key(k) for k in transfers):
+            yield
+
+    @contextmanager
+    def deposit_locks(self, keys):
+        with self.__deposit_keys_store.key_locks(keys):
+            yield
+
+    def transfer_exists(self, transfer) -> bool:
+        with self.__transfers_store.locked():
+            self.__offsets = self.__read_new(self.__transfers_store, self.__offsets,
+                                             self.__keys.clear,
+                                             lambda k: self.__keys.add(transfer_key(k)))
+        return transfer_key(transfer) in self.__keys
+
+    def find_deposit(self, key: str, iban: str):  # pylint: disable=unused-argument
+        def add(record):
+            self.__deposit_signatures[record["key"]] = record["signature"]
+        with self.__deposit_keys_store.locked():
+            self.__deposit_offsets = self.__read_new(self.__deposit_keys_store,
+                                                     self.__deposit_offsets,
+                                                     self.__deposit_signatures.clear, add)
+        return self.__deposit_signatures.get(key)
+
+    @staticmethod
+    def __read_new(segmented_store, offsets, clear, add) -> dict:
+        """calls add with the records stored since the last check (after
+        calling clear if the main store was truncated by the recovery of a
+        merge) and returns the offsets read in the main store and segments"""
+        stores = segmented_store.stores()
+        if stores[0].size() < offsets.get(stores[0].file_path, 0):
+            clear()
+            offsets = {}
+        new_offsets = {}
+        for store in stores:
+            offset = offsets.get(store.file_path, 0)
+            if store.size() < offset:
+                offset = 0
+            for record, offset in store.read_from(offset):
+                add(record)
+            new_offsets[store.file_path] = offset
+        return new_offsets
+
+    def add_transfers(self, records: list):
+        self.__transfers_store.append_all(records)
+
+    def add_deposits(self, records: list, keys: list = None):
+        self.__deposits_store.append_all(records)
+        if keys:
+            self.__deposit_keys_store.append_all(
+                [{"key": key, "signature": record["deposit_signature"]}
+                 for key, record in zip(keys, records)])
+
+    def read_transactions(self):
+        return self.__transactions.read()
+
+    def balance(self, iban: str):
+        return self.__balance_index.balance(iban)
+
+    def all_balances(self) -> dict:
+        return aggregate_balances(self.__transactions)
+
+    def add_balances(self, records: list):
+        self.__balances_store.append_all(records)
+
+    def balance_snapshot(self, iban: str, time: float = None):
+        self.__balances_store.merge()
+        with self.__balances_store.locked():
+            if time is None:
+                return self.__balance_history.latest(iban)
+            return self.__balance_history.as_of(iban, time)
+
+    def balance_snapshots(self, iban: str, start: float, end: float) -> list:
+        self.__balances_store.merge()
+        with self.__balances_store.locked():
+            return self.__balance_history.between(iban, start, end)
+
+    def thin_balances(self, keep_seconds: float, interval_seconds: float, now: float) -> int:
+        self.__balances_store.merge()
+        with self.__balances_store.locked(exclusive=True):
+            return self.__balance_history.thin(keep_seconds, interval_seconds, now)
+
+    def merge(self) -> int:
+        """merges the segments of all the processes into the main stores
+        and returns the number of records moved; raises the last error of
+        the background merge found since the previous call"""
+        moved = self.__merge_stores()
+        error, self.__merge_error = self.__merge_error, None
+        if error is not None:
+            raise error
+        return moved
+
+    def migrate(self):
+        for store in (self.__transfers_store, self.__deposits_store, self.__balances_store):
+            store.migrate()
+
+    def close(self):
+        self.__stop.set()
+        if self.__merger is not None:
+            self.__merger.join()
+        self.merge()
+
+    def __merge_stores(self):
+        """merges the segments of every store"""
+        return sum(store.merge() for store in (self.__transfers_store,
+                                               self.__deposits_store,
+                                               self.__deposit_keys_store,
+                                               self.__balances_store))
+
+    def __merge_periodically(self, interval):
+        """background merge thread"""
+        while not self.__stop.wait(interval):
+            try:
+                self.__merge_stores()
+            except Exception as ex:  # pylint: disable=broad-exception-caught
+                # the thread must keep merging whatever happens
+                self.__merge_error = ex
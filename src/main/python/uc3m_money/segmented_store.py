@@ -0,0 +1,175 @@
+"""MODULE: segmented_store. Contains the multi-process json lines store class"""
+import json
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+from uc3m_money.account_management_exception import AccountManagementException
+from uc3m_money.json_lines_store import JsonLinesStore
+from uc3m_money.json_codec import JSON_CODEC
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+SEGMENT_SUFFIX = ".segment"
+KEY_SLOTS = 4096
+# the record locks of a file are owned by the process (and closing any of
+# its descriptors releases them all), so the threads of a process take a
+# lock per slot and share a descriptor of the keys lock file
+_KEY_LOCKS = {}
+_KEY_LOCKS_LOCK = threading.Lock()
+
+
+class SegmentedStore:
+    """Json lines store shared by several processes. Every process appends
+    to its own segment file (store.<pid>-<token>.segment) holding a shared
+    lock, so the processes do not wait for each other; the readers see the
+    main store followed by the segments. merge moves the segments to the
+    main store holding the exclusive lock, with a journal that makes it
+    safe to interrupt. key_locks locks slots of keys among processes and
+    among the threads of a process (of any SegmentedStore of the file)"""
+    def __init__(self, file_path: str):
+        if fcntl is None:
+            raise AccountManagementException("Multi-process stores need POSIX file locks")
+        self.__main = JsonLinesStore(file_path)
+        self.__lock_file = file_path + ".lock"
+        self.__keys_lock_file = file_path + ".keys.lock"
+        self.__journal_file = file_path + ".merge"
+        self.__segment = None
+
+    @property
+    def file_path(self):
+        """Path of the main store"""
+        return self.__main.file_path
+
+    @contextmanager
+    def locked(self, exclusive: bool = False):
+        """holds the lock of the store (exclusive for merging)"""
+        with open(self.__lock_file, "a", encoding="utf-8") as file:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+    @contextmanager
+    def key_locks(self, keys):
+        """holds the locks of the slots of the keys (hex digests) so other
+        processes (or threads) cannot write records with the same keys
+        meanwhile"""
+        slots = sorted({int(key[:8], 16) % KEY_SLOTS for key in keys})
+        descriptor, thread_locks = _key_locks(self.__keys_lock_file)
+        locked = []
+        try:
+            for slot in slots:
+                thread_locks[slot].acquire()
+                locked.append(slot)
+                fcntl.lockf(descriptor, fcntl.LOCK_EX, 1, slot)
+            yield
+        finally:
+            for slot in reversed(locked):
+                fcntl.lockf(descriptor, fcntl.LOCK_UN, 1, slot)
+                thread_locks[slot].release()
+
+    def stores(self) -> list:
+        """main store and segments (call it holding the lock)"""
+        directory = os.path.dirname(os.path.abspath(self.file_path))
+        prefix = os.path.basename(self.file_path) + "."
+        segments = sorted(name for name in os.listdir(directory)
+                          if name.startswith(prefix) and name.endswith(SEGMENT_SUFFIX))
+        return [self.__main] + [JsonLinesStore(os.path.join(directory, name))
+                                for name in segments]
+
+    def read(self):
+        """generator that yields the records of the main store and the segments"""
+        with self.locked():
+            for store in self.stores():
+                yield from store.read()
+
+    def append_all(self, records):
+        """appends the records to the segment of this process"""
+        with self.locked():
+            return self.__own_segment().append_all(records)
+
+    def migrate(self):
+        """migrates the main store if it is a json array"""
+        with self.locked(exclusive=True):
+            return self.__main.migrate()
+
+    def merge(self) -> int:
+        """moves the records of the segments to the main store and
+        returns how many were moved"""
+        with self.locked(exclusive=True):
+            journal = self.__read_journal()
+            if journal is None:
+                segments = [store.file_path for store in self.stores()[1:]]
+                if not segments:
+                    return 0
+                journal = {"size": self.__main.size(), "segments": segments,
+                           "done": False, "moved": 0}
+                self.__write_journal(journal)
+            if not journal["done"]:
+                if self.__main.size() > journal["size"]:
+                    os.truncate(self.file_path, journal["size"])
+                moved = 0
+                for segment in journal["segments"]:
+                    records = list(JsonLinesStore(segment).read())
+                    self.__main.append_all(records)
+                    moved += len(records)
+                self.__fsync(self.file_path)
+                journal.update(done=True, moved=moved)
+                self.__write_journal(journal)
+            for segment in journal["segments"]:
+                if os.path.exists(segment):
+                    os.remove(segment)
+            os.remove(self.__journal_file)
+            return journal["moved"]
+
+    def __own_segment(self):
+        """segment of the current process (a new one after a fork, and
+        after a merge: the readers remember their offset in every segment,
+        so a merged segment is never written again)"""
+        if self.__segment is None or self.__segment[0] != os.getpid() or \
+                not os.path.exists(self.__segment[1].file_path):
+            path = f"{self.file_path}.{os.getpid()}-{uuid.uuid4().hex[:8]}{SEGMENT_SUFFIX}"
+            self.__segment = (os.getpid(), JsonLinesStore(path))
+        return self.__segment[1]
+
+    def __read_journal(self):
+        """journal of an interrupted merge, None if there is none"""
+        try:
+            with open(self.__journal_file, "rb") as file:
+                return JSON_CODEC.load(file)
+        except FileNotFoundError:
+            return None
+        except json.JSONDecodeError as ex:
+            raise AccountManagementException("JSON Decode Error - Wrong JSON Format") from ex
+
+    def __write_journal(self, journal):
+        """writes the journal durably"""
+        temp_path = self.__journal_file + ".writing"
+        with open(temp_path, "wb") as file:
+            JSON_CODEC.dump(journal, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.__journal_file)
+
+    @staticmethod
+    def __fsync(file_path):
+        """flushes a file to the disk"""
+        if os.path.exists(file_path):
+            with open(file_path, "rb") as file:
+                os.fsync(file.fileno())
+
+
+def _key_locks(keys_lock_file):
+    """descriptor of the keys lock file and locks of its slots shared by
+    the threads of this process (a child process gets its own)"""
+    key = (os.getpid(), os.path.abspath(keys_lock_file))
+    with _KEY_LOCKS_LOCK:
+        if key not in _KEY_LOCKS:
+            descriptor = os.open(keys_lock_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o666)
+            _KEY_LOCKS[key] = (descriptor, [threading.Lock() for _ in range(KEY_SLOTS)])
+        return _KEY_LOCKS[key]
@@ -0,0 +1,144 @@
+"""MODULE: sharded_storage_backend. Contains the IBAN sharded storage backend"""
+import json
+import os
+import zlib
+from uc3m_money.account_management_config import (JSON_FILES_PATH,
+                                        SHARDS_LAYOUT_FILE,
+                                        STORE_SHARDS)
+from uc3m_money.account_management_exception import AccountManagementException
+from uc3m_money.storage_backend import StorageBackend
+from uc3m_money.json_storage_backend import JsonStorageBackend
+from uc3m_money.json_codec import JSON_CODEC
+
+
+def shard_of(iban: str, shards: int) -> int:
+    """returns the shard of the iban (the same in every process)"""
+    return zlib.crc32(iban.encode()) % shards
+
+
+def read_layout(json_files_path: str):
+    """returns the layout of the shards of the directory ({"shards": n,
+    "directory": name}), None if its stores are not sharded"""
+    layout_file = os.path.join(json_files_path, os.path.basename(SHARDS_LAYOUT_FILE))
+    if not os.path.exists(layout_file):
+        return None
+    with open(layout_file, "rb") as file:
+        try:
+            return JSON_CODEC.load(file)
+        except json.JSONDecodeError as ex:
+            raise AccountManagementException("JSON Decode Error - Wrong JSON Format") from ex
+
+
+def write_layout(json_files_path: str, layout: dict):
+    """replaces the layout of the shards of the directory atomically"""
+    layout_file = os.path.join(json_files_path, os.path.basename(SHARDS_LAYOUT_FILE))
+    with open(layout_file + ".writing", "wb") as file:
+        JSON_CODEC.dump(layout, file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(layout_file + ".writing", layout_file)
+
+
+def shard_paths(json_files_path: str, layout: dict) -> list:
+    """returns the directories of the shards of the layout"""
+    return [os.path.join(json_files_path, layout["directory"], f"shard-{index}")
+            for index in range(layout["shards"])]
+
+
+class ShardedStorageBackend(StorageBackend):
+    """Storage in shards partitioned by a hash of the iban: the transfers
+    by from_iban, the deposits by to_iban and the transactions and the
+    balances by IBAN. Every shard is a directory with the json files of a
+    JsonStorageBackend, so the operations of one iban read and write only
+    its shard; only all_balances and read_transactions visit all of them.
+    The shards file of json_files_path keeps the number of shards and
+    their directory. StoreResharder migrates the stores of an unsharded
+    directory or changes the number of shards"""
+    def __init__(self, json_files_path: str = None, shards: int = None):
+        if json_files_path is None:
+            json_files_path = JSON_FILES_PATH
+        layout = read_layout(json_files_path)
+        if layout is None:
+            layout = {"shards": shards or STORE_SHARDS,
+                      "directory": f"shards-{shards or STORE_SHARDS}"}
+            for path in shard_paths(json_files_path, layout):
+                os.makedirs(path, exist_ok=True)
+            write_layout(json_files_path, layout)
+        elif shards is not None and shards != layout["shards"]:
+            raise AccountManagementException("Wrong number of shards - reshard the stores")
+        self.__shards = [JsonStorageBackend(path)
+                         for path in shard_paths(json_files_path, layout)]
+
+    @property
+    def shards(self) -> int:
+        """number of shards"""
+        return len(self.__shards)
+
+    def shard(self, iban: str) -> JsonStorageBackend:
+        """returns the backend of the shard of the iban"""
+        return self.__shards[shard_of(iban, len(self.__shards))]
+
+    def __grouped(self, records, iban_field, keys=None):
+        """splits the records (and their keys) by shard"""
+        groups = {}
+        for position, record in enumerate(records):
+            group = groups.setdefault(shard_of(record[iban_field], len(self.__shards)),
+                                      ([], []))
+            group[0].append(record)
+            if keys:
+                group[1].append(keys[position])
+        return [(self.__shards[index], group) for index, group in groups.items()]
+
+    def transfer_exists(self, transfer) -> bool:
+        from_iban = transfer["from_iban"] if isinstance(transfer, dict) else transfer.from_iban
+        return self.shard(from_iban).transfer_exists(transfer)
+
+    def add_transfers(self, records: list):
+        for shard, (group, _) in self.__grouped(records, "from_iban"):
+            shard.add_transfers(group)
+
+    def add_deposits(self, records: list, keys: list = None):
+        for shard, (group, group_keys) in self.__grouped(records, "to_iban", keys):
+            shard.add_deposits(group, group_keys)
+
+    def find_deposit(self, key: str, iban: str):
+        return self.shard(iban).find_deposit(key, iban)
+
+    def read_transactions(self):
+        for shard in self.__shards:
+            yield from shard.read_transactions()
+
+    def balance(self, iban: str):
+        return self.shard(iban).balance(iban)
+
+    def all_balances(self) -> dict:
+        balances = {}
+        for shard in self.__shards:
+            balances.update(shard.all_balances())
+        return balances
+
+    def add_balances(self, records: list):
+        for shard, (group, _) in self.__grouped(records, "IBAN"):
+            shard.add_balances(group)
+
+    def balance_snapshot(self, iban: str, time: float = None):
+        return self.shard(iban).balance_snapshot(iban, time)
+
+    def balance_snapshots(self, iban: str, start: float, end: float) -> list:
+        return self.shard(iban).balance_snapshots(iban, start, end)
+
+    def thin_balances(self, keep_seconds: float, interval_seconds: float, now: float) -> int:
+        return sum(shard.thin_balances(keep_seconds, interval_seconds, now)
+                   for shard in self.__shards)
+
+    def migrate(self):
+        for shard in self.__shards:
+            shard.migrate()
+
+    def load(self):
+        for shard in self.__shards:
+            shard.load()
+
+    def close(self):
+        for shard in self.__shards:
+            shard.close()
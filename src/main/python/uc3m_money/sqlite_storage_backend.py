@@ -0,0 +1,199 @@
+"""MODULE: sqlite_storage_backend. Contains the embedded SQLite storage backend"""
+import sqlite3
+import threading
+from uc3m_money.account_management_exception import AccountManagementException
+from uc3m_money.storage_backend import StorageBackend
+from uc3m_money.transactions_file import TransactionsFile
+from uc3m_money.columnar_transactions import amount_cents
+from uc3m_money.transfer_index import transfer_key
+from uc3m_money.json_codec import JSON_CODEC
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transfers (
+    id INTEGER PRIMARY KEY,
+    transfer_key TEXT NOT NULL UNIQUE,
+    from_iban TEXT NOT NULL,
+    to_iban TEXT NOT NULL,
+    transfer_code TEXT NOT NULL,
+    record TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS transfers_from_iban ON transfers (from_iban);
+CREATE INDEX IF NOT EXISTS transfers_to_iban ON transfers (to_iban);
+CREATE TABLE IF NOT EXISTS deposits (
+    id INTEGER PRIMARY KEY,
+    to_iban TEXT NOT NULL,
+    deposit_signature TEXT NOT NULL,
+    record TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS deposits_to_iban ON deposits (to_iban);
+CREATE TABLE IF NOT EXISTS deposit_keys (
+    deposit_key TEXT PRIMARY KEY,
+    deposit_signature TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY,
+    iban TEXT NOT NULL,
+    amount TEXT NOT NULL,
+    amount_cents INTEGER NOT NULL);
+CREATE INDEX IF NOT EXISTS transactions_iban ON transactions (iban, amount_cents);
+CREATE TABLE IF NOT EXISTS balances (
+    id INTEGER PRIMARY KEY,
+    iban TEXT NOT NULL,
+    time REAL NOT NULL,
+    balance REAL NOT NULL);
+CREATE INDEX IF NOT EXISTS balances_iban_time ON balances (iban, time);
+"""
+
+
+class SqliteStorageBackend(StorageBackend):
+    """Storage in an embedded SQLite database (":memory:" for a temporary
+    one). The duplicate check is a lookup in the unique index of the
+    transfer keys and the balances are indexed sums of the amounts of an
+    iban. The amounts are added as integer cents, so the balances are
+    exact and may differ in the last digit from the ones of the json
+    backend, which adds the floats one by one.
+    The transactions are loaded with import_transactions or
+    import_transactions_file"""
+    def __init__(self, database_file: str):
+        self.__lock = threading.RLock()
+        self.__connection = sqlite3.connect(database_file, check_same_thread=False)
+        with self.__lock, self.__connection:
+            self.__connection.executescript(SCHEMA)
+
+    def transfer_exists(self, transfer) -> bool:
+        with self.__lock:
+            row = self.__connection.execute(
+                "SELECT 1 FROM transfers WHERE transfer_key = ?",
+                (transfer_key(transfer),)).fetchone()
+        return row is not None
+
+    def add_transfers(self, records: list):
+        rows = [(transfer_key(record), record["from_iban"], record["to_iban"],
+                 record["transfer_code"], JSON_CODEC.dumps(record).decode()) for record in records]
+        try:
+            with self.__lock, self.__connection:
+                self.__connection.executemany(
+                    "INSERT INTO transfers (transfer_key, from_iban, to_iban, "
+                    "transfer_code, record) VALUES (?, ?, ?, ?, ?)", rows)
+        except sqlite3.IntegrityError as ex:
+            raise AccountManagementException("Duplicated transfer in transfer list") from ex
+
+    def add_deposits(self, records: list, keys: list = None):
+        rows = [(record["to_iban"], record["deposit_signature"], JSON_CODEC.dumps(record).decode())
+                for record in records]
+        with self.__lock, self.__connection:
+            self.__connection.executemany(
+                "INSERT INTO deposits (to_iban, deposit_signature, record) "
+                "VALUES (?, ?, ?)", rows)
+            if keys:
+                self.__connection.executemany(
+                    "INSERT OR IGNORE INTO deposit_keys (deposit_key, deposit_signature) "
+                    "VALUES (?, ?)", zip(keys, (k["deposit_signature"] for k in records)))
+
+    def find_deposit(self, key: str, iban: str):  # pylint: disable=unused-argument
+        with self.__lock:
+            row = self.__connection.execute(
+                "SELECT deposit_signature FROM deposit_keys WHERE deposit_key = ?",
+                (key,)).fetchone()
+        return None if row is None else row[0]
+
+    def transfers(self, iban: str = None) -> list:
+        """returns the stored transfers (the ones from or to the iban)"""
+        query = "SELECT record FROM transfers"
+        params = ()
+        if iban is not None:
+            query += " WHERE from_iban = ? OR to_iban = ?"
+            params = (iban, iban)
+        with self.__lock:
+            rows = self.__connection.execute(query + " ORDER BY id", params).fetchall()
+        return [JSON_CODEC.loads(row[0]) for row in rows]
+
+    def deposits(self, iban: str = None) -> list:
+        """returns the stored deposits (the ones into the iban)"""
+        query = "SELECT record FROM deposits"
+        params = ()
+        if iban is not None:
+            query += " WHERE to_iban = ?"
+            params = (iban,)
+        with self.__lock:
+            rows = self.__connection.execute(query + " ORDER BY id", params).fetchall()
+        return [JSON_CODEC.loads(row[0]) for row in rows]
+
+    def import_transactions(self, transactions):
+        """adds the transactions (dicts with IBAN and amount) to the database"""
+        rows = []
+        for transaction in transactions:
+            try:
+                amount = transaction["amount"]
+                rows.append((transaction["IBAN"], str(amount), amount_cents(amount)))
+            except (KeyError, TypeError) as ex:
+                raise AccountManagementException(
+                    "JSON Decode Error - Wrong JSON Format") from ex
+        with self.__lock, self.__connection:
+            self.__connection.executemany(
+                "INSERT INTO transactions (iban, amount, amount_cents) VALUES (?, ?, ?)", rows)
+
+    def import_transactions_file(self, file_path: str):
+        """adds the transactions of a transactions file to the database"""
+        self.import_transactions(TransactionsFile(file_path).read())
+
+    def read_transactions(self):
+        with self.__lock:
+            rows = self.__connection.execute(
+                "SELECT iban, amount FROM transactions ORDER BY id").fetchall()
+        for iban, amount in rows:
+            yield {"IBAN": iban, "amount": amount}
+
+    def balance(self, iban: str):
+        with self.__lock:
+            row = self.__connection.execute(
+                "SELECT SUM(amount_cents) FROM transactions WHERE iban = ?",
+                (iban,)).fetchone()
+        return None if row[0] is None else row[0] / 100
+
+    def all_balances(self) -> dict:
+        with self.__lock:
+            rows = self.__connection.execute(
+                "SELECT iban, SUM(amount_cents) FROM transactions "
+                "GROUP BY iban ORDER BY MIN(id)").fetchall()
+        return {iban: cents / 100 for iban, cents in rows}
+
+    def add_balances(self, records: list):
+        rows = [(record["IBAN"], record["time"], record["BALANCE"]) for record in records]
+        with self.__lock, self.__connection:
+            self.__connection.executemany(
+                "INSERT INTO balances (iban, time, balance) VALUES (?, ?, ?)", rows)
+
+    def balance_records(self, iban: str) -> list:
+        """returns the stored balances of the iban ordered by time"""
+        return self.balance_snapshots(iban, float("-inf"), float("inf"))
+
+    def balance_snapshot(self, iban: str, time: float = None):
+        if time is None:
+            time = float("inf")
+        with self.__lock:
+            row = self.__connection.execute(
+                "SELECT iban, time, balance FROM balances WHERE iban = ? AND time <= ? "
+                "ORDER BY time DESC, id DESC LIMIT 1", (iban, time)).fetchone()
+        return None if row is None else {"IBAN": row[0], "time": row[1], "BALANCE": row[2]}
+
+    def balance_snapshots(self, iban: str, start: float, end: float) -> list:
+        with self.__lock:
+            rows = self.__connection.execute(
+                "SELECT iban, time, balance FROM balances WHERE iban = ? "
+                "AND time BETWEEN ? AND ? ORDER BY time, id", (iban, start, end)).fetchall()
+        return [{"IBAN": row[0], "time": row[1], "BALANCE": row[2]} for row in rows]
+
+    def thin_balances(self, keep_seconds: float, interval_seconds: float, now: float) -> int:
+        with self.__lock, self.__connection:
+            rows = self.__connection.execute(
+                "SELECT id, iban, time FROM balances WHERE time < ? ORDER BY iban, time, id",
+                (now - keep_seconds,)).fetchall()
+            kept = {}
+            for row_id, iban, time in rows:
+                kept[iban, time // interval_seconds] = row_id
+            kept = set(kept.values())
+            removed = [(row[0],) for row in rows if row[0] not in kept]
+            self.__connection.executemany("DELETE FROM balances WHERE id = ?", removed)
+        return len(removed)
+
+    def close(self):
+        with self.__lock:
+            self.__connection.close()
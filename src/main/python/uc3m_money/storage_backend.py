@@ -0,0 +1,83 @@
+"""MODULE: storage_backend. Contains the storage backend interface"""
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+
+class StorageBackend(ABC):
+    """Interface of the persistence used by the AccountManager for the
+    transfers, deposits, transactions and balances. Records are the
+    dicts returned by the to_json methods"""
+
+    @abstractmethod
+    def transfer_exists(self, transfer) -> bool:
+        """returns True if a transfer with the same duplicate key
+        (stored record or TransferRequest) is stored"""
+
+    @contextmanager
+    def transfer_locks(self, transfers):  # pylint: disable=unused-argument
+        """context in which the duplicate check and the write of the
+        transfers are done, backends shared by several processes lock
+        them here (nothing by default)"""
+        yield
+
+    @contextmanager
+    def deposit_locks(self, keys):  # pylint: disable=unused-argument
+        """context in which the idempotency keys of the deposits are
+        checked and the deposits are written (nothing by default)"""
+        yield
+
+    @abstractmethod
+    def add_transfers(self, records: list):
+        """stores the transfer records with a single write"""
+
+    @abstractmethod
+    def add_deposits(self, records: list, keys: list = None):
+        """stores the deposit records with a single write (keys are their
+        idempotency keys, for the backends that keep them)"""
+
+    def find_deposit(self, key: str, iban: str):  # pylint: disable=unused-argument
+        """returns the signature of the deposit into the iban stored with
+        the idempotency key, None if there is none (or the backend does
+        not keep them)"""
+        return None
+
+    @abstractmethod
+    def read_transactions(self):
+        """generator that yields the transactions one by one"""
+
+    @abstractmethod
+    def balance(self, iban: str):
+        """returns the balance of the iban, None if it has no transactions"""
+
+    @abstractmethod
+    def all_balances(self) -> dict:
+        """returns the balance of every iban with transactions"""
+
+    @abstractmethod
+    def add_balances(self, records: list):
+        """stores the balance records with a single write"""
+
+    @abstractmethod
+    def balance_snapshot(self, iban: str, time: float = None):
+        """returns the last balance record of the iban stored at or before
+        time (the last one without time), None if there is none"""
+
+    @abstractmethod
+    def balance_snapshots(self, iban: str, start: float, end: float) -> list:
+        """returns the balance records of the iban stored from start to end"""
+
+    @abstractmethod
+    def thin_balances(self, keep_seconds: float, interval_seconds: float, now: float) -> int:
+        """removes the balance records older than keep_seconds except the
+        last one of each iban in every interval_seconds period and returns
+        how many were removed"""
+
+    def migrate(self):
+        """converts the stores written by previous versions (if needed)"""
+
+    def load(self):
+        """loads the indexes of the stores in memory (otherwise the first
+        operation that needs each of them loads it)"""
+
+    def close(self):
+        """releases the resources of the backend"""
@@ -0,0 +1,234 @@
+"""MODULE: store_cache. Contains the cache of the parsed stores class"""
+import os
+import sys
+import threading
+import time
+import zlib
+from bisect import bisect_right
+from collections import OrderedDict
+from itertools import chain, islice
+from uc3m_money.account_management_config import STORE_CACHE_BYTES
+from uc3m_money.metrics import METRICS
+
+# the mtime of a file written less than this ago may not change when it
+# is written again (it has the granularity of the clock tick of the
+# kernel), its content is verified before reusing it
+RACY_NANOSECONDS = 1_000_000_000
+CHECKSUM_BLOCK_SIZE = 1 << 20
+# records measured to estimate the memory of the records of a file
+SIZE_SAMPLE = 64
+# the (record, end) tuple, the end offset and the pointers in the lists
+PAIR_SIZE = sys.getsizeof((None, None)) + sys.getsizeof(1 << 40) + 16
+
+
+def file_key(stat) -> tuple:
+    """identity of the version of a file in the cache"""
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+class StoreCache:
+    """Least recently used cache of the records parsed from the store
+    files, keyed by path and validated against the (mtime, size, inode)
+    of the file, so reading an unchanged file again skips parsing it.
+    A file parsed less than a second after it was written is verified
+    with a checksum until that second has passed. The records appended
+    by this process are added to the cached records and trusted without
+    reading the file again. The memory of the records cached (estimated
+    from a sample of them, it is about 3 times the size of their files)
+    is limited to max_bytes. The records returned are shared, they must
+    not be modified"""
+    def __init__(self, max_bytes: int = STORE_CACHE_BYTES):
+        self.__max_bytes = max_bytes
+        self.__lock = threading.Lock()
+        self.__entries = OrderedDict()
+        self.__bytes = 0
+
+    @property
+    def max_bytes(self) -> int:
+        """limit of the estimated memory of the records cached"""
+        return self.__max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes: int):
+        with self.__lock:
+            self.__max_bytes = max_bytes
+            self.__evict()
+
+    @property
+    def size(self) -> int:
+        """estimated memory of the records cached"""
+        return self.__bytes
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def fits(self, size: int) -> bool:
+        """True if a file of that size may be cached (its records take
+        more memory than the file)"""
+        return size <= self.__max_bytes
+
+    def read(self, file_path: str, file, offset: int, parse):
+        """(record, end offset) pairs of the open file after the byte
+        offset, from the cache or parsed with parse(file, offset); the
+        whole file is cached when it is read from the start and the memory
+        of its records, estimated from the first ones, fits; otherwise the
+        records are streamed"""
+        stat = os.fstat(file.fileno())
+        records = self.records_from(file_path, stat, offset)
+        if records is None:
+            records = parse(file, offset)
+            if offset == 0 and self.fits(stat.st_size):
+                first = list(islice(records, SIZE_SAMPLE))
+                if len(first) == SIZE_SAMPLE and not self.fits(
+                        _records_size(first) * stat.st_size // max(1, first[-1][1])):
+                    return chain(first, records)
+                records = first + list(records)
+                # a file written while it was parsed is not cached
+                if file_key(os.fstat(file.fileno())) == file_key(stat):
+                    self.put(file_path, stat, records)
+        return records
+
+    def records_from(self, file_path: str, stat, offset: int = 0):
+        """returns the (record, end offset) pairs cached for this version of
+        the file placed after the byte offset, None if it is not cached"""
+        with self.__lock:
+            entry = self.__entries.get(file_path)
+            if entry is not None and entry.key != file_key(stat):
+                self.__remove(file_path)
+                entry = None
+            if entry is not None and entry.checksum is not None:
+                if _checksum(file_path, entry.key[1]) != entry.checksum:
+                    self.__remove(file_path)
+                    entry = None
+                elif time.time_ns() >= entry.verify_until:
+                    # a later write changes the mtime, the key is enough
+                    entry.checksum = None
+            if entry is None:
+                METRICS.count("store_cache_misses")
+                return None
+            self.__entries.move_to_end(file_path)
+        METRICS.count("store_cache_hits")
+        start = bisect_right(entry.ends, offset) if offset else 0
+        return entry.records[start:]
+
+    def put(self, file_path: str, stat, records: list):
+        """caches the (record, end offset) pairs parsed from the file"""
+        entry = _Entry(file_key(stat), records)
+        if not self.fits(entry.size):
+            return
+        if time.time_ns() < stat.st_mtime_ns + RACY_NANOSECONDS:
+            entry.checksum = _checksum(file_path, stat.st_size)
+            entry.verify_until = stat.st_mtime_ns + RACY_NANOSECONDS
+            if entry.checksum is None:
+                return
+        with self.__lock:
+            self.__remove(file_path)
+            self.__entries[file_path] = entry
+            self.__bytes += entry.size
+            self.__evict()
+
+    #pylint: disable=too-many-arguments
+    def extend(self, file_path: str, before, after, data: bytes, records: list):
+        """adds the records appended (as data) to the file, which had the
+        stat before and has the stat after; the cached records are dropped
+        if somebody else changed the file in between (the stats tell it,
+        so the file is not read)"""
+        with self.__lock:
+            entry = self.__entries.get(file_path)
+            if entry is None:
+                return
+            size = _records_size(records)
+            if (entry.key != file_key(before)
+                    or after.st_size != before.st_size + len(data)
+                    or not self.fits(entry.size + size)):
+                self.__remove(file_path)
+                return
+            offset = before.st_size
+            for record, end in records:
+                entry.records.append((record, offset + end))
+                entry.ends.append(offset + end)
+            if entry.checksum is not None:
+                entry.checksum = zlib.crc32(data, entry.checksum)
+            entry.key = file_key(after)
+            entry.size += size
+            self.__bytes += size
+            self.__entries.move_to_end(file_path)
+            self.__evict()
+
+    def discard(self, file_path: str):
+        """forgets the records of a file"""
+        with self.__lock:
+            self.__remove(file_path)
+
+    def clear(self):
+        """forgets all the records"""
+        with self.__lock:
+            self.__entries.clear()
+            self.__bytes = 0
+
+    def __remove(self, file_path):
+        """drops an entry (with the lock held)"""
+        entry = self.__entries.pop(file_path, None)
+        if entry is not None:
+            self.__bytes -= entry.size
+
+    def __evict(self):
+        """drops the least recently used entries over the limit"""
+        while self.__bytes > self.__max_bytes:
+            _, entry = self.__entries.popitem(last=False)
+            self.__bytes -= entry.size
+
+
+#pylint: disable=too-few-public-methods
+class _Entry:
+    """Records of a version of a file; the checksum of the file is kept
+    while its mtime is too recent to tell apart two versions"""
+    __slots__ = ("key", "records", "ends", "size", "checksum", "verify_until")
+
+    def __init__(self, key, records):
+        self.key = key
+        self.records = records
+        self.ends = [end for _, end in records]
+        self.size = _records_size(records)
+        self.checksum = None
+        self.verify_until = 0
+
+
+def _records_size(records) -> int:
+    """estimated memory of the (record, end) pairs, measuring a sample
+    spread over them"""
+    if not records:
+        return 0
+    step = max(1, len(records) // SIZE_SAMPLE)
+    sample = records[::step]
+    sample_size = sum(_object_size(record) for record, _ in sample)
+    return (sample_size * len(records)) // len(sample) + PAIR_SIZE * len(records)
+
+
+def _object_size(value) -> int:
+    """memory of a parsed json value"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(sys.getsizeof(key) + _object_size(item) for key, item in value.items())
+    elif isinstance(value, list):
+        size += sum(_object_size(item) for item in value)
+    return size
+
+
+def _checksum(file_path, size):
+    """crc32 of the first size bytes of the file, None if it cannot be read"""
+    checksum = 0
+    try:
+        with open(file_path, "rb") as file:
+            while size > 0:
+                block = file.read(min(size, CHECKSUM_BLOCK_SIZE))
+                if not block:
+                    return None
+                checksum = zlib.crc32(block, checksum)
+                size -= len(block)
+    except OSError:
+        return None
+    return checksum
+
+
+STORE_CACHE = StoreCache()
@@ -0,0 +1,156 @@
+"""MODULE: store_resharder. Contains the tool that reshards the stores
+
+Usage: uc3m-reshard --shards N [json_files_path]
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import uuid
+from uc3m_money.account_management_config import (JSON_FILES_PATH,
+                                        TRANSFERS_STORE_FILE,
+                                        DEPOSITS_STORE_FILE,
+                                        DEPOSITS_INDEX_FILE,
+                                        TRANSACTIONS_STORE_FILE,
+                                        BALANCES_STORE_FILE)
+from uc3m_money.account_management_exception import AccountManagementException
+from uc3m_money.json_lines_store import JsonLinesStore
+from uc3m_money.transactions_file import TransactionsFile
+from uc3m_money.json_storage_backend import JsonStorageBackend
+from uc3m_money.json_codec import JSON_CODEC
+from uc3m_money.sharded_storage_backend import (shard_of, read_layout,
+                                                write_layout, shard_paths)
+
+CHUNK_RECORDS = 10000
+
+
+#pylint: disable=too-few-public-methods
+class StoreResharder:
+    """Moves the stores of a directory to a new set of shards: the json
+    files of an unsharded directory (they are left in place) or the shards
+    of a ShardedStorageBackend with another number of shards. The new
+    shards are written in a new directory and the shards file is replaced
+    at the end, so an interrupted reshard leaves the old shards in use.
+    No other process must write to the stores meanwhile"""
+    def __init__(self, json_files_path: str = None):
+        self.__path = JSON_FILES_PATH if json_files_path is None else json_files_path
+
+    def reshard(self, shards: int) -> dict:
+        """reshards the stores into shards shards and returns how many
+        records of each store were moved"""
+        if shards < 1:
+            raise AccountManagementException("Wrong number of shards - reshard the stores")
+        old_layout = read_layout(self.__path)
+        sources = [self.__path] if old_layout is None else shard_paths(self.__path, old_layout)
+        layout = {"shards": shards, "directory": f"shards-{shards}-{uuid.uuid4().hex[:8]}"}
+        targets = shard_paths(self.__path, layout)
+        for path in targets:
+            os.makedirs(path)
+        backends = [JsonStorageBackend(path) for path in targets]
+        transactions = [JsonLinesStore(self.__file(path, TRANSACTIONS_STORE_FILE))
+                        for path in targets]
+        counts = {"transfers": self.__move(self.__records(sources, TRANSFERS_STORE_FILE),
+                                           lambda k: k["from_iban"],
+                                           [k.add_transfers for k in backends]),
+                  "deposits": self.__move(self.__keyed_deposits(sources),
+                                          lambda k: k[0]["to_iban"],
+                                          [self.__deposits_writer(k) for k in backends]),
+                  "balances": self.__move(self.__records(sources, BALANCES_STORE_FILE),
+                                          lambda k: k["IBAN"],
+                                          [k.add_balances for k in backends]),
+                  "transactions": self.__move(self.__transactions(sources),
+                                              lambda k: k["IBAN"],
+                                              [k.append_all for k in transactions])}
+        for store in transactions:
+            if not os.path.exists(store.file_path):
+                with open(store.file_path, "w", encoding="utf-8", newline="") as file:
+                    file.write("[]\n")
+        write_layout(self.__path, layout)
+        if old_layout is not None:
+            shutil.rmtree(os.path.join(self.__path, old_layout["directory"]))
+        return counts
+
+    @staticmethod
+    def __file(path, store_file):
+        """path of a store file in a directory"""
+        return os.path.join(path, os.path.basename(store_file))
+
+    @staticmethod
+    def __move(items, iban_of, writers):
+        """writes the items to the writers of their shards in chunks
+        and returns how many were written"""
+        pending = {}
+        count = 0
+        for item in items:
+            shard = shard_of(iban_of(item), len(writers))
+            chunk = pending.setdefault(shard, [])
+            chunk.append(item)
+            count += 1
+            if len(chunk) >= CHUNK_RECORDS:
+                writers[shard](pending.pop(shard))
+        for shard, chunk in pending.items():
+            writers[shard](chunk)
+        return count
+
+    @classmethod
+    def __records(cls, sources, store_file):
+        """records of a store in every source directory"""
+        for path in sources:
+            yield from JsonLinesStore(cls.__file(path, store_file)).read()
+
+    @classmethod
+    def __transactions(cls, sources):
+        """transactions of every source directory"""
+        for path in sources:
+            transactions = TransactionsFile(cls.__file(path, TRANSACTIONS_STORE_FILE))
+            if os.path.exists(transactions.file_path):
+                yield from transactions.read()
+
+    @classmethod
+    def __keyed_deposits(cls, sources):
+        """(record, idempotency key or None) pairs of the deposits"""
+        for path in sources:
+            keys = {}
+            try:
+                with open(cls.__file(path, DEPOSITS_INDEX_FILE), "rb") as file:
+                    for line in file:
+                        entry = JSON_CODEC.loads(line)
+                        keys[entry["signature"]] = entry["key"]
+            except FileNotFoundError:
+                pass
+            except (json.JSONDecodeError, KeyError):
+                # a damaged index is discarded, the deposits are moved anyway
+                keys = {}
+            for record in JsonLinesStore(cls.__file(path, DEPOSITS_STORE_FILE)).read():
+                yield record, keys.get(record["deposit_signature"])
+
+    @staticmethod
+    def __deposits_writer(backend):
+        """writer of (record, key) chunks: the keyed deposits go last so the
+        deposits index of the shard ends at the last deposit written"""
+        def write(chunk):
+            backend.add_deposits([record for record, key in chunk if key is None])
+            keyed = [(record, key) for record, key in chunk if key is not None]
+            backend.add_deposits([k[0] for k in keyed], [k[1] for k in keyed])
+        return write
+
+
+def main(argv=None):
+    """command line entry of the tool"""
+    parser = argparse.ArgumentParser(description="Reshards the stores by IBAN")
+    parser.add_argument("json_files_path", nargs="?", default=JSON_FILES_PATH)
+    parser.add_argument("--shards", type=int, required=True)
+    args = parser.parse_args(argv)
+    try:
+        counts = StoreResharder(args.json_files_path).reshard(args.shards)
+    except AccountManagementException as ex:
+        print(ex.message, file=sys.stderr)
+        return 1
+    for store, count in counts.items():
+        print(f"{store}: {count} records")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""MODULE: synthetic_data_generator. Contains the load testing data generator class"""
+import json
+import os
+import random
+from datetime import date
+from uc3m_money.iban_validator import IbanValidator
+from uc3m_money.transfer_request import TransferRequest
+from uc3m_money.account_deposit import AccountDeposit
+
+CONCEPT_WORDS = ["rent", "salary", "invoice", "gift", "refund", "dinner", "loan", "fees",
+                 "holidays", "insurance", "books", "tickets", "payment", "month", "school"]
+TRANSFER_TYPES = ["ORDINARY", "INMEDIATE", "URGENT"]
+# the dates do not depend on the day the data is generated; the default
+# first date is later than today so the transfers are accepted for years
+FIRST_TRANSFER_DATE = date(2030, 1, 1)
+LAST_TRANSFER_DATE = date(2050, 12, 31)
+
+
+class SyntheticDataGenerator:
+    """Seeded generator of valid data for load tests: spanish ibans,
+    transfers, deposit input files and transactions files. The writers
+    produce the records one by one, so files of any size can be written
+    without keeping them in memory. The data only depends on the seed
+    and on the first date of the transfers"""
+    def __init__(self, seed: int = 0, first_date: date = FIRST_TRANSFER_DATE):
+        self.__random = random.Random(seed)
+        self.__first_date = first_date
+
+    def iban(self) -> str:
+        """returns a valid spanish iban (the inverse of valivan)"""
+        bban = f"{self.__random.randrange(10 ** 20):020d}"
+        return f"ES{IbanValidator.control_digits('ES00' + bban):02d}{bban}"
+
+    def ibans(self, count: int) -> list:
+        """returns a list of count different valid ibans"""
+        ibans = set()
+        while len(ibans) < count:
+            ibans.add(self.iban())
+        return sorted(ibans)
+
+    def concept(self) -> str:
+        """returns a concept accepted by validate_concept"""
+        words = [self.__random.choice(CONCEPT_WORDS)]
+        while len(words) < 2 or self.__random.random() < 0.5:
+            word = self.__random.choice(CONCEPT_WORDS)
+            if len(" ".join(words + [word])) > 30:
+                break
+            words.append(word)
+        concept = " ".join(words)
+        if len(concept) < 10:
+            concept += " transfer"
+        return concept
+
+    def transfer_date(self, first_date: date = None) -> str:
+        """returns a date accepted by validate_transfer_date
+        (between first_date, by default the one of the generator, and 2050)"""
+        if first_date is None:
+            first_date = self.__first_date
+        day = self.__random.randint(first_date.toordinal(), LAST_TRANSFER_DATE.toordinal())
+        return date.fromordinal(day).strftime("%d/%m/%Y")
+
+    def transfer(self, ibans: list) -> dict:
+        """returns the arguments of a valid transfer_request"""
+        from_iban, to_iban = self.__random.sample(ibans, 2)
+        return {"from_iban": from_iban,
+                "to_iban": to_iban,
+                "concept": self.concept(),
+                "transfer_type": self.__random.choice(TRANSFER_TYPES),
+                "date": self.transfer_date(),
+                "amount": self.__random.randint(1000, 1000000) / 100}
+
+    def transfers(self, count: int, ibans: list):
+        """generator of count valid transfers"""
+        for _ in range(count):
+            yield self.transfer(ibans)
+
+    def deposit(self, ibans: list) -> dict:
+        """returns the content of a valid deposit input file"""
+        return {"IBAN": self.__random.choice(ibans),
+                "AMOUNT": f"EUR {self.__random.randint(1, 999999) / 100:07.2f}"}
+
+    def transaction(self, ibans: list) -> dict:
+        """returns a transaction of the transactions file"""
+        return {"IBAN": self.__random.choice(ibans),
+                "amount": f"{self.__random.randint(-999999, 999999) / 100:+.2f}"}
+
+    def write_deposit_files(self, directory: str, count: int, ibans: list) -> list:
+        """writes count deposit input files in the directory
+        and returns their names"""
+        os.makedirs(directory, exist_ok=True)
+        names = []
+        for number in range(count):
+            names.append(f"deposit_{number:08d}.json")
+            with open(os.path.join(directory, names[-1]), "w",
+                      encoding="utf-8", newline="") as file:
+                json.dump(self.deposit(ibans), file, indent=2)
+        return names
+
+    def write_transactions_file(self, file_path: str, count: int, ibans: list,
+                                lines: bool = False):
+        """writes a transactions file with count transactions as a json
+        array (the format of transactions.json) or one per line"""
+        with open(file_path, "w", encoding="utf-8", newline="") as file:
+            if lines:
+                for _ in range(count):
+                    file.write(json.dumps(self.transaction(ibans)) + "\n")
+                return
+            file.write("[")
+            for number in range(count):
+                file.write(("," if number else "") + "\n    " +
+                           json.dumps(self.transaction(ibans)))
+            file.write("\n]\n")
+
+    def write_transfers_store(self, file_path: str, count: int, ibans: list):
+        """writes a transfers store with count transfers"""
+        with open(file_path, "w", encoding="utf-8", newline="") as file:
+            for transfer in self.transfers(count, ibans):
+                file.write(json.dumps(TransferRequest(
+                    from_iban=transfer["from_iban"],
+                    to_iban=transfer["to_iban"],
+                    transfer_concept=transfer["concept"],
+                    transfer_type=transfer["transfer_type"],
+                    transfer_date=transfer["date"],
+                    transfer_amount=transfer["amount"]).to_json()) + "\n")
+
+    def write_deposits_store(self, file_path: str, count: int, ibans: list):
+        """writes a deposits store with count deposits"""
+        with open(file_path, "w", encoding="utf-8", newline="") as file:
+            for _ in range(count):
+                deposit = self.deposit(ibans)
+                file.write(json.dumps(AccountDeposit(
+                    to_iban=deposit["IBAN"],
+                    deposit_amount=float(deposit["AMOUNT"][4:])).to_json()) + "\n")
@@ -0,0 +1,213 @@
+"""MODULE: transactions_file. Contains the transactions file reader class"""
+import codecs
+import json
+import os
+import re
+from uc3m_money.account_management_exception import AccountManagementException
+from uc3m_money.metrics import METRICS
+
+BLANKS = re.compile(r"[ \t\n\r]*")
+CHUNK_SIZE = 1 << 20
+
+
+class TransactionsFile:
+    """Streaming reader of the transactions file. The file can be a json
+    array of records or have one record per line; it is parsed in chunks
+    so the memory used does not depend on the size of the file, and the
+    reading can be resumed after the last record already processed. With
+    a cache (a StoreCache) the records read are kept in it while the
+    file does not change, files larger than the cache are streamed"""
+    def __init__(self, file_path: str, chunk_size: int = CHUNK_SIZE, cache=None):
+        self.__file_path = file_path
+        self.__chunk_size = chunk_size
+        self.__cache = cache
+
+    @property
+    def file_path(self):
+        """Path of the transactions file"""
+        return self.__file_path
+
+    def stat(self):
+        """returns the os.stat of the file"""
+        try:
+            return os.stat(self.__file_path)
+        except FileNotFoundError as ex:
+            raise AccountManagementException("Wrong file  or file path") from ex
+
+    def read_bytes(self, offset: int, size: int):
+        """returns size bytes of the file starting at offset"""
+        try:
+            with open(self.__file_path, "rb") as file:
+                file.seek(max(0, offset))
+                return file.read(size)
+        except FileNotFoundError as ex:
+            raise AccountManagementException("Wrong file  or file path") from ex
+
+    def read(self):
+        """generator that yields the transactions one by one"""
+        for record, _ in self.read_from(0):
+            yield record
+
+    def read_from(self, offset: int = 0):
+        """generator that yields the records placed after the byte offset
+        (0 or the end of a record already read) together with the byte
+        offset where each record ends"""
+        try:
+            file = open(self.__file_path, "rb")  # pylint: disable=consider-using-with
+        except FileNotFoundError as ex:
+            raise AccountManagementException("Wrong file  or file path") from ex
+        with file:
+            if self.__cache is None:
+                yield from self.__parse(file, offset)
+            else:
+                yield from self.__cache.read(self.__file_path, file, offset, self.__parse)
+
+    def __parse(self, file, offset):
+        """records of the file after the byte offset"""
+        lines_format = _first_char(file) == "{"
+        file.seek(offset)
+        stream = _TextStream(file, offset, self.__chunk_size)
+        if lines_format:
+            records = self.__read_lines(stream)
+        else:
+            records = self.__read_array(stream, offset == 0)
+        if METRICS.enabled:
+            records = self.__counted(records, offset)
+        return records
+
+    @staticmethod
+    def __counted(records, offset):
+        """counts the records and the bytes read in the metrics"""
+        end = offset
+        count = 0
+        try:
+            for record, end in records:
+                count += 1
+                yield record, end
+        finally:
+            METRICS.count("records_scanned", count)
+            METRICS.count("bytes_read", end - offset)
+
+    @staticmethod
+    def __read_lines(stream):
+        """records separated by new lines"""
+        while stream.skip_blanks():
+            yield stream.decode()
+
+    @staticmethod
+    def __read_array(stream, at_start):
+        """records inside a json array"""
+        if at_start:
+            stream.skip_blanks()
+            stream.expect("[")
+            if stream.skip_blanks() == "]":
+                stream.expect_end()
+                return
+        elif stream.skip_blanks() == "]":
+            stream.expect_end()
+            return
+        else:
+            stream.expect(",")
+        while True:
+            stream.skip_blanks()
+            yield stream.decode()
+            if stream.skip_blanks() == "]":
+                stream.expect_end()
+                return
+            stream.expect(",")
+
+
+def _first_char(file):
+    """returns the first non blank character of the file"""
+    while True:
+        block = file.read(4096)
+        if not block:
+            return ""
+        block = block.lstrip()
+        if block:
+            return chr(block[0])
+
+
+#pylint: disable=too-many-instance-attributes
+class _TextStream:
+    """Window of decoded text over a binary file that knows the byte
+    offset of every value it returns"""
+    def __init__(self, file, offset, chunk_size):
+        self.__file = file
+        self.__chunk_size = chunk_size
+        self.__decoder = codecs.getincrementaldecoder("utf-8")()
+        self.__json = json.JSONDecoder()
+        self.__text = ""
+        self.__ascii = True
+        self.__position = 0
+        # byte offset of the character at __mark
+        self.__mark = 0
+        self.__mark_offset = offset
+        self.__eof = False
+
+    def __fill(self):
+        """drops the text already consumed and reads another chunk"""
+        if self.__eof:
+            return False
+        self.__byte_offset(self.__position)
+        chunk = self.__file.read(self.__chunk_size)
+        self.__eof = not chunk
+        try:
+            text = self.__decoder.decode(chunk, final=self.__eof)
+        except UnicodeDecodeError as ex:
+            raise AccountManagementException("JSON Decode Error - Wrong JSON Format") from ex
+        self.__text = self.__text[self.__position:] + text
+        self.__ascii = self.__text.isascii()
+        self.__position = 0
+        self.__mark = 0
+        return not self.__eof
+
+    def __byte_offset(self, position):
+        """returns the byte offset of the character at position"""
+        if self.__ascii:
+            self.__mark_offset += position - self.__mark
+        else:
+            self.__mark_offset += len(self.__text[self.__mark:position].encode("utf-8"))
+        self.__mark = position
+        return self.__mark_offset
+
+    def skip_blanks(self):
+        """moves to the next non blank character and returns it
+        ("" at the end of the file)"""
+        while True:
+            text = self.__text
+            position = BLANKS.match(text, self.__position).end()
+            self.__position = position
+            if position < len(text):
+                return text[position]
+            if not self.__fill():
+                return ""
+
+    def expect(self, token):
+        """consumes token or raises the decode error"""
+        if self.skip_blanks() != token:
+            raise AccountManagementException("JSON Decode Error - Wrong JSON Format")
+        self.__position += 1
+
+    def expect_end(self):
+        """consumes the closing bracket, only blanks can follow it"""
+        self.expect("]")
+        if self.skip_blanks():
+            raise AccountManagementException("JSON Decode Error - Wrong JSON Format")
+
+    def decode(self):
+        """decodes the json value at the current position and returns it
+        with the byte offset where it ends"""
+        while True:
+            try:
+                value, end = self.__json.raw_decode(self.__text, self.__position)
+            except json.JSONDecodeError as ex:
+                # the value may continue in the next chunk
+                if self.__fill():
+                    continue
+                raise AccountManagementException(
+                    "JSON Decode Error - Wrong JSON Format") from ex
+            if end == len(self.__text) and self.__fill():
+                continue
+            self.__position = end
+            return value, self.__byte_offset(end)
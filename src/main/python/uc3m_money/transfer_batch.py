@@ -0,0 +1,147 @@
+"""MODULE: transfer_batch. Contains the batch transfers command
+
+Usage: uc3m-transfers INPUT.csv [--output RESULTS.csv] [--chunk-size N]
+           [--json-files-path PATH] [--backend json|sharded|sqlite]
+           [--shards N] [--database FILE]
+"""
+import argparse
+import csv
+import sys
+import time
+from contextlib import nullcontext
+from uc3m_money.account_management_exception import AccountManagementException
+
+CHUNK_ROWS = 10000
+DELIMITER = ";"
+RESULT_COLUMN = "RESULT"
+# argument of transfer_request: column of the csv
+COLUMNS = {"from_iban": "From_iban",
+           "to_iban": "to_iban",
+           "concept": "concept",
+           "transfer_type": "type",
+           "date": "date",
+           "amount": "amount"}
+
+
+class TransferBatch:
+    """Streams a csv of transfers with the columns of
+    test_cases_2025_method1.csv through transfer_requests_bulk in chunks
+    of chunk_size rows, so the memory used does not depend on the size
+    of the file. Every row is written back with the transfer code or the
+    error message in the RESULT column"""
+    def __init__(self, manager, chunk_size: int = CHUNK_ROWS):
+        self.__manager = manager
+        self.__chunk_size = max(1, chunk_size)
+
+    def run(self, input_file, output_file) -> dict:
+        """processes the rows of the input file object and writes the
+        results; returns the number of rows, stored and rejected
+        transfers and the seconds it took"""
+        start = time.perf_counter()
+        reader = csv.DictReader(input_file, delimiter=DELIMITER)
+        fieldnames = list(reader.fieldnames or [])
+        if any(column not in fieldnames for column in COLUMNS.values()):
+            raise AccountManagementException("Invalid transfer data")
+        if RESULT_COLUMN not in fieldnames:
+            fieldnames.append(RESULT_COLUMN)
+        writer = csv.DictWriter(output_file, fieldnames, delimiter=DELIMITER,
+                                extrasaction="ignore", lineterminator="\n")
+        writer.writeheader()
+        stats = {"rows": 0, "stored": 0, "rejected": 0}
+        chunk = []
+        for row in reader:
+            chunk.append(row)
+            if len(chunk) == self.__chunk_size:
+                self.__process(chunk, writer, stats)
+                chunk = []
+        if chunk:
+            self.__process(chunk, writer, stats)
+        stats["seconds"] = time.perf_counter() - start
+        return stats
+
+    def __process(self, rows, writer, stats):
+        """stores a chunk of transfers and writes their results"""
+        results = self.__manager.transfer_requests_bulk([self.transfer(row) for row in rows])
+        for row, result in zip(rows, results):
+            if isinstance(result, AccountManagementException):
+                row[RESULT_COLUMN] = result.message
+                stats["rejected"] += 1
+            else:
+                row[RESULT_COLUMN] = result
+                stats["stored"] += 1
+        writer.writerows(rows)
+        stats["rows"] += len(rows)
+
+    @staticmethod
+    def transfer(row: dict) -> dict:
+        """arguments of transfer_request of a row (the missing values are
+        left out, so the row is rejected as invalid transfer data)"""
+        transfer = {argument: row[column] for argument, column in COLUMNS.items()
+                    if row.get(column) is not None}
+        try:
+            transfer["amount"] = float(transfer["amount"])
+        except (KeyError, ValueError):
+            pass
+        return transfer
+
+
+def create_backend(args):
+    """backend chosen in the command line (its module is imported only
+    when it is used), None for the json files"""
+    # pylint: disable=import-outside-toplevel
+    if args.backend == "sqlite":
+        from uc3m_money.sqlite_storage_backend import SqliteStorageBackend
+        return SqliteStorageBackend(args.database)
+    if args.backend == "sharded":
+        from uc3m_money.sharded_storage_backend import ShardedStorageBackend
+        return ShardedStorageBackend(args.json_files_path, args.shards)
+    return None
+
+
+def main(argv=None):
+    """command line entry of the batch transfers"""
+    parser = argparse.ArgumentParser(description="Stores the transfers of a csv file")
+    parser.add_argument("input", help="csv file (- for the standard input)")
+    parser.add_argument("--output", default="-", help="results csv file (- for the "
+                                                      "standard output)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--json-files-path", default=None)
+    parser.add_argument("--backend", choices=("json", "sharded", "sqlite"), default="json")
+    parser.add_argument("--shards", type=int, default=None)
+    parser.add_argument("--database", default=":memory:")
+    args = parser.parse_args(argv)
+
+    # the manager is imported after parsing, so --help does not load it
+    # pylint: disable=import-outside-toplevel
+    from uc3m_money.account_manager import AccountManager
+    try:
+        backend = create_backend(args)
+        manager = AccountManager(args.json_files_path, backend)
+        try:
+            with _open(args.input, sys.stdin, "r") as input_file, \
+                    _open(args.output, sys.stdout, "w") as output_file:
+                stats = TransferBatch(manager, args.chunk_size).run(input_file, output_file)
+        finally:
+            manager.close()
+            manager.backend.close()
+    except FileNotFoundError:
+        print("Error: file input not found", file=sys.stderr)
+        return 1
+    except AccountManagementException as ex:
+        print(ex.message, file=sys.stderr)
+        return 1
+    rate = stats["rows"] / stats["seconds"] if stats["seconds"] else 0.0
+    print(f"{stats['rows']} transfers ({stats['stored']} stored, {stats['rejected']} "
+          f"rejected) in {stats['seconds']:.3f} s: {rate:.1f} transfers/s", file=sys.stderr)
+    return 0
+
+
+def _open(path, standard_stream, mode):
+    """opens the csv file, or the standard stream for -"""
+    if path == "-":
+        return nullcontext(standard_stream)
+    return open(path, mode, encoding="utf-8", newline="")  # pylint: disable=consider-using-with
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""MODULE: transfer_index. Contains the duplicated transfers index class"""
+import hashlib
+import json
+import os
+from uc3m_money.json_lines_store import JsonLinesStore
+from uc3m_money.json_codec import JSON_CODEC
+
+
+def transfer_key(transfer) -> str:
+    """returns the key used for detecting duplicated transfers.
+    transfer is a stored transfer record or a TransferRequest"""
+    if isinstance(transfer, dict):
+        fields = [transfer["from_iban"], transfer["to_iban"], transfer["transfer_date"],
+                  transfer["transfer_amount"], transfer["transfer_concept"],
+                  transfer["transfer_type"]]
+    else:
+        fields = [transfer.from_iban, transfer.to_iban, transfer.transfer_date,
+                  transfer.transfer_amount, transfer.transfer_concept,
+                  transfer.transfer_type]
+    # 10 and 10.0 are the same amount for the duplicate check
+    if isinstance(fields[3], (int, float)) and not isinstance(fields[3], bool):
+        fields[3] = float(fields[3])
+    return hashlib.md5(json.dumps(fields).encode()).hexdigest()
+
+
+class TransferIndex:
+    """Persistent hash index of the keys of the transfers in the store.
+    Every line of the index file has a key and the size of the store
+    after the transfer was appended, so the index knows which part of
+    the store it covers and can catch up or be rebuilt from it"""
+    def __init__(self, store: JsonLinesStore, index_file: str):
+        self.__store = store
+        self.__index_file = index_file
+        self.__keys = None
+        self.__checkpoint = 0
+        self.__last_key = None
+
+    def contains(self, transfer) -> bool:
+        """returns True if the transfer is already in the store"""
+        self.sync()
+        return transfer_key(transfer) in self.__keys
+
+    def sync(self):
+        """loads the index and folds into it the transfers appended to
+        the store since the last checkpoint (called after each insert)"""
+        if self.__keys is None:
+            self.__load()
+        if self.__store.migrate():
+            self.rebuild()
+            return
+        store_size = self.__store.size()
+        if store_size < self.__checkpoint or not self.__covers_store():
+            self.rebuild()
+        elif store_size > self.__checkpoint:
+            entries = []
+            for record, offset in self.__store.read_from(self.__checkpoint):
+                entries.append(self.__index_record(record, offset))
+            self.__write_entries(entries, "a")
+
+    def rebuild(self):
+        """rebuilds the whole index from the transfers store"""
+        self.__keys = set()
+        self.__checkpoint = 0
+        self.__last_key = None
+        entries = []
+        for record, offset in self.__store.read_from(0):
+            entries.append(self.__index_record(record, offset))
+        self.__write_entries(entries, "w")
+
+    def __index_record(self, record, offset):
+        """adds the key of a stored record and returns its index entry"""
+        key = transfer_key(record)
+        self.__keys.add(key)
+        self.__checkpoint = offset
+        self.__last_key = key
+        return {"key": key, "offset": offset}
+
+    def __covers_store(self):
+        """checks that the last indexed transfer is still in the store at
+        the checkpoint, so a store replaced by another file is detected"""
+        if self.__checkpoint == 0:
+            return True
+        record = self.__store.record_ending_at(self.__checkpoint)
+        return record is not None and transfer_key(record) == self.__last_key
+
+    def __load(self):
+        """reads the keys saved in the index file"""
+        self.__keys = set()
+        self.__checkpoint = 0
+        try:
+            with open(self.__index_file, "r", encoding="utf-8", newline="") as file:
+                for line in file:
+                    entry = JSON_CODEC.loads(line)
+                    self.__keys.add(entry["key"])
+                    if entry["offset"] >= self.__checkpoint:
+                        self.__checkpoint = entry["offset"]
+                        self.__last_key = entry["key"]
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, KeyError):
+            # the index only holds derived data, a damaged one is rebuilt
+            self.rebuild()
+
+    def __write_entries(self, entries, mode):
+        """writes the index entries, truncating the file in "w" mode"""
+        if not entries and mode == "a":
+            return
+        data = b"".join(JSON_CODEC.dumps(entry) + b"\n" for entry in entries)
+        if mode == "a":
+            with open(self.__index_file, "ab") as file:
+                file.write(data)
+        else:
+            temp_path = self.__index_file + ".rebuilding"
+            with open(temp_path, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, self.__index_file)
@@ -3,8 +3,13 @@ import hashlib
 import json
 from datetime import datetime, timezone
 
+#pylint: disable=too-many-instance-attributes
 class TransferRequest:
-    """Class representing a transfer request"""
+    """Class representing a transfer request. The transfer code is
+    calculated once and calculated again only if a field is changed"""
+    __slots__ = ("__from_iban", "__to_iban", "__transfer_type", "__concept",
+                 "__transfer_date", "__transfer_amount", "__time_stamp", "__code")
+
     #pylint: disable=too-many-arguments
     def __init__(self,
                  from_iban: str,
@@ -21,9 +26,20 @@ class TransferRequest:
         self.__transfer_amount = transfer_amount
         justnow = datetime.now(timezone.utc)
         self.__time_stamp = datetime.timestamp(justnow)
+        self.__code = None
 
     def __str__(self):
-        return "Transfer:" + json.dumps(self.__dict__)
+        # the same text as the json of the __dict__ of the class before __slots__
+        return "Transfer:" + json.dumps({"_TransferRequest__from_iban": self.__from_iban,
+                                         "_TransferRequest__to_iban": self.__to_iban,
+                                         "_TransferRequest__transfer_type":
+                                             self.__transfer_type,
+                                         "_TransferRequest__concept": self.__concept,
+                                         "_TransferRequest__transfer_date":
+                                             self.__transfer_date,
+                                         "_TransferRequest__transfer_amount":
+                                             self.__transfer_amount,
+                                         "_TransferRequest__time_stamp": self.__time_stamp})
 
     def to_json(self):
         """returns the object information in json format"""
@@ -45,6 +61,7 @@ class TransferRequest:
     @from_iban.setter
     def from_iban(self, value):
         self.__from_iban = value
+        self.__code = None
 
     @property
     def to_iban(self):
@@ -54,6 +71,7 @@ class TransferRequest:
     @to_iban.setter
     def to_iban(self, value):
         self.__to_iban = value
+        self.__code = None
 
     @property
     def transfer_type(self):
@@ -62,6 +80,7 @@ class TransferRequest:
     @transfer_type.setter
     def transfer_type(self, value):
         self.__transfer_type = value
+        self.__code = None
 
     @property
     def transfer_amount(self):
@@ -70,6 +89,7 @@ class TransferRequest:
     @transfer_amount.setter
     def transfer_amount(self, value):
         self.__transfer_amount = value
+        self.__code = None
 
     @property
     def transfer_concept(self):
@@ -78,6 +98,7 @@ class TransferRequest:
     @transfer_concept.setter
     def transfer_concept(self, value):
         self.__concept = value
+        self.__code = None
 
     @property
     def transfer_date( self ):
@@ -86,6 +107,7 @@ class TransferRequest:
     @transfer_date.setter
     def transfer_date( self, value ):
         self.__transfer_date = value
+        self.__code = None
 
     @property
     def time_stamp(self):
@@ -95,4 +117,6 @@ class TransferRequest:
     @property
     def transfer_code(self):
         """Returns the md5 signature (transfer code)"""
-        return hashlib.md5(str(self).encode()).hexdigest()
+        if self.__code is None:
+            self.__code = hashlib.md5(str(self).encode()).hexdigest()
+        return self.__code
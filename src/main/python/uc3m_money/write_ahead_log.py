@@ -0,0 +1,227 @@
+"""MODULE: write_ahead_log. Contains the write-ahead log of the json lines stores"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from uc3m_money.account_management_exception import AccountManagementException
+from uc3m_money.json_lines_store import JsonLinesStore
+from uc3m_money.json_codec import JSON_CODEC
+
+MAX_DELAY = 0.0
+MAX_BATCH = 1024
+CHECKPOINT_SIZE = 1 << 22
+
+
+#pylint: disable=too-many-instance-attributes
+class WriteAheadLog:
+    """Durable appends to json lines stores. The records are written to
+    the log and the log is fsynced before they are appended to the stores,
+    so after commit returns they survive a crash. Concurrent commits are
+    written as a group with a single fsync: the thread that gets the log
+    waits up to max_delay seconds (or until max_batch records are pending)
+    and writes every pending commit. At each checkpoint the stores are
+    fsynced and the log restarts with their sizes; recover truncates the
+    stores to those sizes and appends again the records of the log. A
+    store rewritten outside the log must be rewritten inside rewriting"""
+    #pylint: disable=too-many-arguments
+    def __init__(self, file_path: str, stores: list = (),
+                 max_delay: float = MAX_DELAY,
+                 max_batch: int = MAX_BATCH,
+                 checkpoint_size: int = CHECKPOINT_SIZE):
+        self.__file_path = file_path
+        self.__max_delay = max_delay
+        self.__max_batch = max_batch
+        self.__checkpoint_size = checkpoint_size
+        self.__stores = {store.file_path: store for store in stores}
+        self.__pending = []
+        self.__pending_records = 0
+        self.__tickets = 0
+        self.__committed = 0
+        self.__errors = {}
+        self.__condition = threading.Condition()
+        self.__write_lock = threading.Lock()
+        self.__file = None
+        with self.__write_lock:
+            self.__recover()
+
+    @property
+    def file_path(self):
+        """Path of the log file"""
+        return self.__file_path
+
+    def commit(self, store: JsonLinesStore, records):
+        """writes the records to the log and appends them to the store.
+        Returns when they are durable (or raises the error found)"""
+        records = list(records)
+        if not records:
+            return
+        with self.__condition:
+            self.__tickets += 1
+            ticket = self.__tickets
+            self.__pending.append((ticket, store, records))
+            self.__pending_records += len(records)
+            self.__condition.notify_all()
+        while True:
+            with self.__write_lock:
+                if self.__committed >= ticket:
+                    break
+                self.__write_group()
+        error = self.__errors.pop(ticket, None)
+        if error is not None:
+            raise error
+
+    def checkpoint(self):
+        """fsyncs the stores and restarts the log"""
+        with self.__write_lock:
+            self.__checkpoint()
+
+    @contextmanager
+    def rewriting(self):
+        """holds the log while a store is rewritten outside it, between
+        two checkpoints, so recover never appends the records of the log
+        again to a rewritten store"""
+        with self.__write_lock:
+            self.__checkpoint()
+            yield
+            self.__checkpoint()
+
+    def close(self):
+        """checkpoints and closes the log"""
+        with self.__write_lock:
+            if self.__file is not None:
+                self.__checkpoint()
+                self.__file.close()
+                self.__file = None
+
+    def __write_group(self):
+        """writes the pending commits with a single fsync and appends
+        them to their stores (called by the owner of the log)"""
+        group = self.__take_group()
+        try:
+            self.__register(store for _, store, _ in group)
+            lines = b"".join(JSON_CODEC.dumps({"seq": ticket, "store": store.file_path,
+                                               "records": records}) + b"\n"
+                             for ticket, store, records in group)
+            self.__file.write(lines)
+            self.__file.flush()
+            os.fsync(self.__file.fileno())
+        except (OSError, AccountManagementException) as ex:
+            for ticket, _, _ in group:
+                self.__errors[ticket] = ex
+            self.__committed = group[-1][0]
+            return
+        aborted = []
+        for ticket, store, records in group:
+            try:
+                store.append_all(records)
+            except (OSError, AccountManagementException) as ex:
+                self.__errors[ticket] = ex
+                aborted.append(ticket)
+        self.__committed = group[-1][0]
+        if aborted:
+            # the records of the log that could not be applied are not replayed
+            self.__file.write(b"".join(JSON_CODEC.dumps({"abort": ticket}) + b"\n"
+                                       for ticket in aborted))
+            self.__file.flush()
+            os.fsync(self.__file.fileno())
+        if self.__file.tell() >= self.__checkpoint_size:
+            self.__checkpoint()
+
+    def __take_group(self):
+        """waits up to max_delay for more commits and takes the pending ones"""
+        with self.__condition:
+            deadline = time.monotonic() + self.__max_delay
+            while self.__pending_records < self.__max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.__condition.wait(remaining)
+            group = []
+            records = 0
+            while self.__pending and (not group or records < self.__max_batch):
+                group.append(self.__pending.pop(0))
+                records += len(group[-1][2])
+            self.__pending_records -= records
+        return group
+
+    def __register(self, stores):
+        """adds the stores not written before to the checkpoint"""
+        new_stores = False
+        for store in stores:
+            if store.file_path not in self.__stores:
+                self.__stores[store.file_path] = store
+                new_stores = True
+        if new_stores:
+            self.__checkpoint()
+
+    def __checkpoint(self):
+        """fsyncs the stores and writes a new log with their sizes"""
+        sizes = {}
+        for file_path, store in self.__stores.items():
+            store.migrate()
+            sizes[file_path] = store.size()
+            if sizes[file_path]:
+                with open(file_path, "rb") as file:
+                    os.fsync(file.fileno())
+        if self.__file is not None:
+            self.__file.close()
+        temp_path = self.__file_path + ".checkpoint"
+        with open(temp_path, "wb") as file:
+            file.write(JSON_CODEC.dumps({"checkpoint": sizes}) + b"\n")
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.__file_path)
+        self.__fsync_directory()
+        self.__file = open(self.__file_path, "ab")  # pylint: disable=consider-using-with
+
+    def __recover(self):
+        """repeats the appends of the log after the last checkpoint"""
+        sizes, entries = self.__read_log()
+        for file_path, size in sizes.items():
+            self.__stores.setdefault(file_path, JsonLinesStore(file_path))
+            if os.path.exists(file_path) and os.path.getsize(file_path) > size:
+                os.truncate(file_path, size)
+        for file_path, records in entries:
+            store = self.__stores.setdefault(file_path, JsonLinesStore(file_path))
+            store.append_all(records)
+        self.__checkpoint()
+
+    def __read_log(self):
+        """returns the sizes of the checkpoint and the records
+        of the commits of the log that were not aborted"""
+        try:
+            with open(self.__file_path, "rb") as file:
+                lines = file.read().splitlines(keepends=True)
+        except FileNotFoundError:
+            return {}, []
+        sizes = {}
+        entries = {}
+        for number, line in enumerate(lines):
+            try:
+                entry = JSON_CODEC.loads(line)
+            except json.JSONDecodeError as ex:
+                if number == len(lines) - 1 and not line.endswith(b"\n"):
+                    # the last write did not finish, it was never committed
+                    break
+                raise AccountManagementException("JSON Decode Error - Wrong JSON Format") from ex
+            if "checkpoint" in entry:
+                sizes = entry["checkpoint"]
+            elif "abort" in entry:
+                entries.pop(entry["abort"], None)
+            else:
+                entries[entry["seq"]] = (entry["store"], entry["records"])
+        return sizes, list(entries.values())
+
+    def __fsync_directory(self):
+        """makes the rename of the log durable"""
+        try:
+            directory = os.open(os.path.dirname(os.path.abspath(self.__file_path)), os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(directory)
+        except OSError:
+            pass
+        finally:
+            os.close(directory)
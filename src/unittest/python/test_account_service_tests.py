@@ -0,0 +1,114 @@
+"""Tests for the account manager service and its client"""
+import os.path
+import shutil
+import socket
+import tempfile
+import threading
+from unittest import TestCase
+from unittest.mock import patch
+from freezegun import freeze_time
+from uc3m_money import (TRANSACTIONS_STORE_FILE,
+                        JSON_FILES_DEPOSITS,
+                        AccountManager,
+                        AccountManagementException,
+                        AccountService,
+                        AccountServiceClient,
+                        JsonLinesStore)
+from uc3m_money.account_service import main
+
+TRANSFER = {"from_iban": "ES6211110783482828975098",
+            "to_iban": "ES8658342044541216872704",
+            "concept": "Service transfer test",
+            "transfer_type": "ORDINARY",
+            "date": "01/07/2025",
+            "amount": 100.0}
+
+
+@freeze_time("2025/03/26 14:00:00")
+class TestAccountService(TestCase):
+    """Account service tests class"""
+    def setUp(self):
+        """ creates the directory used by the tests """
+        self.json_files_path = tempfile.mkdtemp()
+        shutil.copy(TRANSACTIONS_STORE_FILE, self.json_files_path)
+
+    def tearDown(self):
+        """ removes the directory used by the tests """
+        shutil.rmtree(self.json_files_path)
+
+    def addresses(self):
+        """ localhost HTTP and Unix domain socket addresses """
+        return {"tcp": ("127.0.0.1", 0),
+                "unix": os.path.join(self.json_files_path, "service.sock")}
+
+    def test_operations(self):
+        """the operations return the results of the manager"""
+        expected = AccountManager(tempfile.mkdtemp(dir=self.json_files_path)) \
+            .transfer_request(**TRANSFER)
+        for name, address in self.addresses().items():
+            with self.subTest(name), \
+                    AccountService(AccountManager(tempfile.mkdtemp(dir=self.json_files_path)),
+                                   address) as service, \
+                    AccountServiceClient(service.address) as client:
+                self.assertEqual(expected, client.transfer_request(**TRANSFER))
+                with self.assertRaises(AccountManagementException) as c_m:
+                    client.transfer_request(**TRANSFER)
+                self.assertEqual("Duplicated transfer in transfer list", c_m.exception.message)
+                signature = client.deposit_into_account(JSON_FILES_DEPOSITS + "case_ok.json")
+                self.assertEqual(signature,
+                                 client.deposit_into_account(JSON_FILES_DEPOSITS
+                                                             + "case_ok.json"))
+
+    def test_balance_and_errors(self):
+        """the errors of the manager are raised by the client"""
+        with AccountService(AccountManager(self.json_files_path),
+                            self.addresses()["unix"]) as service, \
+                AccountServiceClient(service.address) as client:
+            self.assertTrue(client.calculate_balance("ES3559005439021242088295"))
+            with self.assertRaises(AccountManagementException) as c_m:
+                client.calculate_balance("ES0000000000000000000000")
+            self.assertEqual("Invalid IBAN control digit", c_m.exception.message)
+            with self.assertRaises(AccountManagementException) as c_m:
+                client.deposit_into_account(os.path.join(self.json_files_path, "none.json"))
+            self.assertEqual("Error: file input not found", c_m.exception.message)
+            with self.assertRaises(AccountManagementException) as c_m:
+                client.deposit_into_account(0)
+            self.assertEqual("Invalid request data", c_m.exception.message)
+            with self.assertRaises(AccountManagementException) as c_m:
+                client.deposit_into_account(self.json_files_path)
+            self.assertEqual("Error: file input cannot be read", c_m.exception.message)
+            with patch.object(service.manager, "calculate_balance", side_effect=ValueError):
+                with self.assertRaises(AccountManagementException) as c_m:
+                    client.calculate_balance("ES3559005439021242088295")
+            self.assertEqual("Internal service error", c_m.exception.message)
+            self.assertIn("# TYPE uc3m_money_phase_seconds histogram", client.metrics())
+        self.assertFalse(os.path.exists(self.addresses()["unix"]))
+
+    def test_concurrent_clients(self):
+        """the writes of concurrent clients are all stored once"""
+        results = {}
+        with AccountService(AccountManager(self.json_files_path),
+                            self.addresses()["tcp"]) as service:
+            def send(number):
+                with AccountServiceClient(service.address) as client:
+                    results[number] = client.transfer_request(
+                        **dict(TRANSFER, concept="Service transfer " + "abcdefghijklmnop"[number]))
+            threads = [threading.Thread(target=send, args=(k,)) for k in range(16)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(16, len(set(results.values())))
+        stored = JsonLinesStore(os.path.join(self.json_files_path, "transfers_store.json"))
+        self.assertEqual(sorted(results.values()),
+                         sorted(k["transfer_code"] for k in stored.read()))
+
+    def test_address_in_use(self):
+        """the command fails and closes the manager if it cannot bind"""
+        with socket.socket() as taken:
+            taken.bind(("127.0.0.1", 0))
+            taken.listen()
+            with patch.object(AccountManager, "close", autospec=True) as close:
+                self.assertEqual(1, main(["--port", str(taken.getsockname()[1]),
+                                          "--json-files-path", self.json_files_path]))
+        self.assertEqual(1, close.call_count)
@@ -0,0 +1,80 @@
+"""Tests for the asyncio account manager"""
+import asyncio
+import os.path
+import shutil
+import tempfile
+import threading
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+from uc3m_money import (JSON_FILES_DEPOSITS,
+                        TRANSACTIONS_STORE_FILE,
+                        AccountManagementException,
+                        AsyncAccountManager,
+                        JsonLinesStore,
+                        SyntheticDataGenerator)
+
+
+class TestAsyncAccountManager(IsolatedAsyncioTestCase):
+    """Async account manager tests class"""
+    def setUp(self):
+        """ creates the directory used by the tests """
+        self.json_files_path = tempfile.mkdtemp()
+        shutil.copy(TRANSACTIONS_STORE_FILE, self.json_files_path)
+        generator = SyntheticDataGenerator(seed=5)
+        self.transfers = list(generator.transfers(300, generator.ibans(20)))
+
+    def tearDown(self):
+        """ removes the directory used by the tests """
+        shutil.rmtree(self.json_files_path)
+
+    def read_store(self, file_name):
+        """ records of a store of the test directory """
+        return list(JsonLinesStore(os.path.join(self.json_files_path, file_name)).read())
+
+    async def test_concurrent_transfers(self):
+        """concurrent transfers are stored once each, in few writes"""
+        async with AsyncAccountManager(self.json_files_path) as mngr:
+            with patch.object(mngr.manager.backend, "add_transfers",
+                              wraps=mngr.manager.backend.add_transfers) as add_transfers:
+                codes = await asyncio.gather(*(mngr.transfer_request(**k)
+                                               for k in self.transfers + self.transfers[:10]),
+                                             return_exceptions=True)
+        self.assertEqual([k["transfer_code"] for k in self.read_store("transfers_store.json")],
+                         codes[:300])
+        self.assertEqual(["Duplicated transfer in transfer list"] * 10,
+                         [k.message for k in codes[300:]])
+        self.assertLess(add_transfers.call_count, 300)
+
+    async def test_deposit_and_balance(self):
+        """deposits and balances run on the pool"""
+        async with AsyncAccountManager(self.json_files_path) as mngr:
+            signature = await mngr.deposit_into_account(
+                os.path.join(JSON_FILES_DEPOSITS, "case_ok.json"))
+            self.assertTrue(await mngr.calculate_balance("ES3559005439021242088295"))
+            with self.assertRaises(AccountManagementException) as cm:
+                await mngr.transfer_request(**dict(self.transfers[0], concept="short"))
+            self.assertEqual("Invalid concept format", cm.exception.message)
+        self.assertEqual([signature], [k["deposit_signature"]
+                                       for k in self.read_store("deposits_store.json")])
+        self.assertEqual(9268.29, self.read_store("balances.json")[0]["BALANCE"])
+
+    async def test_timeout_cancels_queued_transfer(self):
+        """a transfer cancelled by its timeout before being taken is not stored"""
+        release = threading.Event()
+        async with AsyncAccountManager(self.json_files_path) as mngr:
+            backend = mngr.manager.backend
+            add_transfers = backend.add_transfers
+
+            def slow_add_transfers(records):
+                release.wait(5)
+                add_transfers(records)
+
+            with patch.object(backend, "add_transfers", side_effect=slow_add_transfers):
+                first = asyncio.ensure_future(mngr.transfer_request(**self.transfers[0]))
+                await asyncio.sleep(0.05)
+                with self.assertRaises(asyncio.TimeoutError):
+                    await mngr.transfer_request(**self.transfers[1], timeout=0.05)
+                release.set()
+                code = await first
+        self.assertEqual([code], [k["transfer_code"]
+                                  for k in self.read_store("transfers_store.json")])
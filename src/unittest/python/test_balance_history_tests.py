@@ -0,0 +1,98 @@
+"""Tests for the balance history"""
+import os.path
+import shutil
+import tempfile
+from unittest import TestCase
+from freezegun import freeze_time
+from uc3m_money import (TRANSACTIONS_STORE_FILE,
+                        AccountManager,
+                        AccountManagementException,
+                        BalanceHistory,
+                        JsonLinesStore,
+                        SqliteStorageBackend)
+
+IBAN = "ES3559005439021242088295"
+OTHER_IBAN = "ES8658342044541216872704"
+
+
+class TestBalanceHistory(TestCase):
+    """Balance history tests class"""
+    def setUp(self):
+        """ creates the directory used by the tests """
+        self.json_files_path = tempfile.mkdtemp()
+        shutil.copy(TRANSACTIONS_STORE_FILE, self.json_files_path)
+        self.store = JsonLinesStore(os.path.join(self.json_files_path, "balances.json"))
+        self.store.append_all([{"IBAN": IBAN, "time": 30.0, "BALANCE": 3.0},
+                               {"IBAN": OTHER_IBAN, "time": 5.0, "BALANCE": -1.0},
+                               {"IBAN": IBAN, "time": 10.0, "BALANCE": 1.0},
+                               {"IBAN": IBAN, "time": 20.0, "BALANCE": 2.0}])
+        self.history = BalanceHistory(self.store)
+
+    def tearDown(self):
+        """ removes the directory used by the tests """
+        shutil.rmtree(self.json_files_path)
+
+    def test_queries(self):
+        """the snapshots are sorted by time even if stored out of order"""
+        self.assertEqual(3.0, self.history.latest(IBAN)["BALANCE"])
+        self.assertEqual(2.0, self.history.as_of(IBAN, 25.0)["BALANCE"])
+        self.assertEqual(1.0, self.history.as_of(IBAN, 10.0)["BALANCE"])
+        self.assertIsNone(self.history.as_of(IBAN, 9.9))
+        self.assertEqual([1.0, 2.0], [k["BALANCE"] for k in self.history.between(IBAN, 10, 20)])
+        self.assertIsNone(self.history.latest("ES0000000000000000000000"))
+
+    def test_appended_and_replaced_store(self):
+        """the history follows the store"""
+        self.history.latest(IBAN)
+        self.store.append({"IBAN": IBAN, "time": 40.0, "BALANCE": 4.0})
+        self.assertEqual(4.0, self.history.latest(IBAN)["BALANCE"])
+        os.remove(self.store.file_path)
+        self.store.append({"IBAN": IBAN, "time": 1.0, "BALANCE": 0.5})
+        self.assertEqual(0.5, self.history.latest(IBAN)["BALANCE"])
+
+    def test_thin(self):
+        """old snapshots are thinned to one per period"""
+        self.assertEqual(1, self.history.thin(keep_seconds=15, interval_seconds=100, now=40))
+        self.assertEqual([{"IBAN": IBAN, "time": 30.0, "BALANCE": 3.0},
+                          {"IBAN": OTHER_IBAN, "time": 5.0, "BALANCE": -1.0},
+                          {"IBAN": IBAN, "time": 20.0, "BALANCE": 2.0}],
+                         list(self.store.read()))
+        self.assertEqual([2.0, 3.0], [k["BALANCE"] for k in self.history.between(IBAN, 0, 50)])
+
+    def test_thin_invalid_interval(self):
+        """a period of zero or negative seconds is rejected"""
+        for interval_seconds in (0, -100):
+            with self.subTest(interval_seconds):
+                with self.assertRaises(AccountManagementException) as cm:
+                    self.history.thin(keep_seconds=15, interval_seconds=interval_seconds, now=40)
+                self.assertEqual("Invalid thinning interval", cm.exception.message)
+                for backend in (None, SqliteStorageBackend(":memory:")):
+                    mngr = AccountManager(self.json_files_path, backend=backend)
+                    with self.assertRaises(AccountManagementException) as cm:
+                        mngr.thin_balance_history(15, interval_seconds)
+                    self.assertEqual("Invalid thinning interval", cm.exception.message)
+        self.assertEqual(4, len(list(self.store.read())))
+
+    def test_account_manager(self):
+        """calculate_balance snapshots are queried by time in both backends"""
+        for backend in (None, SqliteStorageBackend(":memory:")):
+            with self.subTest(backend):
+                os.remove(self.store.file_path)
+                mngr = AccountManager(self.json_files_path, backend=backend)
+                if backend is not None:
+                    backend.import_transactions_file(TRANSACTIONS_STORE_FILE)
+                for day in (1, 2, 3):
+                    with freeze_time(f"2025-03-0{day} 12:00:00"):
+                        mngr.calculate_balance(IBAN)
+                latest = mngr.latest_balance(IBAN)
+                self.assertEqual(1741003200.0, latest["time"])
+                self.assertEqual(9268.29, round(latest["BALANCE"], 2))
+                self.assertEqual(1740916800.0, mngr.balance_as_of(IBAN, 1741000000)["time"])
+                self.assertEqual(2, len(mngr.balance_history(IBAN, 1740830400, 1740916800)))
+                with self.assertRaises(AccountManagementException) as cm:
+                    mngr.balance_as_of(IBAN, 1740000000)
+                self.assertEqual("IBAN not found", cm.exception.message)
+                with freeze_time("2025-03-10 12:00:00"):
+                    self.assertEqual(2, mngr.thin_balance_history(3 * 86400, 30 * 86400))
+                self.assertEqual([1741003200.0],
+                                 [k["time"] for k in mngr.balance_history(IBAN, 0, 2e9)])
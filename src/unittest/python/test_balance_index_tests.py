@@ -0,0 +1,118 @@
+"""Tests for the per IBAN balance index"""
+import json
+import os.path
+from os import remove
+from unittest import TestCase
+from uc3m_money import (JSON_FILES_PATH,
+                        TRANSACTIONS_STORE_FILE,
+                        AccountManagementException,
+                        BalanceIndex,
+                        TransactionsFile)
+
+TRANSACTIONS_TEST_FILE = JSON_FILES_PATH + "transactions_index_test.json"
+INDEX_TEST_FILE = JSON_FILES_PATH + "balance_index_test.json"
+
+
+class TestBalanceIndex(TestCase):
+    """Balance index tests class"""
+    def setUp(self):
+        """ copies the transactions file used by the tests """
+        with open(TRANSACTIONS_STORE_FILE, "r", encoding="utf-8", newline="") as file:
+            self.transactions = json.load(file)
+        self.write_transactions(self.transactions)
+        if os.path.exists(INDEX_TEST_FILE):
+            remove(INDEX_TEST_FILE)
+
+    def tearDown(self):
+        """ removes the files used by the tests """
+        for file_name in (TRANSACTIONS_TEST_FILE, INDEX_TEST_FILE):
+            if os.path.exists(file_name):
+                remove(file_name)
+
+    @staticmethod
+    def write_transactions(transactions):
+        """writes the transactions test file"""
+        with open(TRANSACTIONS_TEST_FILE, "w", encoding="utf-8", newline="") as file:
+            json.dump(transactions, file, indent=4)
+
+    def full_scan(self, iban):
+        """balance calculated reading every transaction"""
+        balance = 0
+        for transaction in self.transactions:
+            if transaction["IBAN"] == iban:
+                balance += float(transaction["amount"])
+        return balance
+
+    def new_index(self):
+        """returns an index over the transactions test file"""
+        return BalanceIndex(TransactionsFile(TRANSACTIONS_TEST_FILE), INDEX_TEST_FILE)
+
+    def test_same_balance_as_full_scan(self):
+        """the index gives exactly the same balances as reading every transaction"""
+        index = self.new_index()
+        for iban in {k["IBAN"] for k in self.transactions}:
+            with self.subTest(iban):
+                self.assertEqual(self.full_scan(iban), index.balance(iban))
+        self.assertIsNone(index.balance("ES9420805801101234567891"))
+
+    def test_new_transactions_folded(self):
+        """transactions appended after the checkpoint are added by a new index"""
+        self.new_index().sync()
+        with open(INDEX_TEST_FILE, "r", encoding="utf-8", newline="") as file:
+            checkpoint = json.load(file)["checkpoint"]
+        self.transactions.append({"IBAN": "ES3559005439021242088295", "amount": "+10.00"})
+        self.transactions.append({"IBAN": "ES9420805801101234567891", "amount": "-5.00"})
+        self.write_transactions(self.transactions)
+        index = self.new_index()
+        self.assertEqual(self.full_scan("ES3559005439021242088295"),
+                         index.balance("ES3559005439021242088295"))
+        self.assertEqual(-5.0, index.balance("ES9420805801101234567891"))
+        with open(INDEX_TEST_FILE, "r", encoding="utf-8", newline="") as file:
+            self.assertGreater(json.load(file)["checkpoint"], checkpoint)
+
+    def test_unchanged_file_not_saved(self):
+        """the index is only written when new transactions are folded in"""
+        index = self.new_index()
+        index.sync()
+        remove(INDEX_TEST_FILE)
+        index.sync()
+        self.assertFalse(os.path.exists(INDEX_TEST_FILE))
+        self.transactions.append({"IBAN": "ES3559005439021242088295", "amount": "+10.00"})
+        self.write_transactions(self.transactions)
+        index.sync()
+        self.assertTrue(os.path.exists(INDEX_TEST_FILE))
+
+    def test_replaced_file_rebuilt(self):
+        """a different transactions file is not mixed with the old index"""
+        index = self.new_index()
+        index.sync()
+        self.transactions = self.transactions[1:]
+        self.write_transactions(self.transactions)
+        iban = self.transactions[0]["IBAN"]
+        self.assertEqual(self.full_scan(iban), index.balance(iban))
+
+    def test_changed_middle_rebuilt(self):
+        """a transaction changed in the middle of the file (same size, same
+        head and tail) is detected by the checksum of the checkpoint"""
+        index = self.new_index()
+        index.sync()
+        middle = self.transactions[len(self.transactions) // 2]
+        amount = middle["amount"]
+        middle["amount"] = amount[0] + ("1" if amount[1] != "1" else "2") + amount[2:]
+        self.write_transactions(self.transactions)
+        self.assertEqual(self.full_scan(middle["IBAN"]), self.new_index().balance(middle["IBAN"]))
+        self.assertEqual(self.full_scan(middle["IBAN"]), index.balance(middle["IBAN"]))
+
+    def test_wrong_file_keeps_index(self):
+        """a wrong transactions file raises an exception and the index is kept"""
+        index = self.new_index()
+        index.sync()
+        with open(INDEX_TEST_FILE, "r", encoding="utf-8", newline="") as file:
+            saved = file.read()
+        with open(TRANSACTIONS_TEST_FILE, "a", encoding="utf-8", newline="") as file:
+            file.write("Hello world!")
+        with self.assertRaises(AccountManagementException) as c_m:
+            index.sync()
+        self.assertEqual("JSON Decode Error - Wrong JSON Format", c_m.exception.message)
+        with open(INDEX_TEST_FILE, "r", encoding="utf-8", newline="") as file:
+            self.assertEqual(saved, file.read())
@@ -0,0 +1,79 @@
+"""Tests for calculate all balances"""
+import json
+import os.path
+import shutil
+import tempfile
+from unittest import TestCase
+from freezegun import freeze_time
+from uc3m_money import (TRANSACTIONS_STORE_FILE,
+                        AccountManager,
+                        AccountManagementException,
+                        TransactionsFile)
+from uc3m_money import balance_aggregator
+
+
+class TestCalculateAllBalances(TestCase):
+    """Calculate all balances tests class"""
+    def setUp(self):
+        """ creates the directory used by the tests """
+        self.json_files_path = tempfile.mkdtemp()
+        shutil.copy(TRANSACTIONS_STORE_FILE, self.json_files_path)
+
+    def tearDown(self):
+        """ removes the directory used by the tests """
+        shutil.rmtree(self.json_files_path)
+
+    def read_file(self):
+        """ this method read the balances store and return the value """
+        balances_file = os.path.join(self.json_files_path, "balances.json")
+        with open(balances_file, "r", encoding="utf-8", newline="") as file:
+            return [json.loads(line) for line in file if line.strip()]
+
+    @freeze_time("2025/03/26 14:00:00")
+    def test_calculate_all_balances(self):
+        """every iban of the transactions file is stored with a single call"""
+        mngr = AccountManager(self.json_files_path)
+        balances = mngr.calculate_all_balances()
+        self.assertEqual(9268.29, balances["ES3559005439021242088295"])
+        data = self.read_file()
+        self.assertEqual(balances, {k["IBAN"]: k["BALANCE"] for k in data})
+        self.assertEqual(len(balances), len(data))
+        for iban, balance in balances.items():
+            with self.subTest(iban):
+                mngr.calculate_balance(iban)
+                self.assertEqual(balance, self.read_file()[-1]["BALANCE"])
+
+    def test_file_order_sums(self):
+        """the amounts of each iban are added one by one in file order"""
+        transactions = TransactionsFile(TRANSACTIONS_STORE_FILE)
+        expected = {}
+        for transaction in transactions.read():
+            iban = transaction["IBAN"]
+            expected[iban] = expected.get(iban, 0) + float(transaction["amount"])
+        self.assertEqual(expected, balance_aggregator.aggregate_balances(transactions))
+
+    @freeze_time("2025/03/26 14:00:00")
+    def test_calculate_balances(self):
+        """invalid and unknown ibans get their exception, the others are stored"""
+        mngr = AccountManager(self.json_files_path)
+        results = mngr.calculate_balances(["ES3559005439021242088295",
+                                           "ES1559005439021242088295",
+                                           "ES9420805801101234567891"])
+        self.assertEqual(9268.29, results["ES3559005439021242088295"])
+        self.assertIsInstance(results["ES1559005439021242088295"],
+                              AccountManagementException)
+        self.assertEqual("Invalid IBAN control digit",
+                         results["ES1559005439021242088295"].message)
+        self.assertEqual("IBAN not found", results["ES9420805801101234567891"].message)
+        self.assertEqual([{"IBAN": "ES3559005439021242088295",
+                           "time": 1742997600.0,
+                           "BALANCE": 9268.29}], self.read_file())
+
+    def test_calculate_balances_not_str(self):
+        """an iban that is not a string is rejected"""
+        mngr = AccountManager(self.json_files_path)
+        for iban in (3559005439021242088295, None, ["ES3559005439021242088295"]):
+            with self.subTest(iban), self.assertRaises(AccountManagementException) as cm:
+                mngr.calculate_balances(["ES3559005439021242088295", iban])
+            self.assertEqual("Wrong IBAN", cm.exception.message)
+        self.assertFalse(os.path.exists(os.path.join(self.json_files_path, "balances.json")))
@@ -3,33 +3,39 @@
 import datetime
 from unittest import TestCase
 import os.path
-from os import remove
+import shutil
+import tempfile
 import json
 import hashlib
 from freezegun import freeze_time
-from uc3m_money import (BALANCES_STORE_FILE,
-                        AccountManager,
+from uc3m_money import (AccountManager,
                         TRANSACTIONS_STORE_FILE,
                         AccountManagementException,
                         JSON_FILES_PATH)
 
-NOMBRE_FICHERO_TEMPORAL = JSON_FILES_PATH + "swap.json"
 EMPTY_TRANSACTIONS_FILE = JSON_FILES_PATH + "transactions_empty_test.json"
 NO_JSON_TRANSACTIONS_FILE = JSON_FILES_PATH + "transactions_no_json_test.json"
 
 class TestCalculateBalance(TestCase):
     """Calculate balance tests class"""
     def setUp(self):
-        """ inicializo el entorno de prueba """
-        if os.path.exists(BALANCES_STORE_FILE):
-            remove(BALANCES_STORE_FILE)
-
-    @staticmethod
-    def read_file():
+        """ inicializo el entorno de prueba en un directorio temporal """
+        self.json_files_path = tempfile.mkdtemp()
+        self.balances_file = os.path.join(self.json_files_path, "balances.json")
+        self.transactions_file = shutil.copy(TRANSACTIONS_STORE_FILE, self.json_files_path)
+        self.swap_file = os.path.join(self.json_files_path, "swap.json")
+        self.empty_file = shutil.copy(EMPTY_TRANSACTIONS_FILE, self.json_files_path)
+        self.no_json_file = shutil.copy(NO_JSON_TRANSACTIONS_FILE, self.json_files_path)
+
+    def tearDown(self):
+        """ borra el directorio temporal """
+        shutil.rmtree(self.json_files_path)
+
+    def read_file(self):
         """ this method read a Json file and return the value """
         try:
-            with open(BALANCES_STORE_FILE, "r", encoding="utf-8", newline="") as file:
-                data = json.load(file)
+            with open(self.balances_file, "r", encoding="utf-8", newline="") as file:
+                data = [json.loads(line) for line in file if line.strip()]
         except FileNotFoundError as ex:
             raise AccountManagementException("Wrong file or file path") from ex
         except json.JSONDecodeError as ex:
@@ -39,7 +45,7 @@ class TestCalculateBalance(TestCase):
     @freeze_time("2025/03/26 14:00:00")
     def test_calculate_balance_1 (self):
         """path 1: all ok - entering the loop"""
-        mngr = AccountManager()
+        mngr = AccountManager(self.json_files_path)
         res = mngr.calculate_balance(iban="ES3559005439021242088295")
         self.assertTrue(res)
         data = self.read_file()
@@ -54,10 +60,10 @@ class TestCalculateBalance(TestCase):
 
     def test_file_wrong_iban_number(self):
         """path with wrong iban number (exception)"""
-        mngr = AccountManager()
+        mngr = AccountManager(self.json_files_path)
 
-        if os.path.isfile(BALANCES_STORE_FILE):
-            with open(BALANCES_STORE_FILE, "r", encoding="utf-8", newline="") as file_org:
+        if os.path.isfile(self.balances_file):
+            with open(self.balances_file, "r", encoding="utf-8", newline="") as file_org:
                 hash_original = hashlib.md5(str(file_org).encode()).hexdigest()
         else:
             hash_original = ""
@@ -66,8 +72,8 @@ class TestCalculateBalance(TestCase):
             mngr.calculate_balance("ES1559005439021242088295")
         self.assertEqual("Invalid IBAN control digit",cm_obj.exception.message)
 
-        if os.path.isfile(BALANCES_STORE_FILE):
-            with open(BALANCES_STORE_FILE, "r", encoding="utf-8", newline="") as file:
+        if os.path.isfile(self.balances_file):
+            with open(self.balances_file, "r", encoding="utf-8", newline="") as file:
                 hash_new = hashlib.md5(str(file).encode()).hexdigest()
         else:
             hash_new = ""
@@ -76,12 +82,12 @@ class TestCalculateBalance(TestCase):
     def test_file_not_found(self):
         """path with transactions file not found"""
         # rename the manipulated order's store
-        self.rename_file(TRANSACTIONS_STORE_FILE,NOMBRE_FICHERO_TEMPORAL )
-        mngr = AccountManager()
+        self.rename_file(self.transactions_file,self.swap_file )
+        mngr = AccountManager(self.json_files_path)
         res = False
         msg = ""
-        if os.path.isfile(BALANCES_STORE_FILE):
-            with open(BALANCES_STORE_FILE, "r", encoding="utf-8", newline="") as file_org:
+        if os.path.isfile(self.balances_file):
+            with open(self.balances_file, "r", encoding="utf-8", newline="") as file_org:
                 hash_original = hashlib.md5(str(file_org).encode()).hexdigest()
         else:
             hash_original = ""
@@ -96,11 +102,11 @@ class TestCalculateBalance(TestCase):
         except Exception as  ex:
             msg = str(ex)
 
-        self.rename_file(NOMBRE_FICHERO_TEMPORAL,TRANSACTIONS_STORE_FILE)
+        self.rename_file(self.swap_file,self.transactions_file)
         self.assertEqual(True,res,msg)
 
-        if os.path.isfile(BALANCES_STORE_FILE):
-            with open(BALANCES_STORE_FILE, "r", encoding="utf-8", newline="") as file:
+        if os.path.isfile(self.balances_file):
+            with open(self.balances_file, "r", encoding="utf-8", newline="") as file:
                 hash_new = hashlib.md5(str(file).encode()).hexdigest()
         else:
             hash_new = ""
@@ -109,13 +115,13 @@ class TestCalculateBalance(TestCase):
     def test_file_not_json(self):
         """path with transactions file without json format"""
         # rename the transactions file and setting a new empty transactions file
-        self.rename_file(TRANSACTIONS_STORE_FILE,NOMBRE_FICHERO_TEMPORAL )
-        self.rename_file(NO_JSON_TRANSACTIONS_FILE, TRANSACTIONS_STORE_FILE)
-        mngr = AccountManager()
+        self.rename_file(self.transactions_file,self.swap_file )
+        self.rename_file(self.no_json_file, self.transactions_file)
+        mngr = AccountManager(self.json_files_path)
         res = False
         msg = ""
-        if os.path.isfile(BALANCES_STORE_FILE):
-            with open(BALANCES_STORE_FILE, "r", encoding="utf-8", newline="") as file_org:
+        if os.path.isfile(self.balances_file):
+            with open(self.balances_file, "r", encoding="utf-8", newline="") as file_org:
                 hash_original = hashlib.md5(str(file_org).encode()).hexdigest()
         else:
             hash_original = ""
@@ -130,11 +136,11 @@ class TestCalculateBalance(TestCase):
             msg = str(ex)
 
         #renaming the files to the orignal state
-        self.rename_file(TRANSACTIONS_STORE_FILE, NO_JSON_TRANSACTIONS_FILE)
-        self.rename_file(NOMBRE_FICHERO_TEMPORAL,TRANSACTIONS_STORE_FILE)
+        self.rename_file(self.transactions_file, self.no_json_file)
+        self.rename_file(self.swap_file,self.transactions_file)
         self.assertEqual(True,res,msg)
-        if os.path.isfile(BALANCES_STORE_FILE):
-            with open(BALANCES_STORE_FILE, "r", encoding="utf-8", newline="") as file:
+        if os.path.isfile(self.balances_file):
+            with open(self.balances_file, "r", encoding="utf-8", newline="") as file:
                 hash_new = hashlib.md5(str(file).encode()).hexdigest()
         else:
             hash_new = ""
@@ -142,15 +148,15 @@ class TestCalculateBalance(TestCase):
 
     def test_file_skip_loop(self):
         """path skipping the loop (empty transactions file)"""
-        mngr = AccountManager()
+        mngr = AccountManager(self.json_files_path)
 
-        if os.path.isfile(BALANCES_STORE_FILE):
-            with open(BALANCES_STORE_FILE, "r", encoding="utf-8", newline="") as file_org:
+        if os.path.isfile(self.balances_file):
+            with open(self.balances_file, "r", encoding="utf-8", newline="") as file_org:
                 hash_original = hashlib.md5(str(file_org).encode()).hexdigest()
         else:
             hash_original = ""
-        self.rename_file(TRANSACTIONS_STORE_FILE,NOMBRE_FICHERO_TEMPORAL )
-        self.rename_file(EMPTY_TRANSACTIONS_FILE, TRANSACTIONS_STORE_FILE)
+        self.rename_file(self.transactions_file,self.swap_file )
+        self.rename_file(self.empty_file, self.transactions_file)
         msg = ""
         res = False
         try:
@@ -163,12 +169,12 @@ class TestCalculateBalance(TestCase):
         except Exception as ex:
             msg = str(ex)
 
-        self.rename_file(TRANSACTIONS_STORE_FILE, EMPTY_TRANSACTIONS_FILE)
-        self.rename_file(NOMBRE_FICHERO_TEMPORAL, TRANSACTIONS_STORE_FILE)
+        self.rename_file(self.transactions_file, self.empty_file)
+        self.rename_file(self.swap_file, self.transactions_file)
         self.assertEqual(True, res, msg)
 
-        if os.path.isfile(BALANCES_STORE_FILE):
-            with open(BALANCES_STORE_FILE, "r", encoding="utf-8", newline="") as file:
+        if os.path.isfile(self.balances_file):
+            with open(self.balances_file, "r", encoding="utf-8", newline="") as file:
                 hash_new = hashlib.md5(str(file).encode()).hexdigest()
         else:
             hash_new = ""
@@ -176,10 +182,10 @@ class TestCalculateBalance(TestCase):
 
     def test_file_iban_not_found(self):
         """path for an IBAN not in the file"""
-        mngr = AccountManager()
+        mngr = AccountManager(self.json_files_path)
 
-        if os.path.isfile(BALANCES_STORE_FILE):
-            with open(BALANCES_STORE_FILE, "r", encoding="utf-8", newline="") as file_org:
+        if os.path.isfile(self.balances_file):
+            with open(self.balances_file, "r", encoding="utf-8", newline="") as file_org:
                 hash_original = hashlib.md5(str(file_org).encode()).hexdigest()
         else:
             hash_original = ""
@@ -188,8 +194,8 @@ class TestCalculateBalance(TestCase):
             mngr.calculate_balance("ES9420805801101234567891")
         self.assertEqual("IBAN not found", cm_obj.exception.message)
 
-        if os.path.isfile(BALANCES_STORE_FILE):
-            with open(BALANCES_STORE_FILE, "r", encoding="utf-8", newline="") as file:
+        if os.path.isfile(self.balances_file):
+            with open(self.balances_file, "r", encoding="utf-8", newline="") as file:
                 hash_new = hashlib.md5(str(file).encode()).hexdigest()
         else:
             hash_new = ""
@@ -198,13 +204,13 @@ class TestCalculateBalance(TestCase):
     def test_balance_file_not_json(self):
         """path with transactions file not in json format"""
         # rename the transactions file and setting a new empty transactions file
-        self.rename_file(BALANCES_STORE_FILE,NOMBRE_FICHERO_TEMPORAL )
-        self.rename_file(NO_JSON_TRANSACTIONS_FILE, BALANCES_STORE_FILE)
-        mngr = AccountManager()
+        self.rename_file(self.balances_file,self.swap_file )
+        self.rename_file(self.no_json_file, self.balances_file)
+        mngr = AccountManager(self.json_files_path)
         res = False
         msg = ""
-        if os.path.isfile(BALANCES_STORE_FILE):
-            with open(BALANCES_STORE_FILE, "r", encoding="utf-8", newline="") as file_org:
+        if os.path.isfile(self.balances_file):
+            with open(self.balances_file, "r", encoding="utf-8", newline="") as file_org:
                 hash_original = hashlib.md5(str(file_org).encode()).hexdigest()
         else:
             hash_original = ""
@@ -218,14 +224,14 @@ class TestCalculateBalance(TestCase):
         except Exception as  ex:
             msg = str(ex)
 
-        if os.path.isfile(BALANCES_STORE_FILE):
-            with open(BALANCES_STORE_FILE, "r", encoding="utf-8", newline="") as file:
+        if os.path.isfile(self.balances_file):
+            with open(self.balances_file, "r", encoding="utf-8", newline="") as file:
                 hash_new = hashlib.md5(str(file).encode()).hexdigest()
         else:
             hash_new = ""
         #renaming the files to the orignal state
-        self.rename_file(BALANCES_STORE_FILE, NO_JSON_TRANSACTIONS_FILE)
-        self.rename_file(NOMBRE_FICHERO_TEMPORAL,BALANCES_STORE_FILE)
+        self.rename_file(self.balances_file, self.no_json_file)
+        self.rename_file(self.swap_file,self.balances_file)
         self.assertEqual(True,res,msg)
 
         self.assertEqual(hash_new, hash_original)
@@ -0,0 +1,94 @@
+"""Tests for the columnar transactions file"""
+import os.path
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+from uc3m_money import (TRANSACTIONS_STORE_FILE,
+                        AccountManager,
+                        AccountManagementException,
+                        ColumnarTransactions,
+                        JsonStorageBackend,
+                        SyntheticDataGenerator,
+                        TransactionsFile)
+from uc3m_money import columnar_transactions
+from uc3m_money.balance_aggregator import aggregate_balances
+
+
+class TestColumnarTransactions(TestCase):
+    """Columnar transactions tests class"""
+    def setUp(self):
+        """ creates the directory used by the tests """
+        self.json_files_path = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.json_files_path, "transactions.json")
+        shutil.copy(TRANSACTIONS_STORE_FILE, self.file_path)
+        self.transactions = TransactionsFile(self.file_path)
+        self.columnar = ColumnarTransactions(os.path.join(self.json_files_path,
+                                                          "transactions.bin"))
+
+    def tearDown(self):
+        """ removes the directory used by the tests """
+        shutil.rmtree(self.json_files_path)
+
+    def assert_same_balances(self, expected, balances):
+        """the balances are the same up to the cents"""
+        self.assertEqual(list(expected), list(balances))
+        for iban, balance in expected.items():
+            with self.subTest(iban):
+                self.assertEqual(round(balance, 2), balances[iban])
+
+    def test_balances(self):
+        """the balances are the ones of the transactions file"""
+        self.columnar.convert(self.transactions)
+        expected = aggregate_balances(self.transactions)
+        self.assertEqual(len(list(self.transactions.read())), self.columnar.count())
+        self.assertEqual(list(expected), self.columnar.ibans())
+        self.assert_same_balances(expected, self.columnar.balances())
+        self.assertEqual(9268.29, self.columnar.balance("ES3559005439021242088295"))
+        self.assertIsNone(self.columnar.balance("ES0000000000000000000000"))
+
+    def test_chunks_and_without_numpy(self):
+        """the balances are the same by chunks and without numpy"""
+        generator = SyntheticDataGenerator(seed=7)
+        generator.write_transactions_file(self.file_path, 5000, generator.ibans(30))
+        self.columnar.convert(self.transactions)
+        expected = self.columnar.balances()
+        self.assert_same_balances(aggregate_balances(self.transactions), expected)
+        with patch.object(columnar_transactions, "CHUNK_ROWS", 64):
+            self.columnar.convert(self.transactions)
+            self.assertEqual(expected, self.columnar.balances())
+            with patch.object(columnar_transactions, "numpy", None):
+                self.assertEqual(expected, self.columnar.balances())
+                for iban, balance in expected.items():
+                    self.assertEqual(balance, self.columnar.balance(iban))
+
+    def test_is_current(self):
+        """a columnar file of a previous version of the file is not current"""
+        self.assertFalse(self.columnar.is_current(self.transactions))
+        self.columnar.convert(self.transactions)
+        self.assertTrue(self.columnar.is_current(self.transactions))
+        with open(self.file_path, "w", encoding="utf-8", newline="") as file:
+            file.write('{"IBAN": "ES3559005439021242088295", "amount": "+10.00"}\n')
+        self.assertFalse(self.columnar.is_current(self.transactions))
+
+    def test_backend(self):
+        """the json backend converts the file again when it changes"""
+        mngr = AccountManager(self.json_files_path,
+                              backend=JsonStorageBackend(self.json_files_path, columnar=True))
+        self.assertTrue(mngr.calculate_balance("ES3559005439021242088295"))
+        self.assertTrue(self.columnar.is_current(self.transactions))
+        with open(self.file_path, "w", encoding="utf-8", newline="") as file:
+            file.write('{"IBAN": "ES3559005439021242088295", "amount": "+10.00"}\n')
+        self.assertEqual({"ES3559005439021242088295": 10.0}, mngr.calculate_all_balances())
+
+    def test_wrong_files(self):
+        """wrong transactions and columnar files are rejected"""
+        with open(self.file_path, "w", encoding="utf-8", newline="") as file:
+            file.write('[{"IBAN": "ES3559005439021242088295", "amount": "ten"}]')
+        with self.assertRaises(AccountManagementException) as cm:
+            self.columnar.convert(self.transactions)
+        self.assertEqual("JSON Decode Error - Wrong JSON Format", cm.exception.message)
+        self.assertEqual(["transactions.json"], os.listdir(self.json_files_path))
+        with self.assertRaises(AccountManagementException) as cm:
+            self.columnar.balances()
+        self.assertEqual("Wrong file  or file path", cm.exception.message)
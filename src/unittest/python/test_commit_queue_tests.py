@@ -0,0 +1,124 @@
+"""Tests for the concurrent use of the account manager"""
+import os.path
+import shutil
+import tempfile
+import threading
+import time
+from unittest import TestCase
+from uc3m_money import (JSON_FILES_DEPOSITS,
+                        AccountManager,
+                        AccountManagementException,
+                        CommitQueue,
+                        JsonLinesStore,
+                        SyntheticDataGenerator)
+
+THREADS = 8
+
+
+class TestCommitQueue(TestCase):
+    """Commit queue tests class"""
+    def setUp(self):
+        """ creates the directory and the manager used by the tests """
+        self.json_files_path = tempfile.mkdtemp()
+        self.mngr = AccountManager(self.json_files_path)
+        generator = SyntheticDataGenerator(seed=3)
+        self.transfers = list(generator.transfers(40, generator.ibans(10)))
+
+    def tearDown(self):
+        """ stops the writer and removes the directory """
+        self.mngr.close()
+        shutil.rmtree(self.json_files_path)
+
+    def stored_transfers(self):
+        """ transfer codes of the store """
+        store = JsonLinesStore(os.path.join(self.json_files_path, "transfers_store.json"))
+        return [k["transfer_code"] for k in store.read()]
+
+    def run_threads(self, target):
+        """ runs the target on every thread and returns their results """
+        results = [None] * THREADS
+
+        def worker(number):
+            results[number] = target()
+
+        threads = [threading.Thread(target=worker, args=(k,)) for k in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_submit_transfers(self):
+        """every thread submits the same transfers, only one of each is stored"""
+        results = self.run_threads(lambda: [self.mngr.submit_transfer_request(**k)
+                                            for k in self.transfers])
+        codes = []
+        for futures in results:
+            for future in futures:
+                if future.exception() is None:
+                    codes.append(future.result())
+                else:
+                    self.assertEqual("Duplicated transfer in transfer list",
+                                     future.exception().message)
+        self.assertEqual(len(self.transfers), len(codes))
+        self.assertEqual(sorted(codes), sorted(self.stored_transfers()))
+
+    def test_transfer_request_threads(self):
+        """transfer_request called at once by several threads"""
+        def requests():
+            codes = []
+            for transfer in self.transfers:
+                try:
+                    codes.append(self.mngr.transfer_request(**transfer))
+                except AccountManagementException as ex:
+                    self.assertEqual("Duplicated transfer in transfer list", ex.message)
+            return codes
+
+        codes = [code for codes in self.run_threads(requests) for code in codes]
+        self.assertEqual(sorted(codes), sorted(self.stored_transfers()))
+        self.assertEqual(len(self.transfers), len(codes))
+
+    def test_commit_groups_waiting_threads(self):
+        """the threads waiting for the lock are committed in one batch"""
+        lock = threading.RLock()
+        batches = []
+
+        def commit_function(items):
+            batches.append(items)
+            return [k * 2 if k else ValueError("zero") for k in items]
+
+        commit_queue = CommitQueue(commit_function, lock)
+        with lock:
+            results = [None] * THREADS
+
+            def worker(number):
+                try:
+                    results[number] = commit_queue.commit(number)
+                except ValueError as ex:
+                    results[number] = str(ex)
+
+            threads = [threading.Thread(target=worker, args=(k,)) for k in range(THREADS)]
+            for thread in threads:
+                thread.start()
+            time.sleep(0.2)
+        for thread in threads:
+            thread.join()
+        self.assertEqual(["zero"] + [k * 2 for k in range(1, THREADS)], results)
+        self.assertEqual([sorted(range(THREADS))], [sorted(k) for k in batches])
+
+    def test_invalid_submissions(self):
+        """the validation errors are set on the futures"""
+        future = self.mngr.submit_transfer_request(**dict(self.transfers[0], amount=5))
+        self.assertEqual("Invalid transfer amount", future.exception().message)
+        future = self.mngr.submit_deposit(os.path.join(JSON_FILES_DEPOSITS, "missing.json"))
+        self.assertEqual("Error: file input not found", future.exception().message)
+
+    def test_submit_deposit(self):
+        """the deposits are committed by the writer thread"""
+        future = self.mngr.submit_deposit(os.path.join(JSON_FILES_DEPOSITS, "case_ok.json"))
+        signature = future.result()
+        self.mngr.close()
+        store = JsonLinesStore(os.path.join(self.json_files_path, "deposits_store.json"))
+        self.assertEqual([signature], [k["deposit_signature"] for k in store.read()])
+        with self.assertRaises(RuntimeError):
+            self.mngr.submit_transfer_request(**self.transfers[0])
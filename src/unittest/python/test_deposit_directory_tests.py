@@ -0,0 +1,77 @@
+"""Deposit directory test cases """
+import csv
+import json
+import os.path
+import shutil
+import tempfile
+from concurrent import futures
+from unittest import TestCase
+from unittest.mock import patch
+from freezegun import freeze_time
+from uc3m_money import (JSON_FILES_PATH,
+                        AccountManager,
+                        JSON_FILES_DEPOSITS,
+                        AccountManagementException)
+
+
+class TestDepositDirectoryTests(TestCase):
+    """Test class for deposit_directory method"""
+    def setUp(self):
+        """ creates the directory used by the tests and reads the cases """
+        self.json_files_path = tempfile.mkdtemp()
+        self.store_file = os.path.join(self.json_files_path, "deposits_store.json")
+        my_cases = JSON_FILES_PATH + "test_cases_2025_method2.csv"
+        with open(my_cases, newline='', encoding='utf-8') as csvfile:
+            self.cases = list(csv.DictReader(csvfile, delimiter=','))
+
+    def tearDown(self):
+        """ removes the directory used by the tests """
+        shutil.rmtree(self.json_files_path)
+
+    def read_file(self):
+        """ this method read the deposits store and return the value """
+        with open(self.store_file, "r", encoding="utf-8", newline="") as file:
+            return [json.loads(line) for line in file if line.strip()]
+
+    @freeze_time("2025/03/26 14:00:00")
+    def test_directory_one_worker(self):
+        """every file of the deposits directory gets its expected result"""
+        results = AccountManager(self.json_files_path).deposit_directory(JSON_FILES_DEPOSITS,
+                                                                             workers=1)
+        self.assertEqual(len(self.cases), len(results))
+        for row in self.cases:
+            with self.subTest(row["ID_TEST"] + row["VALID_INVALID"]):
+                value = results[row["FILE"]]
+                if row["VALID_INVALID"] == "VALID":
+                    self.assertEqual(row["RESULT"], value)
+                else:
+                    self.assertIsInstance(value, AccountManagementException)
+                    self.assertEqual(row["RESULT"], value.message)
+        self.assertEqual([row["RESULT"] for row in self.cases
+                          if row["VALID_INVALID"] == "VALID"],
+                         [k["deposit_signature"] for k in self.read_file()])
+
+    def test_directory_process_pool(self):
+        """the workers processes return the same errors and store the deposits"""
+        with patch.object(futures, "ProcessPoolExecutor",
+                          wraps=futures.ProcessPoolExecutor) as pool_class:
+            results = AccountManager(self.json_files_path).deposit_directory(
+                JSON_FILES_DEPOSITS, workers=2)
+        # the workers are not forked from a process that may hold locks
+        self.assertNotEqual("fork", pool_class.call_args.kwargs["mp_context"].get_start_method())
+        stored = [k["deposit_signature"] for k in self.read_file()]
+        for row in self.cases:
+            with self.subTest(row["ID_TEST"] + row["VALID_INVALID"]):
+                value = results[row["FILE"]]
+                if row["VALID_INVALID"] == "VALID":
+                    self.assertIn(value, stored)
+                else:
+                    self.assertEqual(row["RESULT"], value.message)
+
+    def test_directory_not_found(self):
+        """a directory that does not exist raises an exception"""
+        with self.assertRaises(AccountManagementException) as c_m:
+            AccountManager(self.json_files_path).deposit_directory(JSON_FILES_PATH
+                                                                   + "no_deposits/")
+        self.assertEqual("Error: deposits directory not found", c_m.exception.message)
+        self.assertFalse(os.path.exists(self.store_file))
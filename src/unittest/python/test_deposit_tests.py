@@ -4,10 +4,10 @@ import json
 import os.path
 import hashlib
 from unittest import TestCase
-from os import remove
+import shutil
+import tempfile
 from freezegun import freeze_time
 from uc3m_money import (JSON_FILES_PATH,
-                        DEPOSITS_STORE_FILE,
                         AccountManager,
                         JSON_FILES_DEPOSITS,
                         AccountManagementException)
@@ -15,16 +15,24 @@ from uc3m_money import (JSON_FILES_PATH,
 class TestDepositIntoAccountTests(TestCase):
     """Test class for deposit method"""
     def setUp(self):
-        """ inicializo el entorno de prueba """
-        if os.path.exists(DEPOSITS_STORE_FILE):
-            remove(DEPOSITS_STORE_FILE)
+        """ inicializo el entorno de prueba en un directorio temporal """
+        self.json_files_path = tempfile.mkdtemp()
+        self.store_file = os.path.join(self.json_files_path, "deposits_store.json")
 
-    @staticmethod
-    def read_file():
+    def tearDown(self):
+        """ borra el directorio temporal """
+        shutil.rmtree(self.json_files_path)
+
+    def remove_store(self):
+        """ borra los depositos guardados """
+        if os.path.exists(self.store_file):
+            os.remove(self.store_file)
+
+    def read_file(self):
         """ this method read a Json file and return the value """
         try:
-            with open(DEPOSITS_STORE_FILE, "r", encoding="utf-8", newline="") as file:
-                data = json.load(file)
+            with open(self.store_file, "r", encoding="utf-8", newline="") as file:
+                data = [json.loads(line) for line in file if line.strip()]
         except FileNotFoundError as ex:
             raise AccountManagementException("Wrong file or file path") from ex
         except json.JSONDecodeError as ex:
@@ -39,7 +47,7 @@ class TestDepositIntoAccountTests(TestCase):
         my_cases = JSON_FILES_PATH + "test_cases_2025_method2.csv"
         with open(my_cases, newline='', encoding='utf-8') as csvfile:
             param_test_cases = csv.DictReader(csvfile, delimiter=',')
-            mngr = AccountManager()
+            mngr = AccountManager(self.json_files_path)
             for row in param_test_cases:
                 # VALID INVALID;ID TEST;FILE;EXPECTED RESULT
                 test_id = row['ID_TEST']
@@ -49,7 +57,7 @@ class TestDepositIntoAccountTests(TestCase):
                 if valid == "VALID":
                     with self.subTest(test_id + valid):
                         # removes all the deposits to be sure that the method works
-                        self.setUp()
+                        self.remove_store()
                         valor = mngr.deposit_into_account(test_file)
                         self.assertEqual(result, valor)
                         # Check if this deposit has been stored
@@ -64,8 +72,8 @@ class TestDepositIntoAccountTests(TestCase):
                 else:
                     with self.subTest(test_id + valid):
                         # read the file to compare file content before and after method call
-                        if os.path.isfile(DEPOSITS_STORE_FILE):
-                            with open(DEPOSITS_STORE_FILE, "r",
+                        if os.path.isfile(self.store_file):
+                            with open(self.store_file, "r",
                                       encoding="utf-8", newline="") as file_org:
                                 hash_original = hashlib.md5(str(file_org).encode()).hexdigest()
                         else:
@@ -74,8 +82,8 @@ class TestDepositIntoAccountTests(TestCase):
                         with self.assertRaises(AccountManagementException) as c_m:
                             valor = mngr.deposit_into_account(test_file)
                         self.assertEqual(c_m.exception.message, result)
-                        if os.path.isfile(DEPOSITS_STORE_FILE):
-                            with open(DEPOSITS_STORE_FILE, "r",
+                        if os.path.isfile(self.store_file):
+                            with open(self.store_file, "r",
                                       encoding="utf-8", newline="") as file:
                                 hash_new = hashlib.md5(str(file).encode()).hexdigest()
                         else:
@@ -0,0 +1,71 @@
+"""Tests for the IBAN validator"""
+import random
+from unittest import TestCase
+from unittest.mock import patch
+from uc3m_money import (AccountManager,
+                        AccountManagementException,
+                        IbanValidator)
+from uc3m_money import iban_validator
+
+VALID_IBANS = ["ES6211110783482828975098",
+               "ES8658342044541216872704",
+               "ES3559005439021242088295"]
+
+
+def big_int_control_digits(iban):
+    """control digits calculated converting the whole iban into an int"""
+    return 98 - int(iban[4:] + "142800") % 97
+
+
+class TestIbanValidator(TestCase):
+    """IBAN validator tests class"""
+    def setUp(self):
+        """ random ibans with right and wrong control digits """
+        rnd = random.Random(97)
+        self.ibans = []
+        for _ in range(500):
+            bban = f"{rnd.randrange(10 ** 20):020d}"
+            control = rnd.choice([big_int_control_digits("ES00" + bban), rnd.randrange(100)])
+            self.ibans.append(f"ES{control:02d}{bban}")
+
+    def test_same_control_digits(self):
+        """the chunked mod 97 gives the same digits as the big int one"""
+        for iban in self.ibans:
+            with self.subTest(iban):
+                self.assertEqual(big_int_control_digits(iban),
+                                 IbanValidator.control_digits(iban))
+
+    def test_validate(self):
+        """valid ibans are returned and the wrong ones keep their messages"""
+        validator = IbanValidator()
+        for iban in VALID_IBANS:
+            self.assertEqual(iban, validator.validate(iban))
+        for iban, message in (("ES1559005439021242088295", "Invalid IBAN control digit"),
+                              ("ES155900543902124208829", "Invalid IBAN format"),
+                              ("FR3559005439021242088295", "Invalid IBAN format")):
+            with self.subTest(iban):
+                for _ in range(2):
+                    with self.assertRaises(AccountManagementException) as c_m:
+                        validator.validate(iban)
+                    self.assertEqual(message, c_m.exception.message)
+
+    def test_valivan(self):
+        """valivan keeps working through the validator"""
+        self.assertEqual(VALID_IBANS[0], AccountManager.valivan(VALID_IBANS[0]))
+
+    def test_validate_ibans(self):
+        """the batch validation gives the same results with and without numpy"""
+        ibans = self.ibans + ["ES12", "XX6211110783482828975098"]
+        validator = IbanValidator()
+        expected = []
+        for iban in ibans:
+            try:
+                expected.append(validator.validate(iban))
+            except AccountManagementException as ex:
+                expected.append(ex.message)
+        for numpy in (iban_validator.numpy, None):
+            with self.subTest(numpy is not None):
+                with patch.object(iban_validator, "numpy", numpy):
+                    results = IbanValidator().validate_ibans(ibans)
+                self.assertEqual(expected, [k.message if isinstance(k, Exception) else k
+                                            for k in results])
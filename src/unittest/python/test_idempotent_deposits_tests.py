@@ -0,0 +1,130 @@
+"""Tests for the idempotent deposits"""
+import os.path
+import shutil
+import tempfile
+from unittest import TestCase
+from freezegun import freeze_time
+from uc3m_money import (JSON_FILES_DEPOSITS,
+                        AccountManager,
+                        BloomFilter,
+                        JsonStorageBackend,
+                        SqliteStorageBackend,
+                        deposit_key)
+
+DEPOSIT = '{"IBAN": "ES6211110783482828975098", "AMOUNT": "EUR 1234.56"}'
+
+
+class TestIdempotentDeposits(TestCase):
+    """Idempotent deposits tests class"""
+    def setUp(self):
+        """ creates the directory used by the tests """
+        self.json_files_path = tempfile.mkdtemp()
+        self.deposits_path = os.path.join(self.json_files_path, "deposits")
+        os.mkdir(self.deposits_path)
+
+    def tearDown(self):
+        """ removes the directory used by the tests """
+        shutil.rmtree(self.json_files_path)
+
+    def write_deposit(self, name, content=DEPOSIT):
+        """ writes a deposit file and returns its path """
+        file_path = os.path.join(self.deposits_path, name)
+        with open(file_path, "w", encoding="utf-8", newline="") as file:
+            file.write(content)
+        return file_path
+
+    def stored_deposits(self):
+        """ number of deposits in the store """
+        store_file = os.path.join(self.json_files_path, "deposits_store.json")
+        with open(store_file, "r", encoding="utf-8", newline="") as file:
+            return len(file.readlines())
+
+    def test_replay_returns_original_signature(self):
+        """a replayed deposit file is stored once, even by a new manager"""
+        input_file = self.write_deposit("deposit.json")
+        with freeze_time("2025/03/26 14:00:00"):
+            signature = AccountManager(self.json_files_path).deposit_into_account(input_file)
+        with freeze_time("2025/03/27 14:00:00"):
+            self.assertEqual(signature, AccountManager(self.json_files_path)
+                             .deposit_into_account(input_file))
+        self.assertEqual(1, self.stored_deposits())
+
+    def test_replay_through_another_live_manager(self):
+        """a manager reads the deposits indexed by another one after it
+        loaded the index"""
+        first_file = self.write_deposit("first.json")
+        second_file = self.write_deposit("second.json", DEPOSIT + "\n")
+        first = AccountManager(self.json_files_path)
+        second = AccountManager(self.json_files_path)
+        with freeze_time("2025/03/26 14:00:00"):
+            signature = first.deposit_into_account(first_file)
+        with freeze_time("2025/03/26 14:00:01"):
+            self.assertEqual(signature, second.deposit_into_account(first_file))
+            other = second.deposit_into_account(second_file)
+        with freeze_time("2025/03/26 14:00:02"):
+            self.assertEqual(other, first.deposit_into_account(second_file))
+            self.assertEqual(signature, first.deposit_into_account(first_file))
+        self.assertEqual(2, self.stored_deposits())
+
+    def test_different_content_is_stored(self):
+        """the same payload in another file content is another deposit"""
+        manager = AccountManager(self.json_files_path)
+        with freeze_time("2025/03/26 14:00:00"):
+            manager.deposit_into_account(self.write_deposit("first.json"))
+        with freeze_time("2025/03/26 14:00:01"):
+            manager.deposit_into_account(self.write_deposit("second.json", DEPOSIT + "\n"))
+        self.assertEqual(2, self.stored_deposits())
+
+    def test_replaced_store_resets_index(self):
+        """the index is emptied when the deposits store is removed"""
+        input_file = self.write_deposit("deposit.json")
+        manager = AccountManager(self.json_files_path)
+        manager.deposit_into_account(input_file)
+        os.remove(os.path.join(self.json_files_path, "deposits_store.json"))
+        manager.deposit_into_account(input_file)
+        self.assertEqual(1, self.stored_deposits())
+
+    def test_directory_and_submit(self):
+        """replays in the same directory batch and in the writer thread"""
+        self.write_deposit("a.json")
+        self.write_deposit("b.json")
+        shutil.copy(os.path.join(JSON_FILES_DEPOSITS, "case_ok.json"), self.deposits_path)
+        manager = AccountManager(self.json_files_path)
+        results = manager.deposit_directory(workers=1)
+        self.assertEqual(results["a.json"], results["b.json"])
+        self.assertEqual(2, self.stored_deposits())
+        future = manager.submit_deposit(os.path.join(self.deposits_path, "a.json"))
+        self.assertEqual(results["a.json"], future.result())
+        manager.close()
+        self.assertEqual(2, self.stored_deposits())
+
+    def test_sqlite_backend(self):
+        """the sqlite backend keeps the keys in a table"""
+        input_file = self.write_deposit("deposit.json")
+        backend = SqliteStorageBackend(":memory:")
+        manager = AccountManager(backend=backend)
+        signature = manager.deposit_into_account(input_file)
+        self.assertEqual(signature, manager.deposit_into_account(input_file))
+        self.assertEqual(1, len(backend.deposits()))
+        backend.close()
+
+    def test_backend_find_deposit(self):
+        """find_deposit after add_deposits"""
+        backend = JsonStorageBackend(self.json_files_path)
+        iban = "ES6211110783482828975098"
+        key = deposit_key(DEPOSIT.encode(), iban, "EUR 1234.56")
+        self.assertIsNone(backend.find_deposit(key, iban))
+        backend.add_deposits([{"to_iban": iban, "deposit_signature": "signature"}], [key])
+        self.assertEqual("signature", backend.find_deposit(key, iban))
+        self.assertEqual("signature",
+                         JsonStorageBackend(self.json_files_path).find_deposit(key, iban))
+
+    def test_bloom_filter(self):
+        """no false negatives and few false positives"""
+        bloom = BloomFilter(1000)
+        keys = [deposit_key(str(k).encode(), "", "") for k in range(1000)]
+        for key in keys:
+            bloom.add(key)
+        self.assertTrue(all(key in bloom for key in keys))
+        others = [deposit_key(str(k).encode(), "x", "") for k in range(1000)]
+        self.assertLess(sum(key in bloom for key in others), 50)
@@ -0,0 +1,83 @@
+"""Tests for the json codec of the stores"""
+import json
+import os.path
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+from freezegun import freeze_time
+from uc3m_money import AccountManager, JsonCodec, JSON_CODEC
+from uc3m_money import json_codec
+
+RECORD = {"IBAN": "ES8658342044541216872704", "amount": 10.5, "concept": "Año nuevo",
+          "ids": [1, 2], "valid": True, "none": None}
+TRANSFER = {"from_iban": "ES6211110783482828975098",
+            "to_iban": "ES8658342044541216872704",
+            "concept": "Codec transfer test",
+            "transfer_type": "ORDINARY",
+            "date": "01/07/2025",
+            "amount": 100.0}
+
+
+@freeze_time("2025/03/26 14:00:00")
+class TestJsonCodec(TestCase):
+    """Json codec tests class"""
+    def setUp(self):
+        """ creates the directory used by the tests """
+        self.json_files_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """ removes the directory used by the tests """
+        shutil.rmtree(self.json_files_path)
+
+    def codecs(self):
+        """ the codecs with and without orjson in both modes """
+        return {f"{fast}-{pretty}": JsonCodec(pretty=pretty, fast=fast)
+                for fast in (True, False) for pretty in (True, False)}
+
+    def test_round_trip(self):
+        """every codec reads what the others write"""
+        for name, codec in self.codecs().items():
+            with self.subTest(name):
+                for other in self.codecs().values():
+                    self.assertEqual(RECORD, other.loads(codec.dumps(RECORD)))
+                    self.assertEqual(RECORD, other.loads(codec.dumps_document(RECORD)))
+                self.assertNotIn(b"\n", codec.dumps(RECORD))
+
+    def test_modes(self):
+        """compact has no blanks, pretty writes as the json module"""
+        for name, codec in self.codecs().items():
+            with self.subTest(name):
+                if codec.pretty:
+                    self.assertEqual(json.dumps(RECORD).encode(), codec.dumps(RECORD))
+                    self.assertEqual(json.dumps(RECORD, indent=2),
+                                     codec.dumps_document(RECORD).decode())
+                else:
+                    self.assertNotIn(b", ", codec.dumps(RECORD))
+                    self.assertNotIn(b": ", codec.dumps(RECORD))
+                    self.assertEqual(codec.dumps(RECORD), codec.dumps_document(RECORD))
+
+    def test_decode_errors(self):
+        """every codec raises json.JSONDecodeError"""
+        for name, codec in self.codecs().items():
+            with self.subTest(name), self.assertRaises(json.JSONDecodeError):
+                codec.loads(b'{"IBAN": ')
+
+    def test_without_orjson(self):
+        """the json module is used when orjson is not installed"""
+        with patch.object(json_codec, "orjson", None):
+            self.assertEqual("json", JsonCodec().name)
+
+    def test_stores_of_the_manager(self):
+        """the stores are written in the mode of JSON_CODEC"""
+        store_file = os.path.join(self.json_files_path, "transfers_store.json")
+        code = AccountManager(self.json_files_path).transfer_request(**TRANSFER)
+        with open(store_file, "rb") as file:
+            line = file.readline()
+        self.assertNotIn(b", ", line)
+        os.remove(store_file)
+        with patch.object(JSON_CODEC, "pretty", True):
+            self.assertEqual(code, AccountManager(self.json_files_path)
+                             .transfer_request(**TRANSFER))
+        with open(store_file, "rb") as file:
+            self.assertEqual(json.dumps(json.loads(line)).encode() + b"\n", file.readline())
@@ -0,0 +1,60 @@
+"""Tests for account managers working on another json files directory"""
+import json
+import os.path
+import shutil
+import tempfile
+from unittest import TestCase
+from freezegun import freeze_time
+from uc3m_money import (JSON_FILES_DEPOSITS,
+                        TRANSACTIONS_STORE_FILE,
+                        TRANSFERS_STORE_FILE,
+                        AccountManager)
+
+
+class TestJsonFilesPath(TestCase):
+    """json_files_path tests class"""
+    def setUp(self):
+        """ creates the directory used by the tests """
+        self.json_files_path = tempfile.mkdtemp()
+        shutil.copy(TRANSACTIONS_STORE_FILE, self.json_files_path)
+        shutil.copytree(JSON_FILES_DEPOSITS, os.path.join(self.json_files_path, "deposits"))
+        self.transfers_stat = self.stat(TRANSFERS_STORE_FILE)
+
+    def tearDown(self):
+        """ removes the directory used by the tests """
+        shutil.rmtree(self.json_files_path)
+
+    @staticmethod
+    def stat(file_name):
+        """modification time and size of a file, None if it does not exist"""
+        if not os.path.exists(file_name):
+            return None
+        return os.stat(file_name).st_mtime_ns, os.stat(file_name).st_size
+
+    def read_file(self, file_name):
+        """ reads a store of the test directory """
+        with open(os.path.join(self.json_files_path, file_name), "r",
+                  encoding="utf-8", newline="") as file:
+            return [json.loads(line) for line in file if line.strip()]
+
+    @freeze_time("2025/03/26 14:00:00")
+    def test_all_stores_in_path(self):
+        """the three operations use the stores of the directory"""
+        mngr = AccountManager(self.json_files_path)
+        code = mngr.transfer_request(from_iban="ES6211110783482828975098",
+                                     to_iban="ES8658342044541216872704",
+                                     concept="Testing another path",
+                                     transfer_type="URGENT",
+                                     date="26/03/2025",
+                                     amount=15.5)
+        signature = mngr.deposit_into_account(
+            os.path.join(self.json_files_path, "deposits", "case_ok.json"))
+        mngr.calculate_balance("ES3559005439021242088295")
+        results = mngr.deposit_directory(workers=1)
+
+        self.assertEqual(code, self.read_file("transfers_store.json")[0]["transfer_code"])
+        self.assertEqual(signature,
+                         self.read_file("deposits_store.json")[0]["deposit_signature"])
+        self.assertEqual(signature, results["case_ok.json"])
+        self.assertEqual(9268.29, self.read_file("balances.json")[0]["BALANCE"])
+        self.assertEqual(self.transfers_stat, self.stat(TRANSFERS_STORE_FILE))
@@ -0,0 +1,73 @@
+"""Tests for the append-only json lines store"""
+import json
+import os.path
+from os import remove
+from unittest import TestCase
+from uc3m_money import (JSON_FILES_PATH,
+                        JsonLinesStore,
+                        AccountManagementException)
+
+STORE_TEST_FILE = JSON_FILES_PATH + "json_lines_store_test.json"
+
+
+class TestJsonLinesStore(TestCase):
+    """Json lines store tests class"""
+    def setUp(self):
+        """ inicializo el entorno de prueba """
+        if os.path.exists(STORE_TEST_FILE):
+            remove(STORE_TEST_FILE)
+
+    def tearDown(self):
+        """ removes the file used by the test """
+        self.setUp()
+
+    def test_append_and_read(self):
+        """records are written one per line and read back in order"""
+        store = JsonLinesStore(STORE_TEST_FILE)
+        store.append({"IBAN": "ES3559005439021242088295", "amount": "+1.00"})
+        store.append_all([{"IBAN": "ES8658342044541216872704", "amount": "-2.00"},
+                          {"IBAN": "ES3559005439021242088295", "amount": "+3.00"}])
+        with open(STORE_TEST_FILE, "r", encoding="utf-8", newline="") as file:
+            lines = file.readlines()
+        self.assertEqual(3, len(lines))
+        self.assertEqual(["+1.00", "-2.00", "+3.00"],
+                         [record["amount"] for record in store.read()])
+
+    def test_read_file_not_found(self):
+        """a store that does not exist is empty"""
+        store = JsonLinesStore(STORE_TEST_FILE)
+        self.assertEqual([], list(store.read()))
+
+    def test_migrate_json_array(self):
+        """a json array file is converted into one record per line"""
+        old_records = [{"IBAN": "ES3559005439021242088295", "BALANCE": 1.5},
+                       {"IBAN": "ES8658342044541216872704", "BALANCE": 2.5}]
+        with open(STORE_TEST_FILE, "w", encoding="utf-8", newline="") as file:
+            json.dump(old_records, file, indent=2)
+        store = JsonLinesStore(STORE_TEST_FILE)
+        store.append({"IBAN": "ES3559005439021242088295", "BALANCE": 3.5})
+        self.assertFalse(store.migrate())
+        with open(STORE_TEST_FILE, "r", encoding="utf-8", newline="") as file:
+            data = [json.loads(line) for line in file]
+        self.assertEqual(old_records + [{"IBAN": "ES3559005439021242088295",
+                                         "BALANCE": 3.5}], data)
+
+    def test_append_no_json_file(self):
+        """a file that is not json is not modified"""
+        with open(STORE_TEST_FILE, "w", encoding="utf-8", newline="") as file:
+            file.write("Hello world!")
+        store = JsonLinesStore(STORE_TEST_FILE)
+        with self.assertRaises(AccountManagementException) as c_m:
+            store.append({"IBAN": "ES3559005439021242088295"})
+        self.assertEqual("JSON Decode Error - Wrong JSON Format", c_m.exception.message)
+        with open(STORE_TEST_FILE, "r", encoding="utf-8", newline="") as file:
+            self.assertEqual("Hello world!", file.read())
+
+    def test_append_after_unterminated_line(self):
+        """a last record without newline is not merged with the new one"""
+        with open(STORE_TEST_FILE, "w", encoding="utf-8", newline="") as file:
+            file.write('{"IBAN": "ES3559005439021242088295"}')
+        store = JsonLinesStore(STORE_TEST_FILE)
+        store.append({"IBAN": "ES8658342044541216872704"})
+        self.assertEqual(["ES3559005439021242088295", "ES8658342044541216872704"],
+                         [record["IBAN"] for record in store.read()])
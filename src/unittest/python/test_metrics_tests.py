@@ -0,0 +1,85 @@
+"""Tests for the latency and I/O metrics"""
+import json
+import os.path
+import shutil
+import tempfile
+from unittest import TestCase
+from freezegun import freeze_time
+from uc3m_money import (TRANSACTIONS_STORE_FILE,
+                        JSON_FILES_DEPOSITS,
+                        AccountManager,
+                        Metrics,
+                        METRICS)
+
+TRANSFER = {"from_iban": "ES6211110783482828975098",
+            "to_iban": "ES8658342044541216872704",
+            "concept": "Metrics transfer test",
+            "transfer_type": "ORDINARY",
+            "date": "01/07/2025",
+            "amount": 100.0}
+
+
+@freeze_time("2025/03/26 14:00:00")
+class TestMetrics(TestCase):
+    """Metrics tests class"""
+    def setUp(self):
+        """ creates the directory used by the tests and enables the metrics """
+        self.json_files_path = tempfile.mkdtemp()
+        shutil.copy(TRANSACTIONS_STORE_FILE, self.json_files_path)
+        METRICS.reset()
+        METRICS.enable()
+
+    def tearDown(self):
+        """ disables the metrics and removes the directory """
+        METRICS.enable(False)
+        METRICS.reset()
+        shutil.rmtree(self.json_files_path)
+
+    def test_phases_of_the_operations(self):
+        """every operation records its phases and the bytes"""
+        mngr = AccountManager(self.json_files_path)
+        mngr.transfer_request(**TRANSFER)
+        mngr.deposit_into_account(JSON_FILES_DEPOSITS + "case_ok.json")
+        mngr.calculate_balance("ES8658342044541216872704")
+        snapshot = METRICS.snapshot()
+        for phase in ("transfer_request", "transfer.validation", "transfer.duplicate_check",
+                      "transfer.signature", "transfer.write", "deposit_into_account",
+                      "deposit.validation", "deposit.duplicate_check", "deposit.write",
+                      "calculate_balance", "balance.validation", "balance.calculation",
+                      "balance.write"):
+            with self.subTest(phase):
+                self.assertEqual(1, snapshot["phases"][phase]["count"])
+                self.assertEqual(1, snapshot["phases"][phase]["buckets"][-1][1])
+        self.assertGreater(snapshot["counters"]["records_scanned"], 0)
+        self.assertGreater(snapshot["counters"]["bytes_read"], 0)
+        self.assertGreater(snapshot["counters"]["bytes_written"], 0)
+
+    def test_disabled(self):
+        """nothing is recorded while disabled"""
+        METRICS.enable(False)
+        AccountManager(self.json_files_path).transfer_request(**TRANSFER)
+        self.assertEqual({"phases": {}, "counters": {}}, METRICS.snapshot())
+
+    def test_exports(self):
+        """json and Prometheus text format files"""
+        metrics = Metrics(enabled=True)
+        metrics.observe("transfer.write", 0.002)
+        metrics.observe("transfer.write", 20.0)
+        metrics.count("bytes_written", 10)
+        json_file = os.path.join(self.json_files_path, "metrics.json")
+        metrics.write_json(json_file)
+        with open(json_file, "r", encoding="utf-8", newline="") as file:
+            self.assertEqual(metrics.snapshot(), json.load(file))
+        prometheus_file = os.path.join(self.json_files_path, "metrics.prom")
+        metrics.write_prometheus(prometheus_file)
+        with open(prometheus_file, "r", encoding="utf-8", newline="") as file:
+            lines = file.read().splitlines()
+        self.assertIn('uc3m_money_phase_seconds_bucket{phase="transfer.write",le="0.001"} 0',
+                      lines)
+        self.assertIn('uc3m_money_phase_seconds_bucket{phase="transfer.write",le="0.005"} 1',
+                      lines)
+        self.assertIn('uc3m_money_phase_seconds_bucket{phase="transfer.write",le="+Inf"} 2',
+                      lines)
+        self.assertIn('uc3m_money_phase_seconds_count{phase="transfer.write"} 2', lines)
+        self.assertIn("# TYPE uc3m_money_bytes_written_total counter", lines)
+        self.assertIn("uc3m_money_bytes_written_total 10", lines)
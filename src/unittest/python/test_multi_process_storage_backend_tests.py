@@ -0,0 +1,159 @@
+"""Tests for the stores shared by several processes"""
+import json
+import multiprocessing
+import os
+import os.path
+import shutil
+import tempfile
+import threading
+from unittest import TestCase, skipUnless
+from unittest.mock import patch
+from freezegun import freeze_time
+from uc3m_money import (AccountManager,
+                        AccountManagementException,
+                        JsonLinesStore,
+                        MultiProcessStorageBackend,
+                        SegmentedStore,
+                        SyntheticDataGenerator)
+
+PROCESSES = 4
+DEPOSIT = '{"IBAN": "ES6211110783482828975098", "AMOUNT": "EUR 1234.56"}'
+
+
+def request_transfers(json_files_path, transfers, queue):
+    """ stores the transfers from another process and returns the codes """
+    backend = MultiProcessStorageBackend(json_files_path, merge_interval=0.01)
+    mngr = AccountManager(json_files_path, backend=backend)
+    codes = []
+    for transfer in transfers:
+        try:
+            codes.append(mngr.transfer_request(**transfer))
+        except AccountManagementException:
+            pass
+    backend.close()
+    queue.put(codes)
+
+
+class TestMultiProcessStorageBackend(TestCase):
+    """Multi-process storage backend tests class"""
+    def setUp(self):
+        """ creates the directory used by the tests """
+        self.json_files_path = tempfile.mkdtemp()
+        self.store_path = os.path.join(self.json_files_path, "transfers_store.json")
+        generator = SyntheticDataGenerator(seed=9)
+        self.transfers = list(generator.transfers(60, generator.ibans(10)))
+
+    def tearDown(self):
+        """ removes the directory used by the tests """
+        shutil.rmtree(self.json_files_path)
+
+    def segments(self):
+        """ segment files of the directory """
+        return [k for k in os.listdir(self.json_files_path) if k.endswith(".segment")]
+
+    @skipUnless("fork" in multiprocessing.get_all_start_methods(), "needs fork")
+    def test_processes_store_each_transfer_once(self):
+        """several processes storing the same transfers"""
+        context = multiprocessing.get_context("fork")
+        queue = context.Queue()
+        processes = [context.Process(target=request_transfers,
+                                     args=(self.json_files_path, self.transfers, queue))
+                     for _ in range(PROCESSES)]
+        for process in processes:
+            process.start()
+        codes = [code for _ in processes for code in queue.get(timeout=60)]
+        for process in processes:
+            process.join()
+        stored = [k["transfer_code"] for k in JsonLinesStore(self.store_path).read()]
+        self.assertEqual(len(self.transfers), len(codes))
+        self.assertEqual(sorted(codes), sorted(stored))
+        self.assertEqual([], self.segments())
+
+    def test_merged_view(self):
+        """the duplicate check sees the segments before and after the merge"""
+        backend = MultiProcessStorageBackend(self.json_files_path, merge_interval=None)
+        mngr = AccountManager(self.json_files_path, backend=backend)
+        mngr.transfer_requests_bulk(self.transfers[:30])
+        self.assertEqual(1, len(self.segments()))
+        other = MultiProcessStorageBackend(self.json_files_path, merge_interval=None)
+        stored = list(SegmentedStore(self.store_path).read())
+        self.assertEqual(30, len(stored))
+        self.assertTrue(all(other.transfer_exists(k) for k in stored))
+        results = AccountManager(self.json_files_path,
+                                 backend=other).transfer_requests_bulk(self.transfers[:40])
+        self.assertEqual(30, sum(isinstance(k, AccountManagementException) for k in results))
+        self.assertEqual(40, backend.merge())
+        self.assertEqual([], self.segments())
+        results = mngr.transfer_requests_bulk(self.transfers[:40])
+        self.assertTrue(all(isinstance(k, AccountManagementException) for k in results))
+        self.assertEqual(40, len(list(JsonLinesStore(self.store_path).read())))
+
+    def test_replayed_deposit_is_stored_once(self):
+        """a deposit replayed through another backend returns the original
+        signature, before and after the merge"""
+        input_file = os.path.join(self.json_files_path, "deposit.json")
+        with open(input_file, "w", encoding="utf-8", newline="") as file:
+            file.write(DEPOSIT)
+        backends = [MultiProcessStorageBackend(self.json_files_path, merge_interval=None)
+                    for _ in range(2)]
+        managers = [AccountManager(self.json_files_path, backend=k) for k in backends]
+        with freeze_time("2025/03/26 14:00:00"):
+            signature = managers[0].deposit_into_account(input_file)
+        with freeze_time("2025/03/26 14:00:01"):
+            self.assertEqual(signature, managers[1].deposit_into_account(input_file))
+            backends[1].merge()
+            self.assertEqual(signature, managers[0].deposit_into_account(input_file))
+        store = SegmentedStore(os.path.join(self.json_files_path, "deposits_store.json"))
+        self.assertEqual([signature], [k["deposit_signature"] for k in store.read()])
+
+    def test_background_merge_error(self):
+        """an error does not stop the background merge, close raises it"""
+        merge = SegmentedStore.merge
+        calls = []
+        retried = threading.Event()
+
+        def failing_merge(store):
+            calls.append(store.file_path)
+            if len(calls) == 1:
+                raise OSError("No space left on device")
+            if len(calls) > 8:
+                retried.set()
+            return merge(store)
+        with patch.object(SegmentedStore, "merge", failing_merge):
+            backend = MultiProcessStorageBackend(self.json_files_path, merge_interval=0.01)
+            mngr = AccountManager(self.json_files_path, backend=backend)
+            mngr.transfer_request(**self.transfers[0])
+            self.assertTrue(retried.wait(5))
+            with self.assertRaises(OSError):
+                backend.close()
+        self.assertEqual([], self.segments())
+        self.assertEqual(0, backend.merge())
+
+    def test_key_locks_of_threads(self):
+        """two stores of the same file in a process exclude each other"""
+        first, second = SegmentedStore(self.store_path), SegmentedStore(self.store_path)
+        acquired = threading.Event()
+
+        def lock_second():
+            with second.key_locks(["0a1b2c3d"]):
+                acquired.set()
+        with first.key_locks(["0a1b2c3d", "ffffffff"]):
+            thread = threading.Thread(target=lock_second)
+            thread.start()
+            self.assertFalse(acquired.wait(0.2))
+        self.assertTrue(acquired.wait(5))
+        thread.join()
+
+    def test_interrupted_merge(self):
+        """a merge interrupted after appending is completed without duplicates"""
+        store = SegmentedStore(self.store_path)
+        store.append_all([{"a": 1}, {"a": 2}])
+        segment = os.path.join(self.json_files_path, self.segments()[0])
+        # crash in the middle of the copy of the segment
+        with open(self.store_path + ".merge", "w", encoding="utf-8") as file:
+            json.dump({"size": 0, "segments": [segment], "done": False, "moved": 0}, file)
+        with open(self.store_path, "w", encoding="utf-8") as file:
+            file.write('{"a": 1}\n{"a"')
+        self.assertEqual(2, store.merge())
+        self.assertEqual([{"a": 1}, {"a": 2}], list(store.read()))
+        self.assertEqual([], self.segments())
@@ -0,0 +1,76 @@
+"""Tests for the cached signatures of the transfers and deposits"""
+import hashlib
+import json
+import pickle
+from unittest import TestCase
+from freezegun import freeze_time
+from uc3m_money import AccountDeposit, TransferRequest
+
+
+class TestRecordSignatures(TestCase):
+    """Record signatures tests class"""
+    @freeze_time("2025/03/26 14:00:00")
+    def setUp(self):
+        """ creates the records used by the tests """
+        self.transfer = TransferRequest(from_iban="ES6211110783482828975098",
+                                        transfer_type="URGENT",
+                                        to_iban="ES8658342044541216872704",
+                                        transfer_concept="Testing slots records",
+                                        transfer_date="26/03/2025",
+                                        transfer_amount=15.5)
+        self.deposit = AccountDeposit(to_iban="ES6211110783482828975098",
+                                      deposit_amount=1234.5)
+
+    @staticmethod
+    def transfer_code(transfer):
+        """ transfer code of the class with __dict__ """
+        fields = {"_TransferRequest__from_iban": transfer.from_iban,
+                  "_TransferRequest__to_iban": transfer.to_iban,
+                  "_TransferRequest__transfer_type": transfer.transfer_type,
+                  "_TransferRequest__concept": transfer.transfer_concept,
+                  "_TransferRequest__transfer_date": transfer.transfer_date,
+                  "_TransferRequest__transfer_amount": transfer.transfer_amount,
+                  "_TransferRequest__time_stamp": transfer.time_stamp}
+        return hashlib.md5(("Transfer:" + json.dumps(fields)).encode()).hexdigest()
+
+    @staticmethod
+    def deposit_signature(deposit):
+        """ deposit signature of the class with __dict__ """
+        text = "{alg:SHA-256,typ:DEPOSIT,iban:" + deposit.to_iban + ",amount:" + \
+               str(deposit.deposit_amount) + ",deposit_date:" + str(deposit.deposit_date) + "}"
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def test_no_dict(self):
+        """the records have no __dict__ and survive pickling"""
+        for record in (self.transfer, self.deposit):
+            with self.subTest(type(record).__name__):
+                self.assertFalse(hasattr(record, "__dict__"))
+                self.assertEqual(record.to_json(), pickle.loads(pickle.dumps(record)).to_json())
+
+    def test_same_codes(self):
+        """the codes are the ones of the previous classes"""
+        self.assertEqual(self.transfer_code(self.transfer), self.transfer.transfer_code)
+        self.assertEqual(self.deposit_signature(self.deposit), self.deposit.deposit_signature)
+
+    def test_setters_invalidate(self):
+        """changing a field changes the code"""
+        for field, value in (("from_iban", "ES3559005439021242088295"),
+                             ("to_iban", "ES3559005439021242088295"),
+                             ("transfer_type", "ORDINARY"),
+                             ("transfer_amount", 20.0),
+                             ("transfer_concept", "Another transfer concept"),
+                             ("transfer_date", "27/03/2025")):
+            with self.subTest(field):
+                previous = self.transfer.transfer_code
+                setattr(self.transfer, field, value)
+                self.assertNotEqual(previous, self.transfer.transfer_code)
+                self.assertEqual(self.transfer_code(self.transfer), self.transfer.transfer_code)
+        for field, value in (("to_iban", "ES3559005439021242088295"),
+                             ("deposit_amount", 10.0),
+                             ("deposit_date", 1.5)):
+            with self.subTest(field):
+                previous = self.deposit.deposit_signature
+                setattr(self.deposit, field, value)
+                self.assertNotEqual(previous, self.deposit.deposit_signature)
+                self.assertEqual(self.deposit_signature(self.deposit),
+                                 self.deposit.deposit_signature)
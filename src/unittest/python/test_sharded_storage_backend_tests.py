@@ -0,0 +1,111 @@
+"""Tests for the IBAN sharded storage backend"""
+import json
+import os.path
+import shutil
+import tempfile
+from unittest import TestCase
+from freezegun import freeze_time
+from uc3m_money import (TRANSACTIONS_STORE_FILE,
+                        JSON_FILES_DEPOSITS,
+                        AccountManager,
+                        AccountManagementException,
+                        ShardedStorageBackend,
+                        StoreResharder)
+from uc3m_money.sharded_storage_backend import shard_of, read_layout, shard_paths
+from uc3m_money.store_resharder import main
+
+IBAN = "ES3559005439021242088295"
+OTHER_IBAN = "ES8658342044541216872704"
+TRANSFER = {"from_iban": "ES6211110783482828975098",
+            "to_iban": "ES8658342044541216872704",
+            "concept": "Sharded transfer test",
+            "transfer_type": "ORDINARY",
+            "date": "01/07/2025",
+            "amount": 100.0}
+
+
+@freeze_time("2025/03/26 14:00:00")
+class TestShardedStorageBackend(TestCase):
+    """Sharded storage backend tests class"""
+    def setUp(self):
+        """ creates an unsharded directory with the transactions """
+        self.json_files_path = tempfile.mkdtemp()
+        shutil.copy(TRANSACTIONS_STORE_FILE, self.json_files_path)
+        self.expected = AccountManager(self.json_files_path).calculate_all_balances()
+
+    def tearDown(self):
+        """ removes the directory used by the tests """
+        shutil.rmtree(self.json_files_path)
+
+    def shard_path(self, iban):
+        """ directory of the shard of the iban """
+        layout = read_layout(self.json_files_path)
+        return shard_paths(self.json_files_path, layout)[shard_of(iban, layout["shards"])]
+
+    def shard_records(self, iban, store_file):
+        """ records of a store file of the shard of the iban """
+        path = os.path.join(self.shard_path(iban), store_file)
+        if not os.path.exists(path):
+            return []
+        with open(path, "r", encoding="utf-8", newline="") as file:
+            return [json.loads(line) for line in file if line.strip()]
+
+    def test_reshard_unsharded_directory(self):
+        """the stores are moved to the shards of their ibans"""
+        counts = StoreResharder(self.json_files_path).reshard(4)
+        self.assertEqual(len(self.expected), counts["balances"])
+        self.assertGreater(counts["transactions"], 0)
+        backend = ShardedStorageBackend(self.json_files_path)
+        self.assertEqual(4, backend.shards)
+        for iban, balance in self.expected.items():
+            self.assertAlmostEqual(balance, backend.balance(iban))
+        self.assertEqual(self.expected, backend.all_balances())
+        self.assertEqual(counts["transactions"], len(list(backend.read_transactions())))
+
+    def test_operations_touch_one_shard(self):
+        """transfers, deposits and balances are stored in one shard"""
+        backend = ShardedStorageBackend(self.json_files_path, 4)
+        manager = AccountManager(backend=backend)
+        code = manager.transfer_request(**TRANSFER)
+        with self.assertRaises(AccountManagementException):
+            manager.transfer_request(**TRANSFER)
+        signature = manager.deposit_into_account(JSON_FILES_DEPOSITS + "case_ok.json")
+        self.assertEqual(signature,
+                         manager.deposit_into_account(JSON_FILES_DEPOSITS + "case_ok.json"))
+        transfers = self.shard_records(TRANSFER["from_iban"], "transfers_store.json")
+        self.assertEqual([code], [k["transfer_code"] for k in transfers])
+        deposits = self.shard_records("ES6211110783482828975098", "deposits_store.json")
+        self.assertEqual([signature], [k["deposit_signature"] for k in deposits])
+        for path in shard_paths(self.json_files_path, read_layout(self.json_files_path)):
+            if path != self.shard_path(TRANSFER["from_iban"]):
+                self.assertFalse(os.path.exists(os.path.join(path, "transfers_store.json")))
+
+    def test_reshard_sharded_directory(self):
+        """changing the number of shards keeps the records and the keys"""
+        StoreResharder(self.json_files_path).reshard(2)
+        manager = AccountManager(backend=ShardedStorageBackend(self.json_files_path))
+        manager.calculate_balance(IBAN)
+        manager.calculate_balance(OTHER_IBAN)
+        signature = manager.deposit_into_account(JSON_FILES_DEPOSITS + "case_ok.json")
+        counts = StoreResharder(self.json_files_path).reshard(5)
+        self.assertEqual({"transfers": 0, "deposits": 1, "balances": len(self.expected) + 2},
+                         {k: counts[k] for k in ("transfers", "deposits", "balances")})
+        self.assertEqual([read_layout(self.json_files_path)["directory"]],
+                         [k for k in os.listdir(self.json_files_path) if k.startswith("shards-")])
+        manager = AccountManager(backend=ShardedStorageBackend(self.json_files_path))
+        self.assertEqual(signature,
+                         manager.deposit_into_account(JSON_FILES_DEPOSITS + "case_ok.json"))
+        self.assertAlmostEqual(self.expected[IBAN], manager.latest_balance(IBAN)["BALANCE"])
+
+    def test_wrong_number_of_shards(self):
+        """the shards file fixes the number of shards"""
+        ShardedStorageBackend(self.json_files_path, 3)
+        with self.assertRaises(AccountManagementException) as c_m:
+            ShardedStorageBackend(self.json_files_path, 4)
+        self.assertEqual("Wrong number of shards - reshard the stores", c_m.exception.message)
+
+    def test_command_line(self):
+        """the tool reshards from the command line"""
+        self.assertEqual(0, main([self.json_files_path, "--shards", "3"]))
+        self.assertEqual(3, ShardedStorageBackend(self.json_files_path).shards)
+        self.assertEqual(1, main([self.json_files_path, "--shards", "0"]))
@@ -0,0 +1,94 @@
+"""Tests for the SQLite storage backend"""
+import os.path
+import shutil
+import tempfile
+from unittest import TestCase
+from freezegun import freeze_time
+from uc3m_money import (JSON_FILES_DEPOSITS,
+                        TRANSACTIONS_STORE_FILE,
+                        AccountManager,
+                        AccountManagementException,
+                        SqliteStorageBackend)
+
+
+class TestSqliteStorageBackend(TestCase):
+    """SQLite storage backend tests class"""
+    def setUp(self):
+        """ creates a manager on an in memory database and the directory
+        of the json files compared with it """
+        self.backend = SqliteStorageBackend(":memory:")
+        self.mngr = AccountManager(backend=self.backend)
+        self.json_files_path = tempfile.mkdtemp()
+        shutil.copy(TRANSACTIONS_STORE_FILE, self.json_files_path)
+
+    def tearDown(self):
+        """ closes the database and removes the directory """
+        self.backend.close()
+        shutil.rmtree(self.json_files_path)
+
+    @freeze_time("2025/03/26 14:00:00")
+    def test_transfer_request(self):
+        """the transfer is stored with the same code as in the json files"""
+        code = self.mngr.transfer_request(from_iban="ES6211110783482828975098",
+                                          to_iban="ES8658342044541216872704",
+                                          concept="Testing sqlite backend",
+                                          transfer_type="URGENT",
+                                          date="26/03/2025",
+                                          amount=15.5)
+        transfers = self.backend.transfers("ES8658342044541216872704")
+        self.assertEqual([code], [k["transfer_code"] for k in transfers])
+        self.assertEqual([], self.backend.transfers("ES3559005439021242088295"))
+
+    @freeze_time("2025/03/26 14:00:00")
+    def test_duplicated_transfer(self):
+        """the duplicate check uses the unique index of the keys"""
+        transfer = {"from_iban": "ES6211110783482828975098",
+                    "to_iban": "ES8658342044541216872704",
+                    "concept": "Testing sqlite backend",
+                    "transfer_type": "URGENT",
+                    "date": "26/03/2025",
+                    "amount": 15.5}
+        self.mngr.transfer_request(**transfer)
+        with self.assertRaises(AccountManagementException) as cm:
+            self.mngr.transfer_request(**dict(transfer, amount=15.50))
+        self.assertEqual("Duplicated transfer in transfer list", cm.exception.message)
+        results = self.mngr.transfer_requests_bulk([dict(transfer, amount=20),
+                                                    transfer])
+        self.assertIsInstance(results[0], str)
+        self.assertIsInstance(results[1], AccountManagementException)
+        self.assertEqual(2, len(self.backend.transfers()))
+
+    def test_deposit(self):
+        """the deposits are stored in the database"""
+        signature = self.mngr.deposit_into_account(
+            os.path.join(JSON_FILES_DEPOSITS, "case_ok.json"))
+        deposits = self.backend.deposits(self.backend.deposits()[0]["to_iban"])
+        self.assertEqual([signature], [k["deposit_signature"] for k in deposits])
+
+    @freeze_time("2025/03/26 14:00:00")
+    def test_balances(self):
+        """the balances are the ones of the json backend"""
+        self.backend.import_transactions_file(TRANSACTIONS_STORE_FILE)
+        expected = AccountManager(self.json_files_path).calculate_all_balances()
+        balances = self.mngr.calculate_all_balances()
+        self.assertEqual(list(expected), list(balances))
+        for iban, balance in expected.items():
+            with self.subTest(iban):
+                self.assertAlmostEqual(balance, balances[iban], places=6)
+        self.assertTrue(self.mngr.calculate_balance("ES3559005439021242088295"))
+        records = self.backend.balance_records("ES3559005439021242088295")
+        self.assertEqual([9268.29, 9268.29], [k["BALANCE"] for k in records])
+        self.assertEqual(len(list(self.mngr.read_transactions())),
+                         len(AccountManager(self.json_files_path).read_transactions_file()))
+
+    def test_iban_not_found(self):
+        """an iban without transactions is not found"""
+        with self.assertRaises(AccountManagementException) as cm:
+            self.mngr.calculate_balance("ES3559005439021242088295")
+        self.assertEqual("IBAN not found", cm.exception.message)
+
+    def test_wrong_transaction(self):
+        """transactions without amount are rejected"""
+        with self.assertRaises(AccountManagementException) as cm:
+            self.backend.import_transactions([{"IBAN": "ES3559005439021242088295"}])
+        self.assertEqual("JSON Decode Error - Wrong JSON Format", cm.exception.message)
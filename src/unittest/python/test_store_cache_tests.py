@@ -0,0 +1,163 @@
+"""Tests for the cache of the parsed stores"""
+import json
+import os.path
+import shutil
+import tempfile
+import tracemalloc
+from unittest import TestCase
+from unittest.mock import patch
+from freezegun import freeze_time
+from uc3m_money import store_cache
+from uc3m_money import (TRANSACTIONS_STORE_FILE,
+                        AccountManager,
+                        JsonLinesStore,
+                        TransactionsFile,
+                        StoreCache,
+                        SyntheticDataGenerator,
+                        METRICS)
+
+
+@freeze_time("2025/03/26 14:00:00")
+class TestStoreCache(TestCase):
+    """Store cache tests class"""
+    def setUp(self):
+        """ creates the directory used by the tests and enables the metrics """
+        self.json_files_path = tempfile.mkdtemp()
+        self.store_file = os.path.join(self.json_files_path, "store.json")
+        METRICS.reset()
+        METRICS.enable()
+
+    def tearDown(self):
+        """ disables the metrics and removes the directory """
+        METRICS.enable(False)
+        METRICS.reset()
+        shutil.rmtree(self.json_files_path)
+
+    def counters(self):
+        """ counters recorded since the last call """
+        counters = METRICS.snapshot()["counters"]
+        METRICS.reset()
+        return counters
+
+    def test_unchanged_file_is_not_parsed(self):
+        """the second read of a file comes from the cache"""
+        store = JsonLinesStore(self.store_file, StoreCache())
+        store.append_all([{"value": k} for k in range(10)])
+        records = list(store.read_from(0))
+        self.assertEqual(list(range(10)), [k["value"] for k, _ in records])
+        self.assertEqual(10, self.counters()["records_scanned"])
+        self.assertEqual(list(range(10)), [k["value"] for k in store.read()])
+        self.assertEqual([{"value": 9}], [k for k, _ in store.read_from(records[-2][1])])
+        counters = self.counters()
+        self.assertEqual(2, counters["store_cache_hits"])
+        self.assertNotIn("records_scanned", counters)
+
+    def test_own_writes_update_the_cache(self):
+        """the records appended are added to the cached records"""
+        store = JsonLinesStore(self.store_file, StoreCache())
+        store.append({"value": 0})
+        list(store.read())
+        store.append_all([{"value": 1}, {"value": 2}])
+        self.counters()
+        records = list(store.read_from(0))
+        self.assertEqual([0, 1, 2], [k["value"] for k, _ in records])
+        self.assertEqual(store.size(), records[-1][1])
+        self.assertNotIn("records_scanned", self.counters())
+
+    def test_own_writes_are_not_verified(self):
+        """the file is not read again to check the records appended"""
+        store = JsonLinesStore(self.store_file, StoreCache())
+        store.append({"value": 0})
+        os.utime(self.store_file, ns=(0, 0))
+        list(store.read())
+        self.counters()
+        with patch.object(store_cache, "_checksum", wraps=store_cache._checksum) as checksum:
+            for value in range(1, 20):
+                store.append({"value": value})
+                self.assertEqual(value, list(store.read())[-1]["value"])
+        self.assertEqual(0, checksum.call_count)
+        self.assertNotIn("records_scanned", self.counters())
+
+    def test_changed_file_is_parsed(self):
+        """a file written by somebody else is parsed again, even if its
+        mtime and size did not change"""
+        store = JsonLinesStore(self.store_file, StoreCache())
+        store.append({"value": 1})
+        list(store.read())
+        stat = os.stat(self.store_file)
+        with open(self.store_file, "r+b") as file:
+            content = file.read()
+            file.seek(0)
+            file.write(content.replace(b"1", b"2"))
+        os.utime(self.store_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual([{"value": 2}], list(store.read()))
+        with open(self.store_file, "ab") as file:
+            file.write(b'{"value": 3}\n')
+        self.assertEqual([2, 3], [k["value"] for k in store.read()])
+
+    def test_least_recently_used_are_evicted(self):
+        """the memory of the records cached is limited"""
+        cache = StoreCache()
+        stores = []
+        for name in ("a", "b", "c"):
+            store = JsonLinesStore(os.path.join(self.json_files_path, name), cache)
+            store.append_all([{"value": "x" * 30}])
+            list(store.read())
+            stores.append(store)
+        entry_size = cache.size // 3
+        self.assertGreater(entry_size, os.path.getsize(stores[0].file_path))
+        cache.max_bytes = entry_size * 2
+        self.assertEqual(2, len(cache))
+        self.counters()
+        list(stores[0].read())
+        list(stores[2].read())
+        counters = self.counters()
+        self.assertEqual(1, counters["store_cache_misses"])
+        self.assertEqual(1, counters["store_cache_hits"])
+        cache.max_bytes = 10
+        self.assertEqual(0, len(cache))
+
+    def test_file_over_the_budget_is_streamed(self):
+        """a file smaller than max_bytes whose records take more memory
+        than it is not loaded in a list"""
+        generator = SyntheticDataGenerator(seed=4)
+        generator.write_transactions_file(self.store_file, 20000, generator.ibans(100))
+        size = os.path.getsize(self.store_file)
+        cache = StoreCache(max_bytes=size * 3 // 2)
+        transactions = TransactionsFile(self.store_file, cache=cache)
+        with patch.object(cache, "put", wraps=cache.put) as put:
+            for _ in range(3):
+                tracemalloc.start()
+                try:
+                    self.assertEqual(20000, sum(1 for _ in transactions.read()))
+                    peak = tracemalloc.get_traced_memory()[1]
+                finally:
+                    tracemalloc.stop()
+                # streaming holds a chunk of the file, the list about 9 times it
+                self.assertLess(peak, size * 3)
+        self.assertEqual(0, put.call_count)
+        self.assertEqual(3, self.counters()["store_cache_misses"])
+        cache.max_bytes = size * 10
+        list(transactions.read())
+        list(transactions.read())
+        self.assertEqual(1, self.counters()["store_cache_hits"])
+
+    def test_transactions_are_parsed_once(self):
+        """the balances of a manager read the transactions file once"""
+        shutil.copy(TRANSACTIONS_STORE_FILE, self.json_files_path)
+        expected = AccountManager(self.json_files_path).calculate_all_balances()
+        self.counters()
+        self.assertEqual(expected, AccountManager(self.json_files_path).calculate_all_balances())
+        self.assertNotIn("records_scanned", self.counters())
+        transactions = os.path.join(self.json_files_path, "transactions.json")
+        with open(transactions, "r", encoding="utf-8", newline="") as file:
+            records = json.load(file)
+        self.assertEqual(len(records), len(list(TransactionsFile(transactions).read())))
+
+    def test_records_returned_are_copies(self):
+        """changing the transactions read does not change the cache"""
+        shutil.copy(TRANSACTIONS_STORE_FILE, self.json_files_path)
+        expected = AccountManager(self.json_files_path).calculate_all_balances()
+        for transaction in AccountManager(self.json_files_path).read_transactions_file():
+            transaction["amount"] = "0.0"
+        self.assertEqual(expected, AccountManager(self.json_files_path).calculate_all_balances())
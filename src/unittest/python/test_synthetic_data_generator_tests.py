@@ -0,0 +1,81 @@
+"""Tests for the synthetic data generator"""
+import os.path
+import shutil
+import tempfile
+from datetime import date, datetime
+from unittest import TestCase
+from freezegun import freeze_time
+from uc3m_money import (AccountManager,
+                        AccountManagementException,
+                        SyntheticDataGenerator,
+                        TransactionsFile)
+
+
+class TestSyntheticDataGenerator(TestCase):
+    """Synthetic data generator tests class"""
+    def setUp(self):
+        """ creates the directory used by the tests """
+        self.json_files_path = tempfile.mkdtemp()
+        self.generator = SyntheticDataGenerator(seed=12)
+        self.ibans = self.generator.ibans(20)
+
+    def tearDown(self):
+        """ removes the directory used by the tests """
+        shutil.rmtree(self.json_files_path)
+
+    def test_ibans_valid(self):
+        """the ibans pass valivan"""
+        for iban in self.ibans + [self.generator.iban() for _ in range(200)]:
+            with self.subTest(iban):
+                self.assertEqual(iban, AccountManager.valivan(iban))
+
+    def test_same_seed_same_data(self):
+        """the data only depends on the seed"""
+        other = SyntheticDataGenerator(seed=12)
+        self.assertEqual(self.ibans, other.ibans(20))
+        self.assertEqual(list(self.generator.transfers(50, self.ibans)),
+                         list(other.transfers(50, self.ibans)))
+
+    def test_dates_do_not_depend_on_today(self):
+        """the dates start at the first date, whatever the day is"""
+        dates = []
+        for today in ("2025/03/26", "2029/12/31"):
+            with freeze_time(today):
+                generator = SyntheticDataGenerator(seed=12)
+                dates.append([generator.transfer_date() for _ in range(100)])
+        self.assertEqual(dates[0], dates[1])
+        generator = SyntheticDataGenerator(seed=12, first_date=date(2050, 12, 30))
+        for transfer_date in [generator.transfer_date() for _ in range(20)] + dates[0]:
+            with self.subTest(transfer_date):
+                day = datetime.strptime(transfer_date, "%d/%m/%Y").date()
+                self.assertTrue(date(2030, 1, 1) <= day <= date(2050, 12, 31))
+        self.assertIn("30/12/2050", [generator.transfer_date() for _ in range(20)])
+
+    def test_transfers_valid(self):
+        """the transfers are accepted by transfer_request"""
+        mngr = AccountManager(self.json_files_path)
+        transfers = list(self.generator.transfers(300, self.ibans))
+        results = mngr.transfer_requests_bulk(transfers)
+        self.assertEqual([], [k.message for k in results
+                              if isinstance(k, AccountManagementException)])
+
+    def test_deposit_files_valid(self):
+        """the deposit files are accepted by deposit_into_account"""
+        directory = os.path.join(self.json_files_path, "deposits")
+        names = self.generator.write_deposit_files(directory, 100, self.ibans)
+        results = AccountManager(self.json_files_path).deposit_directory(workers=1)
+        self.assertEqual(sorted(names), sorted(results))
+        self.assertEqual([], [k.message for k in results.values()
+                              if isinstance(k, AccountManagementException)])
+
+    def test_transactions_file(self):
+        """the transactions files have the requested size in both formats"""
+        for lines in (False, True):
+            with self.subTest(lines):
+                file_path = os.path.join(self.json_files_path, "transactions.json")
+                self.generator.write_transactions_file(file_path, 1000, self.ibans, lines)
+                transactions = list(TransactionsFile(file_path).read())
+                self.assertEqual(1000, len(transactions))
+                self.assertTrue({k["IBAN"] for k in transactions} <= set(self.ibans))
+                balances = AccountManager(self.json_files_path).calculate_all_balances()
+                self.assertEqual(set(balances), {k["IBAN"] for k in transactions})
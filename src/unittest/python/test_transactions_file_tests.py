@@ -0,0 +1,83 @@
+"""Tests for the streaming transactions reader"""
+import json
+import os.path
+import tracemalloc
+from os import remove
+from unittest import TestCase
+from uc3m_money import (JSON_FILES_PATH,
+                        TRANSACTIONS_STORE_FILE,
+                        AccountManagementException,
+                        TransactionsFile)
+
+TRANSACTIONS_TEST_FILE = JSON_FILES_PATH + "transactions_stream_test.json"
+
+
+class TestTransactionsFile(TestCase):
+    """Streaming transactions reader tests class"""
+    def setUp(self):
+        """ reads the transactions used by the tests """
+        with open(TRANSACTIONS_STORE_FILE, "r", encoding="utf-8", newline="") as file:
+            self.transactions = json.load(file)
+
+    def tearDown(self):
+        """ removes the file used by the tests """
+        if os.path.exists(TRANSACTIONS_TEST_FILE):
+            remove(TRANSACTIONS_TEST_FILE)
+
+    @staticmethod
+    def write_file(content):
+        """writes the transactions test file"""
+        with open(TRANSACTIONS_TEST_FILE, "w", encoding="utf-8", newline="") as file:
+            file.write(content)
+
+    def test_small_chunks(self):
+        """records split between chunks are read as json.load does"""
+        for chunk_size in (1, 7, 64, 4096):
+            with self.subTest(chunk_size):
+                reader = TransactionsFile(TRANSACTIONS_STORE_FILE, chunk_size)
+                self.assertEqual(self.transactions, list(reader.read()))
+
+    def test_json_lines(self):
+        """a file with one record per line is also accepted"""
+        self.write_file("".join(json.dumps(k) + "\n" for k in self.transactions))
+        reader = TransactionsFile(TRANSACTIONS_TEST_FILE, 16)
+        self.assertEqual(self.transactions, list(reader.read()))
+
+    def test_resume_offsets(self):
+        """reading from the offset of a record returns the following ones,
+        also with non ascii characters before them"""
+        self.transactions[0]["concept"] = "año pequeño €"
+        self.write_file(json.dumps(self.transactions, indent=4, ensure_ascii=False))
+        reader = TransactionsFile(TRANSACTIONS_TEST_FILE, 5)
+        offsets = [offset for _, offset in reader.read_from(0)]
+        for position, offset in enumerate(offsets):
+            with self.subTest(position):
+                self.assertEqual(self.transactions[position + 1:],
+                                 [record for record, _ in reader.read_from(offset)])
+
+    def test_wrong_files(self):
+        """files that are not json keep the same exceptions"""
+        for content in ("", "Hello world!", "[", '[{"IBAN": "ES"},]', "[]]", "[{}"):
+            with self.subTest(content):
+                self.write_file(content)
+                with self.assertRaises(AccountManagementException) as c_m:
+                    list(TransactionsFile(TRANSACTIONS_TEST_FILE).read())
+                self.assertEqual("JSON Decode Error - Wrong JSON Format",
+                                 c_m.exception.message)
+
+    def test_file_not_found(self):
+        """a file that does not exist keeps the same exception"""
+        with self.assertRaises(AccountManagementException) as c_m:
+            list(TransactionsFile(TRANSACTIONS_TEST_FILE).read())
+        self.assertEqual("Wrong file  or file path", c_m.exception.message)
+
+    def test_bounded_memory(self):
+        """the memory used does not grow with the size of the file"""
+        self.write_file(json.dumps(self.transactions * 500, indent=4))
+        reader = TransactionsFile(TRANSACTIONS_TEST_FILE, 4096)
+        tracemalloc.start()
+        count = sum(1 for _ in reader.read())
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        self.assertEqual(len(self.transactions) * 500, count)
+        self.assertLess(peak, os.path.getsize(TRANSACTIONS_TEST_FILE) // 10)
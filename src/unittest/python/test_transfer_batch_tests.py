@@ -0,0 +1,96 @@
+"""Tests for the batch transfers command"""
+import csv
+import io
+import os.path
+import shutil
+import subprocess
+import sys
+import tempfile
+from unittest import TestCase
+from freezegun import freeze_time
+from uc3m_money import (JSON_FILES_PATH,
+                        AccountManager,
+                        AccountManagementException,
+                        TransferBatch)
+from uc3m_money.transfer_batch import main
+
+CASES_FILE = JSON_FILES_PATH + "test_cases_2025_method1.csv"
+
+
+@freeze_time("2024/12/31 13:00:00")
+class TestTransferBatch(TestCase):
+    """Batch transfers tests class"""
+    def setUp(self):
+        """ creates the directory used by the tests """
+        self.json_files_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """ removes the directory used by the tests """
+        shutil.rmtree(self.json_files_path)
+
+    def test_results_of_the_test_cases(self):
+        """the codes of the valid cases are the expected ones, in chunks"""
+        output = io.StringIO()
+        with open(CASES_FILE, "r", encoding="utf-8", newline="") as input_file:
+            stats = TransferBatch(AccountManager(self.json_files_path), chunk_size=3) \
+                .run(input_file, output)
+        with open(CASES_FILE, "r", encoding="utf-8", newline="") as input_file:
+            expected = list(csv.DictReader(input_file, delimiter=";"))
+        results = list(csv.DictReader(io.StringIO(output.getvalue()), delimiter=";"))
+        self.assertEqual(len(expected), stats["rows"])
+        self.assertEqual(stats["rows"], stats["stored"] + stats["rejected"])
+        self.assertEqual([k["ID_TEST"] for k in expected], [k["ID_TEST"] for k in results])
+        for case, result in zip(expected, results):
+            if case["VALID"] == "VALID":
+                with self.subTest(case["ID_TEST"]):
+                    self.assertEqual(case["RESULT"], result["RESULT"])
+
+    def test_missing_columns_and_values(self):
+        """a short row is invalid data, a file without the columns fails"""
+        output = io.StringIO()
+        stats = TransferBatch(AccountManager(self.json_files_path)).run(
+            io.StringIO("From_iban;to_iban;concept;type;date;amount\n"
+                        "ES6211110783482828975098;ES8658342044541216872704\n"), output)
+        self.assertEqual(1, stats["rejected"])
+        self.assertIn(";Invalid transfer data", output.getvalue())
+        with self.assertRaises(AccountManagementException):
+            TransferBatch(AccountManager(self.json_files_path)).run(
+                io.StringIO("IBAN;amount\n"), io.StringIO())
+
+    def test_command_line(self):
+        """main writes the results file and reports errors"""
+        output_file = os.path.join(self.json_files_path, "results.csv")
+        self.assertEqual(0, main([CASES_FILE, "--output", output_file,
+                                  "--json-files-path", self.json_files_path]))
+        with open(output_file, "r", encoding="utf-8", newline="") as file:
+            self.assertTrue(file.readline().startswith("VALID;ID_TEST;"))
+        self.assertEqual(1, main([os.path.join(self.json_files_path, "missing.csv"),
+                                  "--json-files-path", self.json_files_path]))
+
+    def test_module_command(self):
+        """the module runs as a command and exits with the status of main"""
+        environment = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        output_file = os.path.join(self.json_files_path, "results.csv")
+        for input_file, status in ((CASES_FILE, 0),
+                                   (os.path.join(self.json_files_path, "missing.csv"), 1)):
+            with self.subTest(status):
+                process = subprocess.run([sys.executable, "-m", "uc3m_money.transfer_batch",
+                                          input_file, "--output", output_file,
+                                          "--json-files-path", self.json_files_path],
+                                         capture_output=True, text=True, check=False,
+                                         env=environment)
+                self.assertEqual(status, process.returncode, process.stderr)
+        self.assertTrue(os.path.isfile(output_file))
+
+    def test_cold_start(self):
+        """the command does not import the modules it does not use (numpy
+        is only registered, lazily)"""
+        code = ("import sys; from uc3m_money.transfer_batch import main; "
+                "import uc3m_money.account_manager; "
+                "print(sorted(k for k in ('numpy', 'asyncio', 'sqlite3', "
+                "'concurrent.futures.process') if k in sys.modules and "
+                "type(sys.modules[k]).__name__ == 'module'))")
+        environment = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                check=True, env=environment).stdout
+        self.assertEqual("[]", output.strip())
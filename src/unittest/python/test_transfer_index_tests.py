@@ -0,0 +1,73 @@
+"""Tests for the duplicated transfers index"""
+import json
+import os.path
+import shutil
+import tempfile
+from os import remove
+from unittest import TestCase
+from freezegun import freeze_time
+from uc3m_money import (AccountManager,
+                        AccountManagementException,
+                        JsonLinesStore,
+                        TransferIndex)
+
+TRANSFER = {"from_iban": "ES6211110783482828975098",
+            "to_iban": "ES8658342044541216872704",
+            "concept": "Testing duplicated index",
+            "transfer_type": "ORDINARY",
+            "date": "22/03/2025",
+            "amount": 10.0}
+
+
+class TestTransferIndex(TestCase):
+    """Duplicated transfers index tests class"""
+    def setUp(self):
+        """ creates the directory used by the tests """
+        self.json_files_path = tempfile.mkdtemp()
+        self.store_file = os.path.join(self.json_files_path, "transfers_store.json")
+        self.index_file = os.path.join(self.json_files_path, "transfers_index.json")
+
+    def tearDown(self):
+        """ removes the directory used by the tests """
+        shutil.rmtree(self.json_files_path)
+
+    @freeze_time("2025/03/22 13:00:00")
+    def test_duplicated_with_new_manager(self):
+        """the index saved by one manager is used by another one"""
+        AccountManager(self.json_files_path).transfer_request(**TRANSFER)
+        self.assertTrue(os.path.isfile(self.index_file))
+        with self.assertRaises(AccountManagementException) as c_m:
+            AccountManager(self.json_files_path).transfer_request(**TRANSFER)
+        self.assertEqual("Duplicated transfer in transfer list", c_m.exception.message)
+
+    @freeze_time("2025/03/22 13:00:00")
+    def test_store_removed(self):
+        """the index is rebuilt when the store has been removed"""
+        mngr = AccountManager(self.json_files_path)
+        mngr.transfer_request(**TRANSFER)
+        remove(self.store_file)
+        res = mngr.transfer_request(**TRANSFER)
+        self.assertEqual("83724711db7649bc6a7437ca1739809c", res)
+
+    @freeze_time("2025/03/22 13:00:00")
+    def test_store_written_by_others(self):
+        """transfers appended to the store without the index are found"""
+        mngr = AccountManager(self.json_files_path)
+        mngr.transfer_request(**TRANSFER)
+        with open(self.store_file, "r", encoding="utf-8", newline="") as file:
+            record = json.loads(file.readline())
+        record["transfer_amount"] = 20.0
+        JsonLinesStore(self.store_file).append(record)
+        with self.assertRaises(AccountManagementException) as c_m:
+            mngr.transfer_request(**dict(TRANSFER, amount=20))
+        self.assertEqual("Duplicated transfer in transfer list", c_m.exception.message)
+
+    @freeze_time("2025/03/22 13:00:00")
+    def test_rebuild(self):
+        """rebuilding the index from the store keeps every transfer"""
+        AccountManager(self.json_files_path).transfer_request(**TRANSFER)
+        remove(self.index_file)
+        index = TransferIndex(JsonLinesStore(self.store_file), self.index_file)
+        index.rebuild()
+        with open(self.index_file, "r", encoding="utf-8", newline="") as file:
+            self.assertEqual(1, len(file.readlines()))
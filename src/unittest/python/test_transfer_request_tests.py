@@ -4,10 +4,10 @@ import json
 import os.path
 import hashlib
 from unittest import TestCase
-from os import remove
+import shutil
+import tempfile
 from freezegun import freeze_time
 from uc3m_money import (JSON_FILES_PATH,
-                        TRANSFERS_STORE_FILE,
                         AccountManager,
                         TransferRequest,
                         AccountManagementException)
@@ -16,18 +16,21 @@ class TestTransferRequestTest(TestCase):
     """Class for testing deliver_product"""
 
     def setUp(self):
-        """ inicializo el entorno de prueba """
-        if os.path.exists(TRANSFERS_STORE_FILE):
-            remove(TRANSFERS_STORE_FILE)
+        """ inicializo el entorno de prueba en un directorio temporal """
+        self.json_files_path = tempfile.mkdtemp()
+        self.store_file = os.path.join(self.json_files_path, "transfers_store.json")
 
+    def tearDown(self):
+        """ borra el directorio temporal """
+        shutil.rmtree(self.json_files_path)
 
-    @staticmethod
-    def read_file():
+
+    def read_file(self):
         """ this method read a Json file and return the value """
-        my_file= TRANSFERS_STORE_FILE
+        my_file= self.store_file
         try:
             with open(my_file, "r", encoding="utf-8", newline="") as file:
-                data = json.load(file)
+                data = [json.loads(line) for line in file if line.strip()]
         except FileNotFoundError as ex:
             raise AccountManagementException("Wrong file or file path") from ex
         except json.JSONDecodeError as ex:
@@ -41,7 +44,7 @@ class TestTransferRequestTest(TestCase):
         my_cases = JSON_FILES_PATH + "test_cases_2025_method1.csv"
         with open(my_cases, newline='', encoding='utf-8') as csvfile:
             param_test_cases = csv.DictReader(csvfile, delimiter=';')
-            mngr = AccountManager()
+            mngr = AccountManager(self.json_files_path)
             for row in param_test_cases:
                 test_id = row['ID_TEST']
                 iban_from = row["From_iban"]
@@ -88,8 +91,8 @@ class TestTransferRequestTest(TestCase):
                     with self.subTest(test_id + valid):
 
                         # we calculater the files signature bejore calling the tested method
-                        if os.path.isfile(TRANSFERS_STORE_FILE):
-                            with open(TRANSFERS_STORE_FILE, "r",
+                        if os.path.isfile(self.store_file):
+                            with open(self.store_file, "r",
                                       encoding="utf-8", newline="") as file_org:
                                 hash_original = hashlib.md5(str(file_org).encode()).hexdigest()
                         else:
@@ -105,8 +108,8 @@ class TestTransferRequestTest(TestCase):
 
                         # now we check that the signature of the file is the same
                         # (the file didn't change)
-                        if os.path.isfile(TRANSFERS_STORE_FILE):
-                            with open(TRANSFERS_STORE_FILE, "r",
+                        if os.path.isfile(self.store_file):
+                            with open(self.store_file, "r",
                                       encoding="utf-8", newline="") as file:
                                 hash_new = hashlib.md5(str(file).encode()).hexdigest()
                         else:
@@ -123,7 +126,7 @@ class TestTransferRequestTest(TestCase):
         transfer_amount = 10.0
         transfer_date = "22/03/2025"
         transfer_concept = "Testing duplicated transfers"
-        mngr  = AccountManager()
+        mngr  = AccountManager(self.json_files_path)
         mngr.transfer_request(from_iban=iban_from,
                               to_iban=iban_to,
                               transfer_type=transfer_type,
@@ -131,8 +134,8 @@ class TestTransferRequestTest(TestCase):
                               date=transfer_date,
                               concept=transfer_concept)
 
-        if os.path.isfile(TRANSFERS_STORE_FILE):
-            with open(TRANSFERS_STORE_FILE, "r", encoding="utf-8", newline="") as file_org:
+        if os.path.isfile(self.store_file):
+            with open(self.store_file, "r", encoding="utf-8", newline="") as file_org:
                 hash_original = hashlib.md5(str(file_org).encode()).hexdigest()
         else:
             hash_original = ""
@@ -147,8 +150,8 @@ class TestTransferRequestTest(TestCase):
 
         # now we check that the signature of the file is the same
         # (the file didn't change)
-        if os.path.isfile(TRANSFERS_STORE_FILE):
-            with open(TRANSFERS_STORE_FILE, "r", encoding="utf-8", newline="") as file:
+        if os.path.isfile(self.store_file):
+            with open(self.store_file, "r", encoding="utf-8", newline="") as file:
                 hash_new = hashlib.md5(str(file).encode()).hexdigest()
         else:
             hash_new = ""
@@ -164,7 +167,7 @@ class TestTransferRequestTest(TestCase):
         transfer_amount = 10.0
         transfer_date = "22/03/2025"
         transfer_concept = "Testing duplicated transfers"
-        mngr  = AccountManager()
+        mngr  = AccountManager(self.json_files_path)
         res = mngr.transfer_request(from_iban=iban_from,
                                     to_iban=iban_to,
                                     transfer_type=transfer_type,
@@ -198,7 +201,7 @@ class TestTransferRequestTest(TestCase):
             transfer_amount = 10.0
             transfer_date = "23/03/2025"
             transfer_concept = "Testing duplicated transfers"
-            mngr = AccountManager()
+            mngr = AccountManager(self.json_files_path)
             res = mngr.transfer_request(from_iban=iban_from,
                                         to_iban=iban_to,
                                         transfer_type=transfer_type,
@@ -233,9 +236,9 @@ class TestTransferRequestTest(TestCase):
         transfer_amount = 10.0
         transfer_date = "25/03/2025"
         transfer_concept = "Testing yesterday"
-        mngr  = AccountManager()
-        if os.path.isfile(TRANSFERS_STORE_FILE):
-            with open(TRANSFERS_STORE_FILE, "r", encoding="utf-8", newline="") as file_org:
+        mngr  = AccountManager(self.json_files_path)
+        if os.path.isfile(self.store_file):
+            with open(self.store_file, "r", encoding="utf-8", newline="") as file_org:
                 hash_original = hashlib.md5(str(file_org).encode()).hexdigest()
         else:
             hash_original = ""
@@ -250,8 +253,8 @@ class TestTransferRequestTest(TestCase):
 
         # now we check that the signature of the file is the same
         # (the file didn't change)
-        if os.path.isfile(TRANSFERS_STORE_FILE):
-            with open(TRANSFERS_STORE_FILE, "r", encoding="utf-8", newline="") as file:
+        if os.path.isfile(self.store_file):
+            with open(self.store_file, "r", encoding="utf-8", newline="") as file:
                 hash_new = hashlib.md5(str(file).encode()).hexdigest()
         else:
             hash_new = ""
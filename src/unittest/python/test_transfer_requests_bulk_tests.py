@@ -0,0 +1,88 @@
+"""Bulk transfer requests test cases"""
+import csv
+import json
+import os.path
+import shutil
+import tempfile
+from unittest import TestCase
+from freezegun import freeze_time
+from uc3m_money import (JSON_FILES_PATH,
+                        AccountManager,
+                        AccountManagementException)
+
+TRANSFER = {"from_iban": "ES6211110783482828975098",
+            "to_iban": "ES8658342044541216872704",
+            "concept": "Testing bulk transfers",
+            "transfer_type": "ORDINARY",
+            "date": "22/03/2025",
+            "amount": 10.0}
+
+
+class TestTransferRequestsBulk(TestCase):
+    """Class for testing transfer_requests_bulk"""
+    def setUp(self):
+        """ creates the directory used by the tests """
+        self.json_files_path = tempfile.mkdtemp()
+        self.store_file = os.path.join(self.json_files_path, "transfers_store.json")
+
+    def tearDown(self):
+        """ removes the directory used by the tests """
+        shutil.rmtree(self.json_files_path)
+
+    def read_file(self):
+        """ this method read the transfers store and return the value """
+        with open(self.store_file, "r", encoding="utf-8", newline="") as file:
+            return [json.loads(line) for line in file if line.strip()]
+
+    @freeze_time("2024/12/31 13:00:00")
+    def test_parametrized_cases_bulk(self):
+        """all the cases of test_cases_2025_method1.csv in a single batch"""
+        my_cases = JSON_FILES_PATH + "test_cases_2025_method1.csv"
+        transfers = []
+        expected = []
+        with open(my_cases, newline='', encoding='utf-8') as csvfile:
+            for row in csv.DictReader(csvfile, delimiter=';'):
+                try:
+                    number_amount = float(row["amount"])
+                except ValueError:
+                    number_amount = row["amount"]
+                transfers.append({"from_iban": row["From_iban"],
+                                  "to_iban": row["to_iban"],
+                                  "concept": row["concept"],
+                                  "transfer_type": row["type"],
+                                  "date": row["date"],
+                                  "amount": number_amount})
+                expected.append((row["ID_TEST"], row["VALID"], row["RESULT"]))
+
+        results = AccountManager(self.json_files_path).transfer_requests_bulk(transfers)
+        self.assertEqual(len(expected), len(results))
+        stored_codes = [k["transfer_code"] for k in self.read_file()]
+        for (test_id, valid, result), value in zip(expected, results):
+            with self.subTest(test_id + valid):
+                if valid == "VALID":
+                    self.assertEqual(result, value)
+                    self.assertIn(value, stored_codes)
+                else:
+                    self.assertIsInstance(value, AccountManagementException)
+                    self.assertEqual(result, value.message)
+        self.assertEqual(len(stored_codes),
+                         len([k for k in expected if k[1] == "VALID"]))
+
+    @freeze_time("2025/03/22 13:00:00")
+    def test_duplicated_in_batch_and_store(self):
+        """duplicates inside the batch and against the store are rejected"""
+        mngr = AccountManager(self.json_files_path)
+        mngr.transfer_request(**TRANSFER)
+        other = dict(TRANSFER, amount=20.0)
+        results = mngr.transfer_requests_bulk([TRANSFER, other, other])
+        self.assertEqual("Duplicated transfer in transfer list", results[0].message)
+        self.assertEqual("c617edd200e1ac827aaa6f4ebb580392", results[1])
+        self.assertEqual("Duplicated transfer in transfer list", results[2].message)
+        self.assertEqual(2, len(self.read_file()))
+
+    def test_invalid_row_does_not_abort(self):
+        """a row without the expected fields only fails itself"""
+        results = AccountManager(self.json_files_path).transfer_requests_bulk(
+            [{"from_iban": "ES"}])
+        self.assertEqual("Invalid transfer data", results[0].message)
+        self.assertFalse(os.path.exists(self.store_file))
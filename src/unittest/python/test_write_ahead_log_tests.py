@@ -0,0 +1,136 @@
+"""Tests for the write-ahead log"""
+import json
+import os
+import os.path
+import shutil
+import tempfile
+import threading
+from unittest import TestCase
+from unittest.mock import patch
+from freezegun import freeze_time
+from uc3m_money import (AccountManager,
+                        AccountManagementException,
+                        JsonLinesStore,
+                        BalanceHistory,
+                        JsonStorageBackend,
+                        WriteAheadLog)
+from uc3m_money import json_storage_backend
+
+
+class TestWriteAheadLog(TestCase):
+    """Write-ahead log tests class"""
+    def setUp(self):
+        """ creates the directory used by the tests """
+        self.json_files_path = tempfile.mkdtemp()
+        self.log_path = os.path.join(self.json_files_path, "stores.wal")
+        self.store = JsonLinesStore(os.path.join(self.json_files_path, "store.json"))
+
+    def tearDown(self):
+        """ removes the directory used by the tests """
+        shutil.rmtree(self.json_files_path)
+
+    def read_log(self):
+        """ returns the entries of the log """
+        with open(self.log_path, "r", encoding="utf-8", newline="") as file:
+            return [json.loads(line) for line in file]
+
+    def test_commit(self):
+        """the records are logged and appended, the checkpoint restarts the log"""
+        wal = WriteAheadLog(self.log_path, [self.store])
+        wal.commit(self.store, [{"a": 1}, {"a": 2}])
+        wal.commit(self.store, [])
+        self.assertEqual([{"a": 1}, {"a": 2}], list(self.store.read()))
+        self.assertEqual([{"a": 1}, {"a": 2}], self.read_log()[1]["records"])
+        wal.close()
+        self.assertEqual([{"checkpoint": {self.store.file_path: self.store.size()}}],
+                         self.read_log())
+
+    def test_recover(self):
+        """the appends of the log are repeated after a crash"""
+        wal = WriteAheadLog(self.log_path, [self.store])
+        wal.commit(self.store, [{"a": 1}])
+        # crash: a logged commit not appended, a partial append and a torn log line
+        with open(self.log_path, "a", encoding="utf-8", newline="") as file:
+            file.write(json.dumps({"seq": 9, "store": self.store.file_path,
+                                   "records": [{"a": 2}]}) + "\n" + '{"seq": 10, "sto')
+        with open(self.store.file_path, "a", encoding="utf-8", newline="") as file:
+            file.write('{"a": ')
+        WriteAheadLog(self.log_path).close()
+        self.assertEqual([{"a": 1}, {"a": 2}], list(self.store.read()))
+
+    def test_group_commit(self):
+        """concurrent commits share the fsyncs"""
+        wal = WriteAheadLog(self.log_path, [self.store], max_delay=0.005)
+
+        def writer(number):
+            for record in range(25):
+                wal.commit(self.store, [{"writer": number, "record": record}])
+
+        with patch.object(os, "fsync", wraps=os.fsync) as fsync:
+            threads = [threading.Thread(target=writer, args=(k,)) for k in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        records = list(self.store.read())
+        self.assertEqual(200, len(records))
+        for number in range(8):
+            self.assertEqual(list(range(25)),
+                             [k["record"] for k in records if k["writer"] == number])
+        self.assertLess(fsync.call_count, 200)
+        wal.close()
+
+    def test_aborted_commit(self):
+        """a commit that cannot be appended raises and is not repeated"""
+        wal = WriteAheadLog(self.log_path, [self.store])
+        with open(self.store.file_path, "w", encoding="utf-8", newline="") as file:
+            file.write('{"a": 1}\n{"a"\n')
+        with self.assertRaises(AccountManagementException) as cm:
+            wal.commit(self.store, [{"a": 2}])
+        self.assertEqual("JSON Decode Error - Wrong JSON Format", cm.exception.message)
+        with open(self.store.file_path, "w", encoding="utf-8", newline="") as file:
+            file.write('{"a": 1}\n')
+        self.assertEqual(["seq", "abort"], [list(k)[0] for k in self.read_log()[1:]])
+
+    @freeze_time("2025/03/26 14:00:00")
+    def test_durable_backend(self):
+        """the json backend writes the stores through the log"""
+        backend = JsonStorageBackend(self.json_files_path, durable=True)
+        mngr = AccountManager(self.json_files_path, backend=backend)
+        code = mngr.transfer_request(from_iban="ES6211110783482828975098",
+                                     to_iban="ES8658342044541216872704",
+                                     concept="Testing durable writes",
+                                     transfer_type="URGENT",
+                                     date="26/03/2025",
+                                     amount=15.5)
+        self.assertEqual(code, self.read_log()[-1]["records"][0]["transfer_code"])
+        backend.close()
+        self.assertEqual(["checkpoint"], [list(k)[0] for k in self.read_log()])
+
+    def test_crash_after_thinning(self):
+        """the balances logged are not appended again to the thinned store"""
+        backend = JsonStorageBackend(self.json_files_path, durable=True)
+        backend.add_balances([{"IBAN": "ES8658342044541216872704", "time": float(k),
+                               "BALANCE": float(k)} for k in range(10)])
+        thin = BalanceHistory.thin
+
+        def thin_and_crash(history, *args):
+            thin(history, *args)
+            raise SystemExit("crash")
+        # crash: the store was thinned, the log was not checkpointed after it
+        with patch.object(BalanceHistory, "thin", thin_and_crash), \
+                self.assertRaises(SystemExit):
+            backend.thin_balances(keep_seconds=0, interval_seconds=100, now=100)
+        JsonStorageBackend(self.json_files_path, durable=True).close()
+        balances = JsonLinesStore(os.path.join(self.json_files_path, "balances.json"))
+        self.assertEqual([9.0], [k["BALANCE"] for k in balances.read()])
+
+    def test_durable_backend_group_options(self):
+        """the group commit options of the backend are the ones of its log"""
+        with patch.object(json_storage_backend, "WriteAheadLog",
+                          wraps=json_storage_backend.WriteAheadLog) as log_class:
+            backend = JsonStorageBackend(self.json_files_path, durable=True,
+                                         wal_max_batch=64)
+        backend.close()
+        self.assertNotIn("max_delay", log_class.call_args.kwargs)
+        self.assertEqual(64, log_class.call_args.kwargs["max_batch"])